@@ -4,105 +4,35 @@ import pysqlite3
 sys.modules['sqlite3'] = pysqlite3
 import streamlit as st
 import streamlit.components.v1 as components
+import altair as alt
 import warnings
 from datetime import datetime
-from concurrent.futures import ThreadPoolExecutor
-from dataclasses import dataclass
-from typing import List, Optional
-from enum import Enum
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
 import json
 import os
 import time
-import threading
-from io import StringIO
-import contextlib
 from dotenv import load_dotenv
 load_dotenv(override=True)
 
 warnings.filterwarnings("ignore", category=SyntaxWarning, module="pysbd")
 
 # Import your existing code (assuming it's available)
+# Crew runs happen in the runner's worker processes; only quick answers call an LLM from this process
 try:
-    from multi_agent_architecture_recommender.crew import MultiAgentArchitectureRecommender
+    from multi_agent_architecture_recommender.budgets import budget_profile_names, default_budget_profile, load_budget_config
+    from multi_agent_architecture_recommender.comparison import CLOUD_PROVIDERS, PROVIDER_TASKS, comparison_inputs, split_task_name, validate_providers
+    from multi_agent_architecture_recommender.models import RequirementContext
+    from multi_agent_architecture_recommender.pruning import evaluate_pruning
+    from multi_agent_architecture_recommender.quick import PATTERN_LABELS, compare_recommendations, extract_recommendation
+    from multi_agent_architecture_recommender.report import build_report, format_task_name, paginate
+    from multi_agent_architecture_recommender.runner import execute_analysis, execute_quick_analysis
+    from multi_agent_architecture_recommender.single_flight import SingleFlight, analysis_key, flight_key
+    from multi_agent_architecture_recommender.tracing import list_traces, load_trace, waterfall_rows
+    from multi_agent_architecture_recommender.worker_pool import CrewWorkerPool
 except ImportError:
     st.error("⚠️ CrewAI project not found. Please ensure the multi_agent_architecture_recommender package is available.")
     st.stop()
 
-# Data Models (from your existing code)
-class ArchitectureType(Enum):
-    MONOLITHIC = "monolithic"
-    MICROSERVICES = "microservices"
-    SERVERLESS = "serverless"
-    EVENT_DRIVEN = "event_driven"
-    LAYERED = "layered"
-    HEXAGONAL = "hexagonal"
-    MODULAR_MONOLITH = "modular_monolith"
-
-@dataclass
-class RequirementContext:
-    # Scale & Performance
-    expected_users: int
-    expected_requests_per_second: int
-    data_volume_gb: float
-    latency_requirements_ms: int
-    peak_load_multiplier: float
-    
-    # Team & Organization
-    team_size: int
-    team_experience_level: str
-    number_of_teams: int
-    development_velocity_priority: str
-    devops_maturity: str
-    
-    # Technical Constraints
-    budget_constraint: str
-    existing_infrastructure: List[str]
-    preferred_cloud_provider: Optional[str]
-    compliance_requirements: List[str]
-    legacy_system_integration: bool
-    
-    # Business Requirements
-    time_to_market: str
-    scalability_needs: str
-    availability_requirements: float
-    multi_tenant_needs: bool
-    geographic_distribution: str
-    
-    # Technical Preferences
-    technology_stack: List[str]
-    data_consistency_needs: str
-    security_level: str
-    integration_complexity: str
-    
-    def to_dict(self):
-        """Convert RequirementContext to dictionary for CrewAI inputs"""
-        return {
-            'expected_users': self.expected_users,
-            'expected_requests_per_second': self.expected_requests_per_second,
-            'data_volume_gb': self.data_volume_gb,
-            'latency_requirements_ms': self.latency_requirements_ms,
-            'peak_load_multiplier': self.peak_load_multiplier,
-            'team_size': self.team_size,
-            'team_experience_level': self.team_experience_level,
-            'number_of_teams': self.number_of_teams,
-            'development_velocity_priority': self.development_velocity_priority,
-            'devops_maturity': self.devops_maturity,
-            'budget_constraint': self.budget_constraint,
-            'existing_infrastructure': self.existing_infrastructure,
-            'preferred_cloud_provider': self.preferred_cloud_provider,
-            'compliance_requirements': self.compliance_requirements,
-            'legacy_system_integration': self.legacy_system_integration,
-            'time_to_market': self.time_to_market,
-            'scalability_needs': self.scalability_needs,
-            'availability_requirements': self.availability_requirements,
-            'multi_tenant_needs': self.multi_tenant_needs,
-            'geographic_distribution': self.geographic_distribution,
-            'technology_stack': self.technology_stack,
-            'data_consistency_needs': self.data_consistency_needs,
-            'security_level': self.security_level,
-            'integration_complexity': self.integration_complexity,
-        }
-
 # Streamlit Configuration
 st.set_page_config(
     page_title="🏗️ AI Architecture Recommender",
@@ -284,23 +214,305 @@ def display_usage_steps():
             </div>
         """, unsafe_allow_html=True)
 
-@contextlib.contextmanager
-def capture_output():
-    """Capture stdout and stderr for display in Streamlit"""
-    old_stdout = sys.stdout
-    old_stderr = sys.stderr
-    stdout_buffer = StringIO()
-    stderr_buffer = StringIO()
-    try:
-        sys.stdout = stdout_buffer
-        sys.stderr = stderr_buffer
-        yield stdout_buffer, stderr_buffer
-    finally:
-        sys.stdout = old_stdout
-        sys.stderr = old_stderr
+PRUNING_ACTION_LABELS = {
+    "skip": "skipped",
+    "template": "replaced with a templated answer",
+    "lightweight": "run on a lightweight model",
+}
+
+def display_pruning_decisions(decisions):
+    """Show which tasks relevance rules removed or downgraded"""
+    if not decisions:
+        return
+    with st.expander("✂️ Tasks Pruned for This Scenario", expanded=True):
+        for decision in decisions.values():
+            st.markdown(
+                f"- **{format_task_name(decision.task)}**: {PRUNING_ACTION_LABELS[decision.action]} "
+                f"({decision.reason})"
+            )
+
+def display_budget_usage(usages):
+    """Show each task's output size against its budget"""
+    if not usages:
+        return
+    st.markdown("### 📏 Output Budgets")
+    st.table([
+        {
+            "Task": format_task_name(usage.task),
+            "Tokens": usage.output_tokens,
+            "Budget": usage.max_tokens or "unbounded",
+            "Used": f"{usage.budget_used:.0%}" if usage.budget_used is not None else "-",
+            "Sections": f"{len(usage.sections_present)}/{len(usage.sections_present) + len(usage.sections_missing)}",
+            "Missing": ", ".join(usage.sections_missing) or "-",
+        }
+        for usage in usages
+    ])
+
+# Task sections shown per report page
+REPORT_PAGE_SIZE = 3
+
+@st.cache_data(max_entries=32, show_spinner=False)
+def parse_report(_result, run_id: str):
+    """Report sections for a result, parsed once per run"""
+    return build_report(_result, end_marker=load_budget_config()["end_marker"])
+
+@st.fragment
+def display_report_section(section, run_id: str):
+    """One task: summary always, full markdown only while toggled open"""
+    st.markdown(f"### {section.title}" + (" (templated)" if section.templated else ""))
+    if section.summary:
+        st.markdown(section.summary)
+    if section.headings:
+        st.caption("Covers: " + " · ".join(section.headings))
+    if st.toggle("Show full analysis", key=f"report_{run_id}_{section.key}"):
+        st.markdown(section.body)
+
+@st.fragment
+def display_report(result):
+    """Paginated report; page changes and section toggles rerun only the report"""
+    sections = parse_report(result, result.run_id)
+    st.markdown("## 📊 Architecture Recommendation Report")
+
+    page_sections, page_count = paginate(sections, 1, REPORT_PAGE_SIZE)
+    if page_count > 1:
+        page = st.radio(
+            "Report page",
+            range(1, page_count + 1),
+            format_func=lambda p: f"Page {p} of {page_count}",
+            horizontal=True,
+            key=f"report_page_{result.run_id}",
+            label_visibility="collapsed",
+        )
+        page_sections, _ = paginate(sections, page, REPORT_PAGE_SIZE)
+    for section in page_sections:
+        display_report_section(section, result.run_id)
+
+def display_provider_comparison(result):
+    """Per-provider cost and integration summaries in side-by-side columns"""
+    sections = parse_report(result, result.run_id)
+    by_provider = {}
+    for section in sections:
+        task_name, provider = split_task_name(section.key)
+        if provider:
+            by_provider.setdefault(provider, {})[task_name] = section
+    st.markdown("## ☁️ Provider Comparison")
+    st.caption("Scalability, team and compliance analyses are shared; these ran once per provider, in parallel. The full comparison is the last report section.")
+    for column, provider in zip(st.columns(len(result.providers)), result.providers):
+        with column:
+            st.markdown(f"### {provider}")
+            for task_name in PROVIDER_TASKS:
+                section = by_provider.get(provider, {}).get(task_name)
+                if section:
+                    st.markdown(f"**{format_task_name(task_name)}**")
+                    st.markdown(section.summary or "_No summary._")
+
+# Seconds between checks on a full analysis running behind a quick answer
+FULL_ANALYSIS_POLL_S = 2
+# How long the form waits for the quick answer before falling back to the full analysis
+QUICK_ANSWER_TIMEOUT_S = float(os.getenv("QUICK_ANSWER_TIMEOUT_S", "30"))
+
+def display_quick_answer(quick):
+    """The single-call recommendation shown while the full analysis runs"""
+    recommendation = quick.recommendation
+    st.markdown("## ⚡ Quick Recommendation")
+    st.caption(
+        f"First pass from one {quick.model} call in {quick.duration_s:.1f}s "
+        f"({quick.token_usage.get('total_tokens', 0):,} tokens). The full analysis replaces it when ready."
+    )
+    col1, col2 = st.columns([1, 2])
+    with col1:
+        st.metric("Recommended Pattern", PATTERN_LABELS[recommendation.pattern])
+        if recommendation.confidence:
+            st.metric("Confidence", f"{recommendation.confidence}/10")
+    with col2:
+        if recommendation.scores:
+            st.table([
+                {"Pattern": PATTERN_LABELS[pattern], "Score": f"{recommendation.scores[pattern]}/10"}
+                for pattern in recommendation.ranking
+            ])
+    if recommendation.rationale:
+        st.markdown(recommendation.rationale)
+    if recommendation.risks:
+        st.markdown("**Key risks**\n" + "\n".join(f"- {risk}" for risk in recommendation.risks))
+
+@st.fragment(run_every=FULL_ANALYSIS_POLL_S)
+def display_pending_analysis():
+    """Quick answer until the background full analysis finishes, then swap in its report"""
+    flight = st.session_state.get("pending_analysis")
+    if flight is None:
+        return
+    if flight.done():
+        st.session_state.pending_analysis = None
+        st.session_state.pending_quick = None
+        try:
+            st.session_state.analysis_result = flight.result()
+        except Exception as e:
+            st.session_state.analysis_error = e
+        st.rerun()
+
+    # A quick answer that outlasted QUICK_ANSWER_TIMEOUT_S is shown once it arrives
+    quick_flight = st.session_state.get("pending_quick")
+    if quick_flight is not None and quick_flight.done():
+        st.session_state.pending_quick = None
+        try:
+            st.session_state.quick_result = quick_flight.result()
+        except Exception:
+            pass
+    quick = st.session_state.get("quick_result")
+    if quick:
+        display_quick_answer(quick)
+    st.info(f"⏳ Full multi-agent analysis running in the background ({time.time() - flight.started:.0f}s){describe_progress(flight.progress)}...")
+
+@st.cache_data(max_entries=32, show_spinner=False)
+def extract_recommendation_cached(_result, run_id: str):
+    """Pattern, scores and risks read from a full result, once per run"""
+    return extract_recommendation(_result)
+
+def display_recommendation_diff(quick, result):
+    """Highlight what the full analysis confirmed or changed in the quick answer"""
+    full = extract_recommendation_cached(result, result.run_id)
+    full_text = "\n".join(task.raw for task in result.tasks_output) or result.raw
+    diff = compare_recommendations(quick.recommendation, full, full_text)
+
+    with st.expander("🔍 Quick Answer vs Full Analysis", expanded=True):
+        quick_label = PATTERN_LABELS[diff.quick_pattern]
+        if diff.full_pattern is None:
+            st.info(f"Quick answer: **{quick_label}**. The full report names no pattern the comparison recognises; see the report below.")
+        elif diff.pattern_changed:
+            st.warning(f"Recommendation changed: quick answer **{quick_label}** → full analysis **{PATTERN_LABELS[diff.full_pattern]}**")
+        else:
+            st.success(f"The full analysis confirms the quick answer: **{quick_label}**")
+
+        if diff.scores:
+            notable = {pattern for pattern, _, _ in diff.notable_score_changes()}
+            rows = []
+            for pattern, quick_score, full_score in diff.scores:
+                change = "-"
+                if quick_score is not None and full_score is not None:
+                    change = f"{full_score - quick_score:+d}" + (" ⚠️" if pattern in notable else "")
+                rows.append({
+                    "Pattern": PATTERN_LABELS[pattern],
+                    "Quick": quick_score if quick_score is not None else "-",
+                    "Full": full_score if full_score is not None else "-",
+                    "Change": change,
+                })
+            st.table(rows)
+
+        lines = [f"- :green[✓ confirmed] {risk}" for risk in diff.risks_confirmed]
+        lines += [f"- :orange[only in quick answer] {risk}" for risk in diff.risks_quick_only]
+        lines += [f"- :blue[raised by full analysis] {risk}" for risk in diff.risks_full_only]
+        if lines:
+            st.markdown("**Key risks**\n" + "\n".join(lines))
+
+TRACE_CATEGORIES = {
+    "analysis": "run",
+    "quick": "quick answer",
+    "crew": "setup",
+    "task": "task",
+    "agent": "agent step",
+    "llm": "LLM call",
+}
+
+@st.cache_data(max_entries=16, show_spinner=False)
+def load_trace_cached(path: str, modified: float):
+    """Parsed trace file; ``modified`` keys the cache to the file's version"""
+    return load_trace(path)
+
+def display_trace(path: str, modified: float):
+    """Summary metrics and a waterfall of one run's spans"""
+    resource, spans = load_trace_cached(path, modified)
+    rows = waterfall_rows(spans)
+    if not rows:
+        st.warning("This trace has no spans.")
+        return
 
-def run_analysis(requirements: RequirementContext):
-    """Run the CrewAI analysis with Streamlit-safe execution"""
+    llm_calls = [span for span in spans if span.name == "llm.call"]
+    col1, col2, col3, col4 = st.columns(4)
+    col1.metric("Duration", f"{rows[0]['span'].duration_s:.1f}s")
+    col2.metric("Tasks", sum(1 for span in spans if span.name.startswith("task ")))
+    col3.metric("LLM Calls", len(llm_calls), delta=f"{sum(1 for s in llm_calls if s.error)} failed", delta_color="inverse")
+    col4.metric("Tokens", sum(
+        s.attributes.get("gen_ai.usage.input_tokens", 0) + s.attributes.get("gen_ai.usage.output_tokens", 0)
+        for s in llm_calls
+    ))
+
+    data = []
+    for i, row in enumerate(rows, start=1):
+        span = row["span"]
+        label = span.name
+        if span.name == "agent.step":
+            label = f"step {span.attributes.get('agent.iteration', '')}"
+        elif span.name == "llm.call":
+            label = f"LLM {span.attributes.get('gen_ai.request.model', '')}"
+        data.append({
+            "span": f"{i:>3}. {'· ' * row['depth']}{label}",
+            "start": row["start_s"],
+            "end": max(row["end_s"], row["start_s"] + 0.001),
+            "duration_s": round(span.duration_s, 3),
+            "category": TRACE_CATEGORIES.get(span.name.split(".")[0].split(" ")[0], "other"),
+            "status": span.error or "ok",
+            "details": ", ".join(f"{k}={v}" for k, v in span.attributes.items()),
+        })
+
+    chart = alt.Chart(alt.Data(values=data)).mark_bar().encode(
+        x=alt.X("start:Q", title="Seconds since run start"),
+        x2="end:Q",
+        y=alt.Y("span:N", sort=None, title=None, axis=alt.Axis(labelLimit=320)),
+        color=alt.Color("category:N", title=None),
+        opacity=alt.condition("datum.status == 'ok'", alt.value(1.0), alt.value(0.5)),
+        tooltip=["span:N", "duration_s:Q", "status:N", "details:N"],
+    ).properties(height=max(120, 22 * len(data)))
+    st.altair_chart(chart)
+
+    slowest = sorted((s for s in spans if s.name.startswith(("task ", "llm.call"))), key=lambda s: -s.duration_s)[:5]
+    if slowest:
+        st.markdown("#### 🐢 Slowest Tasks and LLM Calls")
+        st.table([
+            {"Span": s.name, "Seconds": f"{s.duration_s:.2f}", "Status": s.error or "ok",
+             "Details": ", ".join(f"{k}={v}" for k, v in s.attributes.items())}
+            for s in slowest
+        ])
+    st.caption(f"OTLP/JSON trace: {path} · requirements {str(resource.get('requirements.fingerprint', ''))[:12]}")
+
+@st.cache_resource
+def get_crew_executor():
+    """Executor shared by all sessions for crew runs.
+
+    A pool of pre-warmed worker processes by default; set
+    ARCHITECTURE_EXECUTION=thread to run crews on threads in this process.
+    """
+    if os.getenv("ARCHITECTURE_EXECUTION", "process") == "thread":
+        return ThreadPoolExecutor(max_workers=int(os.getenv("CREW_POOL_SIZE", "2")), thread_name_prefix="crew")
+    return CrewWorkerPool()
+
+@st.cache_resource
+def get_single_flight():
+    """Coalesces identical analyses submitted by any session while one is running"""
+    return SingleFlight(get_crew_executor())
+
+@st.cache_resource
+def get_quick_flights():
+    """Quick answers run on their own threads: queued behind crew runs in the
+    crew executor, a seconds-long call could wait minutes for a free worker"""
+    executor = ThreadPoolExecutor(max_workers=int(os.getenv("QUICK_POOL_SIZE", "4")), thread_name_prefix="quick")
+    return SingleFlight(executor)
+
+def describe_progress(progress) -> str:
+    """" · 3/9 tasks, last: Cost" style suffix for status messages"""
+    if progress is None or not progress.total_tasks:
+        return ""
+    text = f" · {progress.completed_tasks}/{progress.total_tasks} tasks"
+    if progress.last_task:
+        text += f", last: {format_task_name(progress.last_task)}"
+    return text
+
+def run_analysis(requirements: RequirementContext, budget_profile: str = None, quick_first: bool = False, providers=None):
+    """Run the CrewAI analysis with Streamlit-safe execution.
+
+    With ``quick_first`` the quick answer is awaited instead and the full
+    analysis is left running as ``st.session_state.pending_analysis``.
+    With two or more ``providers`` the run compares those cloud providers.
+    """
 
     st.success("🚀 Starting Architecture Analysis...")
 
@@ -350,55 +562,49 @@ def run_analysis(requirements: RequirementContext):
 
         inputs = requirements.to_dict()
 
+        # Same rules the runner applies; evaluated here so the user sees them up front
+        display_pruning_decisions(evaluate_pruning(comparison_inputs(inputs, validate_providers(providers)) if providers else inputs))
+
         progress_bar.progress(40)
         status_text.text("Agents are analyzing your requirements...")
 
-        # --- IMPORTANT FIX: run CrewAI in background thread ---
-        def run_crew():
-            crew = MultiAgentArchitectureRecommender().crew()
-            return crew.kickoff(inputs=inputs)
+        # --- Run CrewAI off the Streamlit server: pre-warmed worker processes ---
+        # Identical analyses already running for any session are joined, not rerun
+        flights = get_single_flight()
+        if quick_first:
+            quick_flight, _ = get_quick_flights().submit(flight_key("quick", inputs), execute_quick_analysis, inputs)
+        flight, joined = flights.submit(
+            analysis_key(inputs, budget_profile, providers), execute_analysis, inputs, budget_profile, providers,
+        )
+        if joined:
+            st.info(f"🔗 An identical analysis has been running for {time.time() - flight.started:.0f}s; following its progress instead of starting another.")
+
+        if quick_first:
+            progress_bar.progress(60)
+            status_text.text("Preparing a quick first-pass recommendation...")
+            try:
+                st.session_state.quick_result = quick_flight.result(timeout=QUICK_ANSWER_TIMEOUT_S)
+            except FutureTimeoutError:
+                st.session_state.pending_quick = quick_flight
+                st.warning(f"⚠️ No quick answer after {QUICK_ANSWER_TIMEOUT_S:.0f}s; it will appear if it arrives before the full analysis.")
+            except Exception as e:
+                st.warning(f"⚠️ Quick answer unavailable ({e}); waiting for the full analysis.")
+            st.session_state.pending_analysis = flight
+            progress_bar.progress(100)
+            status_text.text("⚡ Quick answer ready; the full analysis continues in the background.")
+            return None
 
-        with ThreadPoolExecutor(max_workers=1) as executor:
-            future = executor.submit(run_crew)
-            result = future.result()
+        # Stream task progress between 40% and 100% until the run finishes
+        while not flight.wait(timeout=1.0):
+            progress = flight.progress
+            if progress and progress.total_tasks:
+                progress_bar.progress(40 + 59 * progress.completed_tasks // progress.total_tasks)
+            status_text.text(f"Agents are analyzing your requirements ({time.time() - flight.started:.0f}s){describe_progress(progress)}...")
+        result = flight.result()
 
         progress_bar.progress(100)
         status_text.text("✅ Analysis completed successfully!")
 
-        # --- Persist result ---
-        st.session_state.analysis_result = result
-
-        # --- Render result safely ---
-        st.markdown("## 📊 Architecture Recommendation Report")
-
-        if isinstance(result, str):
-            st.markdown(result)
-
-        elif hasattr(result, "final_output"):
-            st.markdown(result.final_output)
-
-        elif hasattr(result, "tasks_output"):
-            for i, task in enumerate(result.tasks_output, start=1):
-        
-                # Try to get a meaningful title safely
-                title = (
-                    getattr(task, "description", None)
-                    or getattr(task, "name", None)
-                    or f"Task {i}"
-                )
-        
-                st.markdown(f"### {title}")
-        
-                # Show task output safely
-                if hasattr(task, "output") and task.output:
-                    st.markdown(task.output)
-                elif hasattr(task, "raw") and task.raw:
-                    st.markdown(task.raw)
-                else:
-                    st.write(task)
-        else:
-            st.write(result)
-
         return result
 
     except Exception as e:
@@ -464,6 +670,10 @@ def get_form_defaults():
             'multi_tenant': True
         }
 
+def with_selected(options, selected):
+    """Multiselect options plus any pre-selected values they lack (e.g. an example's SOX)"""
+    return options + [value for value in selected if value not in options]
+
 def main():
     """Main Streamlit application"""
     
@@ -482,7 +692,7 @@ def main():
         
         page = st.selectbox(
             "🧭 Navigation",
-            ["🏠 Home", "📋 Usage Guide", "🤖 AI Agents", "⚙️ Analysis", "📊 Examples"]
+            ["🏠 Home", "📋 Usage Guide", "🤖 AI Agents", "⚙️ Analysis", "📊 Examples", "⏱️ Run Traces"]
         )
     
     if page == "🏠 Home":
@@ -607,22 +817,22 @@ def main():
             col1, col2 = st.columns(2)
             
             with col1:
-                expected_users = st.number_input("Expected Users", min_value=1, value=750000, step=1000)
-                expected_rps = st.number_input("Requests per Second", min_value=1, value=8000, step=100)
-                data_volume = st.number_input("Data Volume (GB)", min_value=0.1, value=250.0, step=10.0)
+                expected_users = st.number_input("Expected Users", min_value=1, value=int(defaults['expected_users']), step=1000)
+                expected_rps = st.number_input("Requests per Second", min_value=1, value=int(defaults['expected_rps']), step=100)
+                data_volume = st.number_input("Data Volume (GB)", min_value=0.1, value=float(defaults['data_volume']), step=10.0)
             
             with col2:
-                latency_ms = st.number_input("Latency Requirement (ms)", min_value=1, value=150, step=10)
-                peak_load_multiplier = st.number_input("Peak Load Multiplier", min_value=1.0, value=3.0, step=0.5)
-                availability = st.number_input("Availability (%)", min_value=90.0, max_value=99.999, value=99.95, step=0.01)
+                latency_ms = st.number_input("Latency Requirement (ms)", min_value=1, value=int(defaults['latency_ms']), step=10)
+                peak_load_multiplier = st.number_input("Peak Load Multiplier", min_value=1.0, value=float(defaults['peak_load_multiplier']), step=0.5)
+                availability = st.number_input("Availability (%)", min_value=90.0, max_value=99.999, value=float(defaults['availability']), step=0.01)
             
             # Team & Organization Section
             st.markdown("### 👥 Team & Organization")
             col1, col2 = st.columns(2)
             
             with col1:
-                team_size = st.number_input("Team Size", min_value=1, value=18, step=1)
-                number_of_teams = st.number_input("Number of Teams", min_value=1, value=4, step=1)
+                team_size = st.number_input("Team Size", min_value=1, value=int(defaults['team_size']), step=1)
+                number_of_teams = st.number_input("Number of Teams", min_value=1, value=int(defaults['number_of_teams']), step=1)
                 team_experience_options = ["junior", "mixed", "senior"]
                 team_experience_index = team_experience_options.index(defaults['team_experience']) if defaults['team_experience'] in team_experience_options else 1
                 team_experience = st.selectbox("Team Experience Level", team_experience_options, index=team_experience_index)
@@ -677,20 +887,20 @@ def main():
             with col1:
                 existing_infrastructure = st.multiselect(
                     "Existing Infrastructure",
-                    ["AWS", "Azure", "GCP", "On-premise", "PostgreSQL", "MySQL", "MongoDB", "Redis", "Kubernetes", "Docker"],
+                    with_selected(["AWS", "Azure", "GCP", "On-premise", "PostgreSQL", "MySQL", "Oracle", "MongoDB", "Redis", "Kafka", "Kubernetes", "Docker"], defaults['existing_infrastructure']),
                     default=defaults['existing_infrastructure']
                 )
                 
                 technology_stack = st.multiselect(
                     "Technology Stack",
-                    ["Python", "Java", "JavaScript", "TypeScript", "Go", "Rust", "React", "Vue", "Angular", "PostgreSQL", "MongoDB", "Redis", "Docker", "Kubernetes"],
+                    with_selected(["Python", "Java", "Spring", "JavaScript", "TypeScript", "Go", "Rust", "React", "Vue", "Angular", "PostgreSQL", "Oracle", "MongoDB", "Redis", "Kafka", "Docker", "Kubernetes"], defaults['technology_stack']),
                     default=defaults['technology_stack']
                 )
             
             with col2:
                 compliance_requirements = st.multiselect(
                     "Compliance Requirements",
-                    ["GDPR", "HIPAA", "SOC2", "PCI-DSS", "ISO27001", "FedRAMP"],
+                    with_selected(["GDPR", "HIPAA", "SOC2", "PCI-DSS", "ISO27001", "FedRAMP"], defaults['compliance_requirements']),
                     default=defaults['compliance_requirements']
                 )
                 
@@ -708,6 +918,28 @@ def main():
             with col2:
                 multi_tenant = st.checkbox("Multi-tenant Architecture Needed", value=defaults['multi_tenant'])
             
+            # Execution options
+            st.markdown("### ⚡ Execution Options")
+            budget_profiles = budget_profile_names()
+            default_profile = default_budget_profile()
+            budget_profile = st.selectbox(
+                "Output Budget Profile",
+                budget_profiles,
+                index=budget_profiles.index(default_profile) if default_profile in budget_profiles else 0,
+                help="Caps each agent's output length and required sections: 'fast' trades depth for latency, 'thorough' leaves length unbounded."
+            )
+            compare_providers = st.multiselect(
+                "Compare Cloud Providers",
+                CLOUD_PROVIDERS,
+                default=[],
+                help="Pick two or more to analyse cost and integration for each provider in parallel and get a side-by-side comparison instead of a single-provider report."
+            )
+            quick_first = st.checkbox(
+                "⚡ Quick answer first",
+                value=False,
+                help="Show a single-call recommendation within seconds while the full multi-agent analysis runs in the background. The full report replaces it when ready, with differences highlighted."
+            )
+            
             # Submit button
             submitted = st.form_submit_button("🚀 Start Architecture Analysis", type="primary")
             
@@ -747,11 +979,35 @@ def main():
                 # Store in session state
                 st.session_state.requirements = requirements
                 
-                # Run analysis
-                result = run_analysis(requirements)
+                providers = compare_providers if len(compare_providers) >= 2 else None
+                if len(compare_providers) == 1:
+                    st.info("Select at least two providers to compare; running the regular analysis for the preferred provider.")
                 
-                if result:
-                    st.session_state.analysis_result = result
+                # Run analysis; the report below renders from session state
+                st.session_state.quick_result = None
+                st.session_state.pending_analysis = None
+                st.session_state.pending_quick = None
+                st.session_state.analysis_result = run_analysis(requirements, budget_profile, quick_first, providers)
+
+        if st.session_state.get("pending_analysis"):
+            display_pending_analysis()
+
+        error = st.session_state.pop("analysis_error", None)
+        if error:
+            st.error("❌ Analysis failed")
+            st.exception(error)
+
+        result = st.session_state.get("analysis_result")
+        if result:
+            quick = st.session_state.get("quick_result")
+            if quick:
+                display_recommendation_diff(quick, result)
+            if result.providers:
+                display_provider_comparison(result)
+            display_report(result)
+            display_budget_usage(result.budget_usage)
+            if result.trace_path:
+                st.caption(f"⏱️ Run took {result.duration_s:.1f}s. Timeline: **Run Traces** page ({result.trace_path})")
 
     elif page == "📊 Examples":
         st.markdown("## 📊 Example Scenarios")
@@ -814,5 +1070,22 @@ def main():
                         st.session_state.example_requirements = example
                         st.success("Example loaded! Go to Analysis tab to run.")
 
+    elif page == "⏱️ Run Traces":
+        st.markdown("## ⏱️ Run Traces")
+        traces = list_traces()
+        if not traces:
+            st.info("No traces yet. Every analysis run writes one; start an analysis on the Analysis page.")
+        else:
+            paths = [path for _, path in traces]
+            modified = {path: mtime for mtime, path in traces}
+            latest = st.session_state.get("analysis_result")
+            selected = st.selectbox(
+                "Run",
+                paths,
+                index=paths.index(latest.trace_path) if latest and latest.trace_path in paths else 0,
+                format_func=lambda path: f"{datetime.fromtimestamp(modified[path]):%Y-%m-%d %H:%M:%S} · run {os.path.basename(path)[:8]}",
+            )
+            display_trace(selected, modified[selected])
+
 if __name__ == "__main__":
     main()
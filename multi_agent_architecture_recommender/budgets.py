@@ -0,0 +1,153 @@
+"""Per-task output budgets and measurement of outputs against them.
+
+Budgets live in ``config/budgets.yaml`` as deployment profiles. Each task gets
+a token cap and a list of required markdown sections; the crew turns these
+into output instructions, a ``max_tokens`` limit and an end-marker stop
+sequence sent with the request, so the provider stops generating at the
+marker, and ``measure_budgets`` reports what each task actually produced.
+"""
+import os
+import re
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+import yaml
+
+from multi_agent_architecture_recommender.comparison import split_task_name
+
+BUDGETS_CONFIG_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "config", "budgets.yaml")
+
+# Room for the agent's "Thought: ... Final Answer:" preamble on top of the answer itself
+REASONING_HEADROOM_TOKENS = 64
+
+
+@dataclass(frozen=True)
+class TaskBudget:
+    task: str
+    max_tokens: Optional[int]
+    sections: Tuple[str, ...]
+    end_marker: str
+
+    def instructions(self) -> str:
+        """Output instructions appended to the task's expected_output"""
+        lines = ["", "**Output budget (mandatory):**"]
+        if self.max_tokens:
+            lines.append(f"- Keep the whole answer under {int(self.max_tokens * 0.75)} words (about {self.max_tokens} tokens).")
+        lines.append("- Use exactly these markdown sections, in this order, and nothing else:")
+        lines.extend(f"  ## {section}" for section in self.sections)
+        lines.append(f"- After the last section write the line {self.end_marker} and stop.")
+        return "\n".join(lines)
+
+    @property
+    def llm_max_tokens(self) -> Optional[int]:
+        return self.max_tokens + REASONING_HEADROOM_TOKENS if self.max_tokens else None
+
+
+@dataclass(frozen=True)
+class BudgetUsage:
+    task: str
+    output_tokens: int
+    max_tokens: Optional[int]
+    sections_present: Tuple[str, ...]
+    sections_missing: Tuple[str, ...]
+
+    @property
+    def over_budget(self) -> bool:
+        return bool(self.max_tokens) and self.output_tokens > self.max_tokens
+
+    @property
+    def budget_used(self) -> Optional[float]:
+        """Fraction of the token budget used, or None when unbounded"""
+        return self.output_tokens / self.max_tokens if self.max_tokens else None
+
+
+def load_budget_config(path: str = BUDGETS_CONFIG_PATH) -> Dict[str, Any]:
+    with open(path) as f:
+        return yaml.safe_load(f)
+
+
+def budget_profile_names(path: str = BUDGETS_CONFIG_PATH) -> List[str]:
+    return list(load_budget_config(path)["profiles"])
+
+
+def default_budget_profile(path: str = BUDGETS_CONFIG_PATH) -> str:
+    return os.getenv("ARCHITECTURE_BUDGET_PROFILE") or load_budget_config(path)["default_profile"]
+
+
+def resolve_budgets(profile: Optional[str] = None, path: str = BUDGETS_CONFIG_PATH) -> Dict[str, TaskBudget]:
+    """Budgets for every task in ``profile`` (the configured default when None)"""
+    config = load_budget_config(path)
+    profile = profile or default_budget_profile(path)
+    if profile not in config["profiles"]:
+        raise ValueError(f"Unknown budget profile {profile!r}, expected one of {list(config['profiles'])}")
+
+    budgets = {}
+    for task_name, settings in (config["profiles"][profile] or {}).items():
+        settings = settings or {}
+        budgets[task_name] = TaskBudget(
+            task=task_name,
+            max_tokens=settings.get("max_tokens"),
+            sections=tuple(settings.get("sections") or config["sections"][task_name]),
+            end_marker=config["end_marker"],
+        )
+    return budgets
+
+
+try:
+    import tiktoken
+    _ENCODING = tiktoken.get_encoding("cl100k_base")
+except Exception:  # tiktoken is optional; fall back to the usual ~4 characters per token
+    _ENCODING = None
+
+
+def count_tokens(text: str) -> int:
+    """Token count of ``text``; exact with tiktoken, estimated without it"""
+    if _ENCODING is not None:
+        return len(_ENCODING.encode(text, disallowed_special=()))
+    return (len(text) + 3) // 4
+
+
+def _normalise_heading(text: str) -> str:
+    return re.sub(r"[^a-z0-9]+", " ", text.lower()).strip()
+
+
+def find_sections(text: str, sections: Tuple[str, ...]) -> Tuple[Tuple[str, ...], Tuple[str, ...]]:
+    """Split ``sections`` into those that appear as headings in ``text`` and those that don't"""
+    headings = set()
+    for line in text.splitlines():
+        stripped = line.strip()
+        match = re.match(r"^(?:#{1,6}\s+|\*\*)(.+?)(?:\*\*)?:?\s*$", stripped)
+        if match:
+            headings.add(_normalise_heading(match.group(1)))
+    # Prefix match so "## Architecture Pattern Scores (1-10)" counts as the section
+    present = tuple(
+        s for s in sections
+        if any(heading.startswith(_normalise_heading(s)) for heading in headings)
+    )
+    missing = tuple(s for s in sections if s not in present)
+    return present, missing
+
+
+def measure_output(task_name: str, text: str, budget: Optional[TaskBudget]) -> BudgetUsage:
+    sections = budget.sections if budget else ()
+    present, missing = find_sections(text, sections)
+    return BudgetUsage(
+        task=task_name,
+        output_tokens=count_tokens(text),
+        max_tokens=budget.max_tokens if budget else None,
+        sections_present=present,
+        sections_missing=missing,
+    )
+
+
+def measure_budgets(result: Any, budgets: Dict[str, TaskBudget]) -> List[BudgetUsage]:
+    """Output size and section coverage of every task in a crew result"""
+    usages = []
+    for task_output in getattr(result, "tasks_output", None) or []:
+        task_name = getattr(task_output, "name", None)
+        text = getattr(task_output, "raw", None) or ""
+        if task_name:
+            # Per-provider copies in a comparison share their task's budget
+            budget = budgets.get(task_name) or budgets.get(split_task_name(task_name)[0])
+            usages.append(measure_output(task_name, text, budget))
+    return usages
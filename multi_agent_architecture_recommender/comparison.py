@@ -0,0 +1,53 @@
+"""Multi-cloud comparison runs.
+
+A comparison runs the provider-independent tasks once, then one copy of each
+task in ``PROVIDER_TASKS`` per provider, all concurrently, and ends with
+``provider_comparison_task``, which puts the providers side by side. Copies
+are named ``<task>@<provider>`` (e.g. ``cost_task@AWS``) and share their
+task's pruning decision and output budget.
+"""
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+CLOUD_PROVIDERS = ("AWS", "Azure", "GCP")
+PROVIDER_TASKS = ("cost_task", "technology_integration_task")
+COMPARISON_TASK = "provider_comparison_task"
+PROVIDER_SEPARATOR = "@"
+
+_PROVIDER_PLACEHOLDER = "{preferred_cloud_provider}"
+
+
+def provider_task_name(task_name: str, provider: str) -> str:
+    return f"{task_name}{PROVIDER_SEPARATOR}{provider}"
+
+
+def split_task_name(name: str) -> Tuple[str, Optional[str]]:
+    """``"cost_task@AWS"`` -> ``("cost_task", "AWS")``; plain names have no provider"""
+    task_name, _, provider = name.partition(PROVIDER_SEPARATOR)
+    return task_name, provider or None
+
+
+def validate_providers(providers: Iterable[str]) -> Tuple[str, ...]:
+    """Distinct providers in CLOUD_PROVIDERS order; a comparison needs at least two"""
+    selected = set(providers)
+    unknown = selected - set(CLOUD_PROVIDERS)
+    if unknown:
+        raise ValueError(f"Unknown cloud providers {sorted(unknown)}, expected some of {list(CLOUD_PROVIDERS)}")
+    if len(selected) < 2:
+        raise ValueError("A provider comparison needs at least two providers")
+    return tuple(provider for provider in CLOUD_PROVIDERS if provider in selected)
+
+
+def pin_provider(text: str, provider: str) -> str:
+    """Fill in the provider before kickoff interpolates the remaining inputs"""
+    return text.replace(_PROVIDER_PLACEHOLDER, provider)
+
+
+def comparison_inputs(inputs: Dict[str, Any], providers: Tuple[str, ...]) -> Dict[str, Any]:
+    """Kickoff inputs for a comparison; shared tasks see every provider under comparison"""
+    listed = ", ".join(providers[:-1]) + f" or {providers[-1]}"
+    return dict(
+        inputs,
+        preferred_cloud_provider=f"{listed} (under comparison)",
+        compared_providers=", ".join(providers),
+    )
+
@@ -1,17 +1,139 @@
-from crewai import Agent, Crew, Process, Task
+from crewai import Agent, Crew, LLM, Process, Task
+from crewai.llms.providers.openai.completion import OpenAICompletion
 from crewai.project import CrewBase, agent, crew, task
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Sequence
+
+from multi_agent_architecture_recommender.budgets import TaskBudget, resolve_budgets
+from multi_agent_architecture_recommender.comparison import (
+    COMPARISON_TASK, PROVIDER_TASKS, pin_provider, provider_task_name, validate_providers,
+)
+from multi_agent_architecture_recommender.pruning import PruningDecision, evaluate_pruning
+from multi_agent_architecture_recommender.tools import KnowledgeBaseTool
+
+
+def _stop_at_provider(llm: LLM) -> LLM:
+    """Have the provider stop generating at ``llm.stop``.
+
+    CrewAI's native OpenAI client leaves ``stop`` out of the request and only
+    trims the finished text, so tokens past the end marker would still be
+    generated and billed. Chat Completions accepts ``stop``; send it there.
+    The Anthropic, Gemini, Bedrock, Azure and LiteLLM clients already send it.
+    """
+    if isinstance(llm, OpenAICompletion) and llm.api == "completions" and llm.supports_stop_words():
+        llm.additional_params.setdefault("stop", list(llm.stop))
+    return llm
+
 
 @CrewBase
 class MultiAgentArchitectureRecommender():
     """MultiAgentArchitectureRecommender crew"""
     agents_config = "config/agents.yaml"
     tasks_config = "config/tasks.yaml"
+
+    def __init__(self):
+        # Per instance: worker threads and processes each build their own crew
+        self.pruning_decisions: Dict[str, PruningDecision] = {}
+        self.task_budgets: Dict[str, TaskBudget] = {}
+
+    def prune(self, requirements, rules: Optional[Dict[str, Any]] = None) -> Dict[str, PruningDecision]:
+        """Evaluate relevance rules against the requirements; the next crew() applies them"""
+        self.pruning_decisions = evaluate_pruning(requirements, rules)
+        return self.pruning_decisions
+
+    def apply_budgets(self, profile: Optional[str] = None) -> Dict[str, TaskBudget]:
+        """Select an output budget profile; the next crew() enforces it"""
+        self.task_budgets = resolve_budgets(profile)
+        return self.task_budgets
+
+    def quick_llm(self, config: Dict[str, Any]) -> LLM:
+        """LLM for quick mode's single consolidated call (config/quick.yaml)"""
+        return LLM(model=config["model"], max_tokens=config.get("max_tokens"), temperature=config.get("temperature"))
+
+    def _budgeted(self, crew_task: Task, budget: TaskBudget) -> Task:
+        """Bound a task's output: section instructions, max_tokens and an end-marker stop"""
+        if budget.end_marker not in crew_task.expected_output:
+            crew_task.expected_output = crew_task.expected_output.rstrip() + "\n" + budget.instructions()
+        model = getattr(crew_task.agent.llm, "model", None) or crew_task.agent.llm
+        crew_task.agent.llm = _stop_at_provider(
+            LLM(model=model, max_tokens=budget.llm_max_tokens, stop=[budget.end_marker])
+        )
+        return crew_task
+
+    def _lightweight_task(self, task_name: str, decision: PruningDecision) -> Task:
+        """Copy of a task that runs on a cheaper model with a shorter brief"""
+        original = getattr(self, task_name)()
+        lightweight_agent = Agent(
+            role=original.agent.role,
+            goal=original.agent.goal,
+            backstory=original.agent.backstory,
+            llm=decision.llm,
+            tools=original.agent.tools,
+            verbose=True,
+            allow_delegation=False
+        )
+        return Task(
+            description=original.description,
+            expected_output=decision.expected_output or original.expected_output,
+            agent=lightweight_agent,
+            name=task_name
+        )
+
+    def _provider_task(self, task_name: str, provider: str, decision: Optional[PruningDecision] = None) -> Task:
+        """Copy of a provider-dependent task pinned to one provider, run concurrently with its siblings"""
+        original = getattr(self, task_name)()
+        expected_output = (decision.expected_output if decision else None) or original.expected_output
+        # Each copy gets its own agent: the copies execute on concurrent threads
+        provider_agent = Agent(
+            role=original.agent.role,
+            goal=original.agent.goal,
+            backstory=original.agent.backstory,
+            llm=decision.llm if decision else original.agent.llm,
+            tools=original.agent.tools,
+            verbose=True,
+            allow_delegation=False
+        )
+        crew_task = Task(
+            description=pin_provider(original.description, provider),
+            expected_output=pin_provider(expected_output, provider),
+            agent=provider_agent,
+            name=provider_task_name(task_name, provider),
+            async_execution=True
+        )
+        if task_name in self.task_budgets:
+            self._budgeted(crew_task, self.task_budgets[task_name])
+        return crew_task
+
+    def _planned_task(self, task_name: str) -> Optional[Task]:
+        """A task as this run executes it (downgraded and budgeted), or None if pruned"""
+        decision = self.pruning_decisions.get(task_name)
+        if decision is None:
+            crew_task = getattr(self, task_name)()
+        elif decision.runs_task:
+            crew_task = self._lightweight_task(task_name, decision)
+        else:
+            return None
+        if task_name in self.task_budgets:
+            self._budgeted(crew_task, self.task_budgets[task_name])
+        return crew_task
+
+    def _assemble(self, tasks: List[Task]) -> Crew:
+        agents = []
+        for crew_task in tasks:
+            if crew_task.agent not in agents:
+                agents.append(crew_task.agent)
+
+        return Crew(
+            agents=agents,
+            tasks=tasks,
+            process=Process.sequential,
+            verbose=True
+        )
    
     @agent
     def scalability_architect(self) -> Agent:
         return Agent(
             config=self.agents_config['scalability_architect'],
+            tools=[KnowledgeBaseTool()],
             verbose=True,
             allow_delegation=False
         )
@@ -20,6 +142,7 @@ class MultiAgentArchitectureRecommender():
     def team_structure_analyst(self) -> Agent:
         return Agent(
             config=self.agents_config['team_structure_analyst'],
+            tools=[KnowledgeBaseTool()],
             verbose=True,
             allow_delegation=False
         )
@@ -28,6 +151,7 @@ class MultiAgentArchitectureRecommender():
     def cost_optimization_analyst(self) -> Agent:
         return Agent(
             config=self.agents_config['cost_optimization_analyst'],
+            tools=[KnowledgeBaseTool()],
             verbose=True,
             allow_delegation=False
         )
@@ -36,6 +160,7 @@ class MultiAgentArchitectureRecommender():
     def compliance_and_security_expert(self) -> Agent:
         return Agent(
             config=self.agents_config['compliance_and_security_expert'],
+            tools=[KnowledgeBaseTool()],
             verbose=True,
             allow_delegation=False
         )
@@ -44,6 +169,7 @@ class MultiAgentArchitectureRecommender():
     def technology_integration_specialist(self) -> Agent:
         return Agent(
             config=self.agents_config['technology_integration_specialist'],
+            tools=[KnowledgeBaseTool()],
             verbose=True,
             allow_delegation=False
         )
@@ -52,6 +178,7 @@ class MultiAgentArchitectureRecommender():
     def architecture_synthesis_expert(self) -> Agent:
         return Agent(
             config=self.agents_config['architecture_synthesis_expert'],
+            tools=[KnowledgeBaseTool()],
             verbose=True,
             allow_delegation=False
         )
@@ -99,13 +226,51 @@ class MultiAgentArchitectureRecommender():
             agent=self.architecture_synthesis_expert(),  # Changed from 'agents' to 'agent'
             context=[self.scalability_task(), self.team_task(), self.cost_task()]
         )
+
+    @task
+    def provider_comparison_task(self) -> Task:
+        return Task(
+            config=self.tasks_config['provider_comparison_task'],
+            agent=self.architecture_synthesis_expert()
+        )
     
     @crew
     def crew(self) -> Crew:
         """Creates the MultiAgentArchitectureRecommender crew"""
-        return Crew(
-            agents=self.agents,
-            tasks=self.tasks,
-            process=Process.sequential,
-            verbose=True
-        )
+        tasks = []
+        for task_name in self.tasks_config:
+            if task_name == COMPARISON_TASK:
+                continue
+            crew_task = self._planned_task(task_name)
+            if crew_task is not None:
+                tasks.append(crew_task)
+        return self._assemble(tasks)
+
+    def comparison_crew(self, providers: Sequence[str]) -> Crew:
+        """Crew comparing cloud providers.
+
+        Provider-independent tasks run once; PROVIDER_TASKS run once per
+        provider, concurrently, with the shared outputs as context; the
+        comparison task then sets the providers side by side.
+        """
+        providers = validate_providers(providers)
+        shared, fanned_out = [], []
+        for task_name in self.tasks_config:
+            if task_name in ("synthesis_task", COMPARISON_TASK):
+                continue
+            if task_name in PROVIDER_TASKS:
+                decision = self.pruning_decisions.get(task_name)
+                if decision is None or decision.runs_task:
+                    fanned_out.extend(self._provider_task(task_name, provider, decision) for provider in providers)
+                continue
+            crew_task = self._planned_task(task_name)
+            if crew_task is not None:
+                shared.append(crew_task)
+
+        for crew_task in fanned_out:
+            crew_task.context = list(shared)
+        comparison = self.provider_comparison_task()
+        comparison.context = shared + fanned_out
+        if COMPARISON_TASK in self.task_budgets:
+            self._budgeted(comparison, self.task_budgets[COMPARISON_TASK])
+        return self._assemble(shared + fanned_out + [comparison])
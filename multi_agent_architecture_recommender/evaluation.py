@@ -0,0 +1,352 @@
+#!/usr/bin/env python
+"""Offline quality-versus-latency evaluation of execution configurations.
+
+Runs every scenario of ``scenarios/corpus.yaml`` under every configuration of
+``config/evaluation.yaml`` (budget profiles, task pruning, quick mode...) and
+records latency, token use and the recommendation each run makes. A
+configuration's quality is how often it recommends the same pattern as the
+baseline configuration on the same scenario, plus how well its ranking
+matches the baseline's and the corpus's expected ranking. The report marks the
+configurations on the Pareto front of latency, tokens and baseline agreement.
+
+Usage:
+    python -m multi_agent_architecture_recommender.evaluation --json evaluation.json
+    python -m multi_agent_architecture_recommender.evaluation --stub            # dry run, no LLM calls
+    python -m multi_agent_architecture_recommender.evaluation --from-json evaluation.json
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field
+from itertools import combinations
+from typing import Any, Dict, List, Optional, Sequence
+
+import yaml
+
+from multi_agent_architecture_recommender.models import RequirementContext
+from multi_agent_architecture_recommender.quick import PATTERN_LABELS, Recommendation, extract_recommendation
+from multi_agent_architecture_recommender.runner import execute_analysis, execute_quick_analysis
+from multi_agent_architecture_recommender.stubs import install_stub_crew, percentile
+from multi_agent_architecture_recommender.tracing import TRACE_DIR_ENV
+
+PACKAGE_DIR = os.path.dirname(os.path.abspath(__file__))
+CORPUS_PATH = os.path.join(PACKAGE_DIR, "scenarios", "corpus.yaml")
+EVALUATION_CONFIG_PATH = os.path.join(PACKAGE_DIR, "config", "evaluation.yaml")
+
+EXECUTION_MODES = ("full", "quick")
+
+
+@dataclass(frozen=True)
+class Scenario:
+    id: str
+    title: str
+    source: str
+    requirements: RequirementContext
+    expected_ranking: Sequence[str]
+
+
+@dataclass(frozen=True)
+class ExecutionConfig:
+    name: str
+    mode: str
+    description: str = ""
+    budget_profile: Optional[str] = None
+    pruning: bool = True
+    quick: Dict[str, Any] = field(default_factory=dict)
+
+
+@dataclass
+class RunRecord:
+    scenario: str
+    config: str
+    repeat: int
+    latency_s: float = 0.0
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    total_tokens: int = 0
+    pattern: Optional[str] = None
+    ranking: List[str] = field(default_factory=list)
+    error: Optional[str] = None
+
+
+@dataclass
+class ConfigSummary:
+    config: str
+    description: str
+    runs: int
+    failures: int
+    latency_p50_s: float
+    latency_p90_s: float
+    mean_total_tokens: float
+    # Share of scenarios whose pattern matches the baseline's / the corpus's top pattern
+    baseline_agreement: float
+    expected_top1: float
+    # Mean pairwise ranking agreement with the baseline's / the corpus's ranking
+    baseline_rank_agreement: float
+    expected_rank_agreement: float
+    pareto_optimal: bool = False
+    dominated_by: List[str] = field(default_factory=list)
+
+
+def load_corpus(path: str = CORPUS_PATH) -> List[Scenario]:
+    """Scenarios with validated requirements; expected rankings must name known patterns"""
+    with open(path) as f:
+        items = yaml.safe_load(f) or []
+    scenarios, seen = [], set()
+    for item in items:
+        if item["id"] in seen:
+            raise ValueError(f"{path}: duplicate scenario id {item['id']!r}")
+        unknown = [pattern for pattern in item["expected_ranking"] if pattern not in PATTERN_LABELS]
+        if unknown:
+            raise ValueError(f"{path}: {item['id']!r} ranks unknown patterns {unknown}")
+        seen.add(item["id"])
+        scenarios.append(Scenario(
+            id=item["id"],
+            title=item["title"],
+            source=item.get("source", ""),
+            requirements=RequirementContext.from_dict(item["requirements"]),
+            expected_ranking=tuple(item["expected_ranking"]),
+        ))
+    return scenarios
+
+
+def load_configurations(path: str = EVALUATION_CONFIG_PATH) -> Dict[str, Any]:
+    """``{"baseline": name, "configurations": {name: ExecutionConfig}}``"""
+    with open(path) as f:
+        config = yaml.safe_load(f) or {}
+    configurations = {}
+    for name, settings in (config.get("configurations") or {}).items():
+        if settings.get("mode") not in EXECUTION_MODES:
+            raise ValueError(f"{path}: {name!r} must set mode to one of {EXECUTION_MODES}")
+        configurations[name] = ExecutionConfig(name=name, **settings)
+    if config.get("baseline") not in configurations:
+        raise ValueError(f"{path}: baseline {config.get('baseline')!r} is not a configuration")
+    return {"baseline": config["baseline"], "configurations": configurations}
+
+
+# Running
+def run_once(scenario: Scenario, config: ExecutionConfig, repeat: int = 0) -> RunRecord:
+    """One run of ``scenario`` under ``config``; failures are recorded, not raised"""
+    record = RunRecord(scenario=scenario.id, config=config.name, repeat=repeat)
+    inputs = scenario.requirements.to_dict()
+    start = time.perf_counter()
+    try:
+        if config.mode == "quick":
+            result = execute_quick_analysis(inputs, config_overrides=config.quick)
+            recommendation = result.recommendation
+        else:
+            result = execute_analysis(inputs, config.budget_profile, pruning=config.pruning)
+            recommendation = extract_recommendation(result)
+    except Exception as e:
+        record.latency_s = time.perf_counter() - start
+        record.error = f"{type(e).__name__}: {e}"
+        return record
+
+    record.latency_s = result.duration_s
+    for key in ("prompt_tokens", "completion_tokens", "total_tokens"):
+        setattr(record, key, result.token_usage.get(key, 0))
+    record.pattern = recommendation.pattern
+    record.ranking = _ranking(recommendation)
+    return record
+
+
+def _ranking(recommendation: Recommendation) -> List[str]:
+    """Scored patterns best first, led by the recommended pattern when it is unscored"""
+    ranking = recommendation.ranking
+    if recommendation.pattern and recommendation.pattern not in ranking:
+        ranking.insert(0, recommendation.pattern)
+    return ranking
+
+
+def run_suite(scenarios: List[Scenario], configs: List[ExecutionConfig], repeats: int = 1,
+              jobs: int = 1) -> List[RunRecord]:
+    """Every scenario under every configuration, ``repeats`` times each"""
+    runs = [(scenario, config, repeat) for repeat in range(repeats) for scenario in scenarios for config in configs]
+    with ThreadPoolExecutor(max_workers=jobs) as executor:
+        futures = [executor.submit(run_once, *run) for run in runs]
+        records = []
+        for future in futures:
+            record = future.result()
+            records.append(record)
+            outcome = record.error or f"{record.pattern or 'no pattern'} in {record.latency_s:.1f}s"
+            print(f"[{len(records)}/{len(runs)}] {record.scenario} / {record.config}: {outcome}", file=sys.stderr)
+    return records
+
+
+# Scoring
+def rank_agreement(ranking: Sequence[str], reference: Sequence[str]) -> float:
+    """Share of the ordered pattern pairs in ``reference`` that ``ranking``
+    orders the same way; patterns missing from ``ranking`` rank last, tied"""
+    if not reference:
+        return 1.0
+    if len(reference) == 1:
+        return float(bool(ranking) and ranking[0] == reference[0])
+    position = {pattern: i for i, pattern in enumerate(ranking)}
+    unranked = len(ranking)
+    agreement = 0.0
+    pairs = list(combinations(reference, 2))
+    for better, worse in pairs:
+        better_at, worse_at = position.get(better, unranked), position.get(worse, unranked)
+        agreement += 1.0 if better_at < worse_at else 0.5 if better_at == worse_at else 0.0
+    return agreement / len(pairs)
+
+
+def _consensus(records: List[RunRecord]) -> Optional[RunRecord]:
+    """The successful record whose pattern most repeats agree on"""
+    succeeded = [record for record in records if not record.error]
+    if not succeeded:
+        return None
+    pattern, _ = Counter(record.pattern for record in succeeded).most_common(1)[0]
+    return next(record for record in succeeded if record.pattern == pattern)
+
+
+def _mean(values: List[float]) -> float:
+    return sum(values) / len(values) if values else 0.0
+
+
+def summarize(records: List[RunRecord], scenarios: List[Scenario], configs: List[ExecutionConfig],
+              baseline: str) -> List[ConfigSummary]:
+    """Per-configuration latency, tokens and agreement, with the Pareto front marked"""
+    by_run: Dict[tuple, List[RunRecord]] = {}
+    for record in records:
+        by_run.setdefault((record.config, record.scenario), []).append(record)
+    expected = {scenario.id: scenario.expected_ranking for scenario in scenarios}
+
+    summaries = []
+    for config in configs:
+        config_records = [record for record in records if record.config == config.name]
+        succeeded = [record for record in config_records if not record.error]
+        matches, top1, rank_baseline, rank_expected = [], [], [], []
+        for scenario in scenarios:
+            chosen = _consensus(by_run.get((config.name, scenario.id), []))
+            reference = _consensus(by_run.get((baseline, scenario.id), []))
+            if chosen is None:
+                continue
+            top1.append(float(chosen.pattern == expected[scenario.id][0]))
+            rank_expected.append(rank_agreement(chosen.ranking, expected[scenario.id]))
+            if reference is not None:
+                matches.append(float(chosen.pattern is not None and chosen.pattern == reference.pattern))
+                rank_baseline.append(rank_agreement(chosen.ranking, reference.ranking))
+        latencies = [record.latency_s for record in succeeded]
+        summaries.append(ConfigSummary(
+            config=config.name,
+            description=config.description,
+            runs=len(config_records),
+            failures=len(config_records) - len(succeeded),
+            latency_p50_s=percentile(latencies, 50),
+            latency_p90_s=percentile(latencies, 90),
+            mean_total_tokens=_mean([record.total_tokens for record in succeeded]),
+            baseline_agreement=_mean(matches),
+            expected_top1=_mean(top1),
+            baseline_rank_agreement=_mean(rank_baseline),
+            expected_rank_agreement=_mean(rank_expected),
+        ))
+    mark_pareto_front(summaries)
+    return summaries
+
+
+def _dominates(a: ConfigSummary, b: ConfigSummary) -> bool:
+    """No worse on latency, tokens and baseline agreement, and better on one"""
+    no_worse = (a.latency_p50_s <= b.latency_p50_s and a.mean_total_tokens <= b.mean_total_tokens
+                and a.baseline_agreement >= b.baseline_agreement)
+    better = (a.latency_p50_s < b.latency_p50_s or a.mean_total_tokens < b.mean_total_tokens
+              or a.baseline_agreement > b.baseline_agreement)
+    return no_worse and better
+
+
+def mark_pareto_front(summaries: List[ConfigSummary]):
+    """Configurations that every run failed are never on the front"""
+    candidates = [summary for summary in summaries if summary.runs > summary.failures]
+    for summary in candidates:
+        summary.dominated_by = [other.config for other in candidates if _dominates(other, summary)]
+        summary.pareto_optimal = not summary.dominated_by
+
+
+# Reporting
+def format_report(summaries: List[ConfigSummary], baseline: str) -> str:
+    header = (f"{'config':<16} {'runs':>4} {'fail':>4} {'p50':>7} {'p90':>7} {'tokens':>8} "
+              f"{'=base':>6} {'rank~base':>9} {'top1':>5} {'rank~exp':>8}  pareto")
+    lines = [header, "-" * len(header)]
+    for s in sorted(summaries, key=lambda s: s.latency_p50_s):
+        front = "*" if s.pareto_optimal else f"  (dominated by {', '.join(s.dominated_by)})" if s.dominated_by else ""
+        lines.append(
+            f"{s.config:<16} {s.runs:>4} {s.failures:>4} {s.latency_p50_s:>6.1f}s {s.latency_p90_s:>6.1f}s "
+            f"{s.mean_total_tokens:>8.0f} {s.baseline_agreement * 100:>5.0f}% {s.baseline_rank_agreement:>9.2f} "
+            f"{s.expected_top1 * 100:>4.0f}% {s.expected_rank_agreement:>8.2f}  {front}"
+        )
+    front = [s for s in sorted(summaries, key=lambda s: s.latency_p50_s) if s.pareto_optimal]
+    lines.append("")
+    lines.append(f"Baseline: {baseline}. '=base' is the share of scenarios recommending the baseline's pattern; "
+                 "rank columns are pairwise ranking agreement (1.0 = same order).")
+    lines.append("Pareto front (latency, tokens, baseline agreement), fastest first:")
+    for s in front:
+        lines.append(f"  {s.config}: {s.latency_p50_s:.1f}s p50, {s.mean_total_tokens:.0f} tokens, "
+                     f"{s.baseline_agreement * 100:.0f}% agreement - {s.description}")
+    return "\n".join(lines)
+
+
+def _select(available: Dict[str, Any], names: Optional[str], kind: str) -> List[str]:
+    if not names:
+        return list(available)
+    selected = [name.strip() for name in names.split(",") if name.strip()]
+    unknown = [name for name in selected if name not in available]
+    if unknown:
+        raise SystemExit(f"Unknown {kind} {unknown}, expected some of {list(available)}")
+    return selected
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Compare execution configurations on quality versus latency")
+    parser.add_argument("--corpus", default=CORPUS_PATH, help="Scenario corpus YAML")
+    parser.add_argument("--configs-file", default=EVALUATION_CONFIG_PATH, help="Execution configurations YAML")
+    parser.add_argument("--configs", help="Comma-separated configurations to run (the baseline always runs)")
+    parser.add_argument("--scenarios", help="Comma-separated scenario ids to run")
+    parser.add_argument("--repeats", type=int, default=1, help="Runs per scenario and configuration")
+    parser.add_argument("--jobs", type=int, default=1,
+                        help="Runs in parallel; above 1, latencies include contention for LLM rate limits")
+    parser.add_argument("--stub", action="store_true", help="Use the stub crew (stubs.py) instead of calling LLMs")
+    parser.add_argument("--stub-latency", type=float, default=0.5, help="Seconds the stub crew sleeps per analysis")
+    parser.add_argument("--json", dest="json_path", help="Also write the records and summaries to this JSON file")
+    parser.add_argument("--from-json", help="Report on records saved by an earlier --json run instead of running")
+    args = parser.parse_args(argv)
+
+    scenarios_by_id = {scenario.id: scenario for scenario in load_corpus(args.corpus)}
+    evaluation = load_configurations(args.configs_file)
+    baseline, configurations = evaluation["baseline"], evaluation["configurations"]
+    config_names = _select(configurations, args.configs, "configurations")
+    if baseline not in config_names:
+        config_names.insert(0, baseline)
+    configs = [configurations[name] for name in config_names]
+    scenarios = [scenarios_by_id[name] for name in _select(scenarios_by_id, args.scenarios, "scenarios")]
+
+    if args.from_json:
+        with open(args.from_json) as f:
+            records = [RunRecord(**record) for record in json.load(f)["records"]]
+        selected = {scenario.id for scenario in scenarios}
+        records = [record for record in records if record.config in config_names and record.scenario in selected]
+    else:
+        # Keep evaluation run traces out of the app's trace history; set before
+        # install_stub_crew, whose own default would otherwise win
+        os.environ.setdefault(TRACE_DIR_ENV, os.path.join(tempfile.gettempdir(), "architecture-evaluation-traces"))
+        if args.stub:
+            install_stub_crew(args.stub_latency)
+        records = run_suite(scenarios, configs, args.repeats, args.jobs)
+
+    summaries = summarize(records, scenarios, configs, baseline)
+    print(format_report(summaries, baseline))
+    if args.json_path:
+        with open(args.json_path, "w") as f:
+            json.dump({
+                "baseline": baseline,
+                "records": [asdict(record) for record in records],
+                "summaries": [asdict(summary) for summary in summaries],
+            }, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,308 @@
+"""Local knowledge base of reference patterns, cloud service facts and
+compliance control mappings, searchable with a precomputed BM25 index.
+
+Entries live in ``knowledge/*.yaml``. ``build_index`` compiles them into one
+binary file that ``KnowledgeIndex`` memory-maps: worker processes share its
+pages and opening it costs no parsing. The file records a hash of its
+sources and is rebuilt when they change.
+
+Rebuild or query from the command line::
+
+    python -m multi_agent_architecture_recommender.knowledge_base build
+    python -m multi_agent_architecture_recommender.knowledge_base search "dynamodb hot partition"
+"""
+import argparse
+import hashlib
+import heapq
+import json
+import math
+import mmap
+import os
+import re
+import struct
+import sys
+import tempfile
+from array import array
+from collections import Counter
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+
+import yaml
+
+KNOWLEDGE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "knowledge")
+INDEX_PATH = os.path.join(KNOWLEDGE_DIR, "index.bm25")
+
+CATEGORIES = ("pattern", "cloud", "compliance")
+
+BM25_K1 = 1.2
+BM25_B = 0.75
+# Title and tags count this many times in a document's term frequencies
+FIELD_BOOST = 2
+
+# magic, doc count, term count, postings count, term blob bytes, meta blob bytes, k1, b, source hash
+_HEADER = struct.Struct("<8sIIIIIff32s")
+_MAGIC = b"ARKB1" + (b"LE\0" if sys.byteorder == "little" else b"BE\0")
+
+_STOPWORDS = frozenset(
+    "a an and are as at be by for from in into is it of on or per the to with what which how "
+    "when where who does do should can our we you your".split()
+)
+
+
+@dataclass(frozen=True)
+class KnowledgeEntry:
+    id: str
+    title: str
+    text: str
+    tags: Tuple[str, ...] = ()
+
+    @property
+    def category(self) -> str:
+        return self.id.split(".", 1)[0]
+
+
+@dataclass(frozen=True)
+class SearchHit:
+    entry: KnowledgeEntry
+    score: float
+
+    def snippet(self) -> str:
+        """Compact, citable form used in agent prompts"""
+        return f"[KB:{self.entry.id}] {self.entry.title}: {' '.join(self.entry.text.split())}"
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase word tokens, hyphen-joined terms kept whole as well ("pci-dss" -> pci, dss, pcidss)"""
+    tokens = []
+    for word in re.findall(r"[a-z0-9]+(?:[-/][a-z0-9]+)*", text.lower()):
+        parts = re.split(r"[-/]", word)
+        if len(parts) > 1:
+            tokens.append("".join(parts))
+        tokens.extend(parts)
+    return [_stem(token) for token in tokens if token not in _STOPWORDS]
+
+
+def _stem(token: str) -> str:
+    # Plural folding only; enough for "replicas"/"replica" and "limits"/"limit"
+    if len(token) > 3 and token.endswith("s") and not token.endswith(("ss", "us", "is")):
+        return token[:-1]
+    return token
+
+
+def source_paths(directory: str = KNOWLEDGE_DIR) -> List[str]:
+    return sorted(os.path.join(directory, name) for name in os.listdir(directory) if name.endswith(".yaml"))
+
+
+def load_entries(directory: str = KNOWLEDGE_DIR) -> List[KnowledgeEntry]:
+    """All knowledge entries, checked for unique ids and known categories"""
+    entries, seen = [], set()
+    for path in source_paths(directory):
+        with open(path) as f:
+            for item in yaml.safe_load(f) or []:
+                entry = KnowledgeEntry(
+                    id=item["id"],
+                    title=item["title"],
+                    text=" ".join(item["text"].split()),
+                    tags=tuple(str(tag) for tag in item.get("tags") or ()),
+                )
+                if entry.id in seen:
+                    raise ValueError(f"{path}: duplicate knowledge entry id {entry.id!r}")
+                if entry.category not in CATEGORIES:
+                    raise ValueError(f"{path}: {entry.id!r} must start with one of {CATEGORIES}")
+                seen.add(entry.id)
+                entries.append(entry)
+    return entries
+
+
+def sources_hash(directory: str = KNOWLEDGE_DIR) -> bytes:
+    digest = hashlib.sha256()
+    for path in source_paths(directory):
+        digest.update(os.path.basename(path).encode())
+        with open(path, "rb") as f:
+            digest.update(f.read())
+    return digest.digest()
+
+
+def build_index(directory: str = KNOWLEDGE_DIR, path: str = INDEX_PATH) -> str:
+    """Compile the knowledge entries into the memory-mappable BM25 index file.
+
+    Layout after the header, all native-endian: per-document BM25 length
+    norms (float32), meta blob offsets (uint32), term string offsets (uint32),
+    term IDF (float32), postings offsets (uint32), postings doc ids and term
+    frequencies (uint32 each), then the sorted term strings and the JSON-encoded
+    entries.
+    """
+    entries = load_entries(directory)
+    doc_terms = []
+    for entry in entries:
+        counts = Counter(tokenize(entry.text))
+        for term in tokenize(" ".join((entry.title,) + entry.tags)):
+            counts[term] += FIELD_BOOST
+        doc_terms.append(counts)
+
+    lengths = [sum(counts.values()) for counts in doc_terms]
+    average_length = sum(lengths) / len(lengths) if lengths else 1.0
+    norms = array("f", (BM25_K1 * (1 - BM25_B + BM25_B * length / average_length) for length in lengths))
+
+    postings: Dict[str, List[Tuple[int, int]]] = {}
+    for doc_id, counts in enumerate(doc_terms):
+        for term, tf in counts.items():
+            postings.setdefault(term, []).append((doc_id, tf))
+    terms = sorted(postings, key=lambda term: term.encode())
+
+    term_blob, term_offsets = bytearray(), array("I", [0])
+    idf, postings_offsets = array("f"), array("I", [0])
+    postings_docs, postings_tf = array("I"), array("I")
+    for term in terms:
+        term_blob += term.encode()
+        term_offsets.append(len(term_blob))
+        df = len(postings[term])
+        idf.append(math.log(1 + (len(entries) - df + 0.5) / (df + 0.5)))
+        for doc_id, tf in postings[term]:
+            postings_docs.append(doc_id)
+            postings_tf.append(tf)
+        postings_offsets.append(len(postings_docs))
+
+    meta_blob, meta_offsets = bytearray(), array("I", [0])
+    for entry in entries:
+        meta_blob += json.dumps([entry.id, entry.title, entry.text, list(entry.tags)]).encode()
+        meta_offsets.append(len(meta_blob))
+
+    header = _HEADER.pack(
+        _MAGIC, len(entries), len(terms), len(postings_docs), len(term_blob), len(meta_blob),
+        BM25_K1, BM25_B, sources_hash(directory),
+    )
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(header)
+        for section in (norms, meta_offsets, term_offsets, idf, postings_offsets, postings_docs, postings_tf):
+            section.tofile(f)
+        f.write(term_blob)
+        f.write(meta_blob)
+    # Atomic so concurrently starting workers never map a half-written file
+    os.replace(tmp_path, path)
+    return path
+
+
+class KnowledgeIndex:
+    """Read-only view of a memory-mapped index file"""
+
+    def __init__(self, path: str = INDEX_PATH):
+        with open(path, "rb") as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        view = memoryview(self._map)
+        (magic, self.doc_count, self.term_count, postings_count, term_blob_size, meta_blob_size,
+         self.k1, self.b, self.source_hash) = _HEADER.unpack_from(view)
+        if magic != _MAGIC:
+            raise ValueError(f"{path} is not a knowledge index for this platform")
+
+        offset = _HEADER.size
+
+        def section(count: int, fmt: str) -> memoryview:
+            nonlocal offset
+            data = view[offset:offset + count * 4].cast(fmt)
+            offset += count * 4
+            return data
+
+        self._norms = section(self.doc_count, "f")
+        self._meta_offsets = section(self.doc_count + 1, "I")
+        self._term_offsets = section(self.term_count + 1, "I")
+        self._idf = section(self.term_count, "f")
+        self._postings_offsets = section(self.term_count + 1, "I")
+        self._postings_docs = section(postings_count, "I")
+        self._postings_tf = section(postings_count, "I")
+        self._terms = view[offset:offset + term_blob_size]
+        self._meta = view[offset + term_blob_size:offset + term_blob_size + meta_blob_size]
+
+    def _term(self, i: int) -> bytes:
+        return bytes(self._terms[self._term_offsets[i]:self._term_offsets[i + 1]])
+
+    def _find_term(self, term: bytes) -> int:
+        """Binary search over the sorted term strings; -1 when absent"""
+        low, high = 0, self.term_count
+        while low < high:
+            mid = (low + high) // 2
+            if self._term(mid) < term:
+                low = mid + 1
+            else:
+                high = mid
+        return low if low < self.term_count and self._term(low) == term else -1
+
+    def entry(self, doc_id: int) -> KnowledgeEntry:
+        entry_id, title, text, tags = json.loads(
+            bytes(self._meta[self._meta_offsets[doc_id]:self._meta_offsets[doc_id + 1]])
+        )
+        return KnowledgeEntry(id=entry_id, title=title, text=text, tags=tuple(tags))
+
+    def search(self, query: str, top_k: int = 3, category: Optional[str] = None) -> List[SearchHit]:
+        """Best BM25 matches for ``query``, optionally within one category"""
+        scores: Dict[int, float] = {}
+        for term in set(tokenize(query)):
+            i = self._find_term(term.encode())
+            if i < 0:
+                continue
+            idf = self._idf[i]
+            for p in range(self._postings_offsets[i], self._postings_offsets[i + 1]):
+                doc_id, tf = self._postings_docs[p], self._postings_tf[p]
+                scores[doc_id] = scores.get(doc_id, 0.0) + idf * tf * (self.k1 + 1) / (tf + self._norms[doc_id])
+
+        hits = []
+        for doc_id, score in heapq.nlargest(len(scores), scores.items(), key=lambda item: item[1]):
+            entry = self.entry(doc_id)
+            if category and entry.category != category:
+                continue
+            hits.append(SearchHit(entry, round(score, 3)))
+            if len(hits) == top_k:
+                break
+        return hits
+
+
+def _index_is_current(path: str, directory: str) -> bool:
+    try:
+        with open(path, "rb") as f:
+            header = f.read(_HEADER.size)
+        magic, *_, source_hash = _HEADER.unpack(header)
+    except (OSError, struct.error):
+        return False
+    return magic == _MAGIC and source_hash == sources_hash(directory)
+
+
+@lru_cache(maxsize=None)
+def get_index(path: str = INDEX_PATH, directory: str = KNOWLEDGE_DIR) -> KnowledgeIndex:
+    """The process-wide index, rebuilt first if missing or older than its sources"""
+    if not _index_is_current(path, directory):
+        try:
+            build_index(directory, path)
+        except OSError:
+            # Read-only install: keep the rebuilt index in the temp directory instead
+            path = os.path.join(tempfile.gettempdir(), f"architecture-knowledge-{sources_hash(directory).hex()[:16]}.bm25")
+            if not _index_is_current(path, directory):
+                build_index(directory, path)
+    return KnowledgeIndex(path)
+
+
+def search(query: str, top_k: int = 3, category: Optional[str] = None) -> List[SearchHit]:
+    return get_index().search(query, top_k=top_k, category=category)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build or query the architecture knowledge base index")
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("build", help="Compile knowledge/*.yaml into the BM25 index")
+    search_parser = commands.add_parser("search", help="Print the best matches for a query")
+    search_parser.add_argument("query")
+    search_parser.add_argument("--top-k", type=int, default=3)
+    search_parser.add_argument("--category", choices=CATEGORIES)
+    args = parser.parse_args(argv)
+
+    if args.command == "build":
+        path = build_index()
+        print(f"Indexed {KnowledgeIndex(path).doc_count} entries into {path}")
+    else:
+        for hit in search(args.query, args.top_k, args.category):
+            print(f"{hit.score:7.3f}  {hit.snippet()}\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,429 @@
+#!/usr/bin/env python
+"""Multi-user load test for one Streamlit server with a stubbed crew.
+
+Starts ``app.py`` under a real ``streamlit run`` server and connects N
+simulated browser sessions to it over Streamlit's websocket protocol
+(``/_stcore/stream``), the way browser tabs do. All sessions therefore share
+one server process: its GIL, its crew executor and single-flight map, and its
+memory. Each session opens the Examples page, loads a random example, opens
+the Analysis page, changes the scale inputs and submits the form, while
+``MultiAgentArchitectureRecommender`` is replaced by a stub that sleeps for a
+configurable latency instead of calling an LLM.
+
+Widgets are found by their labels in the elements the server sends, and the
+examples by their "Use ..." buttons, so the test follows the app's layout.
+Threads and memory are sampled from the server process tree (the server and
+any crew worker processes it starts).
+
+Usage:
+    python -m multi_agent_architecture_recommender.loadtest --concurrency 1,4,16
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.request
+from dataclasses import dataclass, field, asdict
+from typing import Dict, List, Optional
+
+from multi_agent_architecture_recommender.stubs import install_stub_crew, percentile
+
+DEFAULT_APP_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "app.py")
+
+NAVIGATION_LABEL = "🧭 Navigation"
+SUBMIT_LABEL = "🚀 Start Architecture Analysis"
+EXAMPLE_BUTTON_PREFIX = "Use "
+# Number inputs the simulated user changes before submitting, with their ranges
+SCALE_INPUTS = {
+    "Expected Users": (1000, 5000000, 1000),
+    "Requests per Second": (100, 50000, 100),
+    "Data Volume (GB)": (10, 5000, 10),
+}
+
+
+# Server
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+class StreamlitServer:
+    """``streamlit run app.py`` in a subprocess, with the stub crew configured through its environment"""
+
+    def __init__(self, app_path: str, startup_timeout_s: float = 60.0):
+        self.app_path = os.path.abspath(app_path)
+        self.startup_timeout_s = startup_timeout_s
+        self.port = _free_port()
+        self.process: Optional[subprocess.Popen] = None
+        self._log = tempfile.TemporaryFile()
+
+    @property
+    def url(self) -> str:
+        return f"ws://127.0.0.1:{self.port}/_stcore/stream"
+
+    def __enter__(self):
+        app_dir = os.path.dirname(self.app_path)
+        env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [app_dir, os.getenv("PYTHONPATH")])))
+        self.process = subprocess.Popen(
+            [sys.executable, "-m", "streamlit", "run", self.app_path,
+             "--server.headless", "true",
+             "--server.port", str(self.port),
+             "--server.address", "127.0.0.1",
+             "--server.fileWatcherType", "none",
+             # The simulated sessions cannot read the XSRF cookie a browser would get
+             "--server.enableXsrfProtection", "false",
+             "--browser.gatherUsageStats", "false"],
+            cwd=app_dir, env=env, stdout=self._log, stderr=subprocess.STDOUT,
+        )
+        deadline = time.monotonic() + self.startup_timeout_s
+        while time.monotonic() < deadline:
+            if self.process.poll() is not None:
+                break
+            try:
+                with urllib.request.urlopen(f"http://127.0.0.1:{self.port}/_stcore/health", timeout=1) as response:
+                    if response.status == 200:
+                        return self
+            except OSError:
+                time.sleep(0.2)
+        self.__exit__(None, None, None)
+        raise RuntimeError(f"Streamlit server did not start:\n{self.log_tail()}")
+
+    def log_tail(self, lines: int = 20) -> str:
+        self._log.seek(0)
+        return "\n".join(self._log.read().decode(errors="replace").splitlines()[-lines:])
+
+    def __exit__(self, *exc):
+        if self.process and self.process.poll() is None:
+            self.process.terminate()
+            try:
+                self.process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                self.process.kill()
+                self.process.wait()
+
+
+def _process_tree(pid: int) -> List[int]:
+    """``pid`` and its descendants (Linux /proc); just ``pid`` elsewhere"""
+    pids, pending = [], [pid]
+    while pending:
+        current = pending.pop()
+        pids.append(current)
+        try:
+            for task in os.listdir(f"/proc/{current}/task"):
+                with open(f"/proc/{current}/task/{task}/children") as f:
+                    pending.extend(int(child) for child in f.read().split())
+        except OSError:
+            continue
+    return pids
+
+
+def process_usage(pid: int) -> Dict[str, float]:
+    """RSS (MB) and thread count of the server process and, separately, of its whole tree"""
+    usage = {"server_rss_mb": 0.0, "server_threads": 0, "tree_rss_mb": 0.0}
+    for member in _process_tree(pid):
+        try:
+            with open(f"/proc/{member}/status") as f:
+                status = dict(line.split(":", 1) for line in f if ":" in line)
+        except OSError:
+            continue
+        rss_mb = int(status.get("VmRSS", "0 kB").split()[0]) / 1024
+        usage["tree_rss_mb"] += rss_mb
+        if member == pid:
+            usage["server_rss_mb"] = rss_mb
+            usage["server_threads"] = int(status.get("Threads", "0"))
+    return usage
+
+
+class ResourceMonitor:
+    """Samples the server's RSS and thread count in the background while sessions run"""
+
+    def __init__(self, pid: int, interval_s: float = 0.05):
+        self.pid = pid
+        self.interval_s = interval_s
+        self.peak_server_rss_mb = 0.0
+        self.peak_tree_rss_mb = 0.0
+        self.peak_threads = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._sample, daemon=True)
+
+    def _sample(self):
+        while not self._stop.is_set():
+            usage = process_usage(self.pid)
+            self.peak_server_rss_mb = max(self.peak_server_rss_mb, usage["server_rss_mb"])
+            self.peak_tree_rss_mb = max(self.peak_tree_rss_mb, usage["tree_rss_mb"])
+            self.peak_threads = max(self.peak_threads, usage["server_threads"])
+            self._stop.wait(self.interval_s)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+
+
+# Sessions
+class AppError(RuntimeError):
+    """The app rendered an exception or an error message"""
+
+
+class BrowserSession:
+    """One simulated browser tab: a websocket session that reruns the script
+    with widget states, as the Streamlit frontend does"""
+
+    def __init__(self, websocket, timeout_s: float):
+        from streamlit.proto.WidgetStates_pb2 import WidgetState
+
+        self._websocket = websocket
+        self._widget_state = WidgetState
+        self.timeout_s = timeout_s
+        # label -> element proto of the widgets the last run rendered
+        self.widgets: Dict[str, object] = {}
+        # Persistent widget values sent with every rerun, keyed by widget id
+        self.states: Dict[str, object] = {}
+        self.errors: List[str] = []
+
+    def set_value(self, label: str, **value):
+        """Set a widget's value for the next rerun, e.g. ``string_value="..."``"""
+        state = self._widget_state(id=self.widget(label).id, **value)
+        self.states[state.id] = state
+
+    def widget(self, label: str):
+        if label not in self.widgets:
+            raise AppError(f"No widget labelled {label!r} on the page")
+        return self.widgets[label]
+
+    async def rerun(self, click: Optional[str] = None):
+        """Rerun the script, pressing the button labelled ``click``; returns when the run finishes"""
+        from streamlit.proto.BackMsg_pb2 import BackMsg
+
+        message = BackMsg()
+        states = list(self.states.values())
+        if click:
+            states.append(self._widget_state(id=self.widget(click).id, trigger_value=True))
+        message.rerun_script.widget_states.widgets.extend(states)
+        await self._websocket.send(message.SerializeToString())
+        await asyncio.wait_for(self._until_finished(), self.timeout_s)
+        if self.errors:
+            raise AppError(self.errors[0])
+
+    async def _until_finished(self):
+        from streamlit.proto.Alert_pb2 import Alert
+        from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+
+        self.widgets, self.errors = {}, []
+        while True:
+            message = ForwardMsg()
+            message.ParseFromString(await self._websocket.recv())
+            kind = message.WhichOneof("type")
+            if kind == "delta" and message.delta.WhichOneof("type") == "new_element":
+                element = message.delta.new_element
+                element_kind = element.WhichOneof("type")
+                proto = getattr(element, element_kind)
+                if getattr(proto, "id", "") and getattr(proto, "label", ""):
+                    self.widgets[proto.label] = proto
+                elif element_kind == "exception":
+                    self.errors.append(f"{proto.type}: {proto.message}")
+                elif element_kind == "alert" and proto.format == Alert.ERROR:
+                    self.errors.append(proto.body)
+            elif kind == "script_finished":
+                status = message.script_finished
+                if status == ForwardMsg.FINISHED_WITH_COMPILE_ERROR:
+                    raise AppError("app.py failed to compile")
+                if status == ForwardMsg.FINISHED_EARLY_FOR_RERUN:
+                    # st.rerun(): the next run follows on the same stream
+                    self.widgets, self.errors = {}, []
+                    continue
+                return
+
+
+@dataclass
+class SessionResult:
+    session_id: int
+    example: str = ""
+    rerun_latencies_s: Dict[str, float] = field(default_factory=dict)
+    last_step: str = ""
+    error: Optional[str] = None
+
+
+def _option(widget, text: str) -> str:
+    return next(option for option in widget.options if text in option)
+
+
+async def run_session(session_id: int, url: str, timeout_s: float) -> SessionResult:
+    """Simulate one user: load an example, fill the analysis form and submit it"""
+    import websockets
+
+    result = SessionResult(session_id)
+    rng = random.Random(session_id)
+
+    async def timed(step: str, session: BrowserSession, click: Optional[str] = None):
+        result.last_step = step
+        start = time.perf_counter()
+        await session.rerun(click)
+        result.rerun_latencies_s[step] = time.perf_counter() - start
+
+    try:
+        async with websockets.connect(url, subprotocols=["streamlit"], max_size=None) as websocket:
+            session = BrowserSession(websocket, timeout_s)
+            await timed("home", session)
+
+            navigation = session.widget(NAVIGATION_LABEL)
+            session.set_value(NAVIGATION_LABEL, string_value=_option(navigation, "Examples"))
+            await timed("examples_page", session)
+
+            examples = sorted(label for label in session.widgets if label.startswith(EXAMPLE_BUTTON_PREFIX))
+            if not examples:
+                raise AppError("No examples on the Examples page")
+            result.example = rng.choice(examples)[len(EXAMPLE_BUTTON_PREFIX):]
+            await timed("load_example", session, click=EXAMPLE_BUTTON_PREFIX + result.example)
+
+            session.set_value(NAVIGATION_LABEL, string_value=_option(navigation, "Analysis"))
+            await timed("analysis_page", session)
+
+            for label, (low, high, step) in SCALE_INPUTS.items():
+                session.set_value(label, double_value=float(rng.randrange(low, high, step)))
+            await timed("submit", session, click=SUBMIT_LABEL)
+    except Exception as e:
+        result.error = f"{type(e).__name__} after {result.last_step or 'connect'}: {e}"
+    return result
+
+
+async def _run_users(concurrency: int, sessions_per_user: int, url: str, timeout_s: float) -> List[SessionResult]:
+    async def user(index: int) -> List[SessionResult]:
+        # Sessions of one user follow each other, like reloading the tab
+        return [await run_session(index * sessions_per_user + i, url, timeout_s) for i in range(sessions_per_user)]
+
+    per_user = await asyncio.gather(*(user(index) for index in range(concurrency)))
+    return [result for results in per_user for result in results]
+
+
+# Reporting
+@dataclass
+class LevelReport:
+    concurrency: int
+    sessions: int
+    failures: int
+    failure_rate: float
+    rerun_p50_s: float
+    rerun_p90_s: float
+    rerun_p99_s: float
+    submit_p50_s: float
+    submit_p99_s: float
+    wall_time_s: float
+    # Sampled from the one server process all sessions share
+    server_peak_threads: int
+    server_rss_idle_mb: float
+    server_rss_peak_mb: float
+    # Server plus crew worker processes (process execution)
+    tree_rss_peak_mb: float
+    # Server RSS retained after the sessions closed, per session
+    server_rss_retained_per_session_mb: float
+    errors: List[str] = field(default_factory=list)
+
+
+def run_level(concurrency: int, sessions_per_user: int, app_path: str, timeout_s: float,
+              latency_s: float, failure_rate: float, execution: str = "thread") -> LevelReport:
+    """Run ``concurrency`` simultaneous users against a fresh server, each completing ``sessions_per_user`` sessions"""
+    install_stub_crew(latency_s, failure_rate, execution)
+    total = concurrency * sessions_per_user
+    with StreamlitServer(app_path) as server:
+        # Warm the server up (imports, first compile, caches) before the clock starts
+        warm_up = asyncio.run(_run_users(1, 1, server.url, timeout_s))[0]
+        if warm_up.error:
+            raise RuntimeError(f"Warm-up session failed: {warm_up.error}\n{server.log_tail()}")
+        idle = process_usage(server.process.pid)
+
+        with ResourceMonitor(server.process.pid) as monitor:
+            start = time.perf_counter()
+            results = asyncio.run(_run_users(concurrency, sessions_per_user, server.url, timeout_s))
+            wall_time = time.perf_counter() - start
+        # Closed sessions are cleaned up asynchronously
+        time.sleep(1.0)
+        retained = process_usage(server.process.pid)["server_rss_mb"] - idle["server_rss_mb"]
+
+    latencies = [s for r in results for s in r.rerun_latencies_s.values()]
+    submits = [r.rerun_latencies_s["submit"] for r in results if "submit" in r.rerun_latencies_s]
+    errors = [f"[{r.example or 'no example'}] {r.error}" for r in results if r.error]
+    return LevelReport(
+        concurrency=concurrency,
+        sessions=total,
+        failures=len(errors),
+        failure_rate=len(errors) / total if total else 0.0,
+        rerun_p50_s=percentile(latencies, 50),
+        rerun_p90_s=percentile(latencies, 90),
+        rerun_p99_s=percentile(latencies, 99),
+        submit_p50_s=percentile(submits, 50),
+        submit_p99_s=percentile(submits, 99),
+        wall_time_s=wall_time,
+        server_peak_threads=monitor.peak_threads,
+        server_rss_idle_mb=idle["server_rss_mb"],
+        server_rss_peak_mb=monitor.peak_server_rss_mb,
+        tree_rss_peak_mb=monitor.peak_tree_rss_mb,
+        server_rss_retained_per_session_mb=max(0.0, retained) / total if total else 0.0,
+        errors=sorted(set(errors))[:5],
+    )
+
+
+def format_table(reports: List[LevelReport]) -> str:
+    header = (f"{'users':>5} {'sess':>5} {'fail%':>6} {'p50':>7} {'p90':>7} {'p99':>7} "
+              f"{'submit p50':>10} {'submit p99':>10} {'threads':>7} {'rss idle':>9} {'rss peak':>9} "
+              f"{'+workers':>9} {'kept/sess':>9}")
+    lines = [header, "-" * len(header)]
+    for r in reports:
+        lines.append(
+            f"{r.concurrency:>5} {r.sessions:>5} {r.failure_rate * 100:>5.1f}% "
+            f"{r.rerun_p50_s:>6.2f}s {r.rerun_p90_s:>6.2f}s {r.rerun_p99_s:>6.2f}s "
+            f"{r.submit_p50_s:>9.2f}s {r.submit_p99_s:>9.2f}s {r.server_peak_threads:>7} "
+            f"{r.server_rss_idle_mb:>7.0f}MB {r.server_rss_peak_mb:>7.0f}MB {r.tree_rss_peak_mb:>7.0f}MB "
+            f"{r.server_rss_retained_per_session_mb:>7.2f}MB"
+        )
+        for error in r.errors:
+            lines.append(f"      ! {error}")
+    lines.append("threads, rss: the shared server process; +workers: server and crew worker processes; "
+                 "kept/sess: server RSS retained after the sessions closed, per session")
+    return "\n".join(lines)
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Load test one app.py server with a stubbed crew")
+    parser.add_argument("--app", default=DEFAULT_APP_PATH, help="Path to the Streamlit script")
+    parser.add_argument("--concurrency", default="1,2,4,8", help="Comma-separated simultaneous user counts")
+    parser.add_argument("--sessions-per-user", type=int, default=2, help="Sessions each simulated user completes")
+    parser.add_argument("--crew-latency", type=float, default=0.5, help="Seconds the stub crew sleeps per analysis")
+    parser.add_argument("--crew-failure-rate", type=float, default=0.0, help="Fraction of stub crew runs that raise")
+    parser.add_argument("--execution", choices=["thread", "process"], default="thread",
+                        help="Crew execution mode inside the server (process starts the worker pool)")
+    parser.add_argument("--timeout", type=float, default=60.0, help="Per-rerun timeout in seconds")
+    parser.add_argument("--json", dest="json_path", help="Also write the report to this JSON file")
+    args = parser.parse_args(argv)
+
+    try:
+        import websockets  # noqa: F401  (installed with Streamlit's server)
+    except ImportError:
+        raise SystemExit("The load test needs the 'websockets' package: pip install websockets")
+
+    reports = []
+    for level in [int(c) for c in args.concurrency.split(",") if c.strip()]:
+        report = run_level(level, args.sessions_per_user, args.app, args.timeout,
+                           args.crew_latency, args.crew_failure_rate, args.execution)
+        reports.append(report)
+        print(f"concurrency={level}: {report.sessions} sessions in {report.wall_time_s:.1f}s", file=sys.stderr)
+
+    print(format_table(reports))
+    if args.json_path:
+        with open(args.json_path, "w") as f:
+            json.dump([asdict(r) for r in reports], f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
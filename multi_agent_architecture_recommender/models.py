@@ -0,0 +1,455 @@
+"""Requirement data models shared by the Streamlit app and offline tooling.
+
+``RequirementContext`` is frozen and normalised on construction, so equal
+requirements compare, hash and serialize identically. ``canonical_bytes()``
+is the stable encoding used for fingerprints; ``dumps_bulk``/``loads_bulk``
+store large scenario sets column by column.
+"""
+import gc
+import gzip
+import hashlib
+import json
+import math
+from dataclasses import dataclass, fields
+from enum import Enum
+from operator import attrgetter
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+REQUIREMENT_CONTEXT_SCHEMA_VERSION = 1
+
+
+class ArchitectureType(Enum):
+    MONOLITHIC = "monolithic"
+    MICROSERVICES = "microservices"
+    SERVERLESS = "serverless"
+    EVENT_DRIVEN = "event_driven"
+    LAYERED = "layered"
+    HEXAGONAL = "hexagonal"
+    MODULAR_MONOLITH = "modular_monolith"
+
+
+class RequirementValidationError(ValueError):
+    """Raised when requirement data does not match the RequirementContext schema"""
+
+
+def _enum(*values) -> Dict[str, Any]:
+    return {"type": "string", "enum": list(values)}
+
+
+_STRING_LIST = {"type": "array", "items": {"type": "string", "minLength": 1}}
+
+REQUIREMENT_CONTEXT_SCHEMA: Dict[str, Any] = {
+    "$schema": "https://json-schema.org/draft/2020-12/schema",
+    "$id": f"https://architecture-recommender/schemas/requirement-context/v{REQUIREMENT_CONTEXT_SCHEMA_VERSION}.json",
+    "title": "RequirementContext",
+    "type": "object",
+    "additionalProperties": False,
+    "properties": {
+        "schema_version": {"const": REQUIREMENT_CONTEXT_SCHEMA_VERSION},
+        # Scale & Performance
+        "expected_users": {"type": "integer", "minimum": 1},
+        "expected_requests_per_second": {"type": "integer", "minimum": 1},
+        "data_volume_gb": {"type": "number", "exclusiveMinimum": 0},
+        "latency_requirements_ms": {"type": "integer", "minimum": 1},
+        "peak_load_multiplier": {"type": "number", "minimum": 1},
+        # Team & Organization
+        "team_size": {"type": "integer", "minimum": 1},
+        "team_experience_level": _enum("junior", "mixed", "senior"),
+        "number_of_teams": {"type": "integer", "minimum": 1},
+        "development_velocity_priority": _enum("low", "medium", "high"),
+        "devops_maturity": _enum("low", "medium", "high"),
+        # Technical Constraints
+        "budget_constraint": _enum("low", "medium", "high"),
+        "existing_infrastructure": _STRING_LIST,
+        "preferred_cloud_provider": {"type": ["string", "null"], "enum": ["AWS", "Azure", "GCP", "Multi-cloud", None]},
+        "compliance_requirements": _STRING_LIST,
+        "legacy_system_integration": {"type": "boolean"},
+        # Business Requirements
+        "time_to_market": _enum("flexible", "medium", "fast"),
+        "scalability_needs": _enum("vertical", "horizontal", "both"),
+        "availability_requirements": {"type": "number", "minimum": 0, "maximum": 100},
+        "multi_tenant_needs": {"type": "boolean"},
+        "geographic_distribution": _enum("single_region", "multi_region", "global"),
+        # Technical Preferences
+        "technology_stack": _STRING_LIST,
+        "data_consistency_needs": _enum("strong", "eventual", "flexible"),
+        "security_level": _enum("standard", "high", "critical"),
+        "integration_complexity": _enum("simple", "medium", "complex"),
+    },
+}
+REQUIREMENT_CONTEXT_SCHEMA["required"] = [
+    name for name in REQUIREMENT_CONTEXT_SCHEMA["properties"] if name != "schema_version"
+]
+
+
+@dataclass(frozen=True, slots=True)
+class RequirementContext:
+    # Scale & Performance
+    expected_users: int
+    expected_requests_per_second: int
+    data_volume_gb: float
+    latency_requirements_ms: int
+    peak_load_multiplier: float
+
+    # Team & Organization
+    team_size: int
+    team_experience_level: str
+    number_of_teams: int
+    development_velocity_priority: str
+    devops_maturity: str
+
+    # Technical Constraints
+    budget_constraint: str
+    existing_infrastructure: Tuple[str, ...]
+    preferred_cloud_provider: Optional[str]
+    compliance_requirements: Tuple[str, ...]
+    legacy_system_integration: bool
+
+    # Business Requirements
+    time_to_market: str
+    scalability_needs: str
+    availability_requirements: float
+    multi_tenant_needs: bool
+    geographic_distribution: str
+
+    # Technical Preferences
+    technology_stack: Tuple[str, ...]
+    data_consistency_needs: str
+    security_level: str
+    integration_complexity: str
+
+    def __post_init__(self):
+        """Normalise values so equal requirements have one representation"""
+        for name, convert in _NORMALISERS.items():
+            try:
+                value = convert(getattr(self, name))
+            except (TypeError, ValueError) as error:
+                raise type(error)(f"{name}: {error}") from None
+            object.__setattr__(self, name, value)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert RequirementContext to dictionary for CrewAI inputs"""
+        return {
+            name: list(value) if isinstance(value, tuple) else value
+            for name, value in zip(_FIELD_NAMES, self._values())
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "RequirementContext":
+        """Validate ``data`` against the schema and build a RequirementContext"""
+        validate_requirements(data)
+        return cls(**{name: data[name] for name in _FIELD_NAMES})
+
+    def canonical_bytes(self) -> bytes:
+        """Stable byte encoding: schema version prefix, then a compact JSON
+        array of the field values ordered by field name"""
+        return _CANONICAL_PREFIX + _CANONICAL_ENCODER.encode(_canonical_values(self)).encode("utf-8")
+
+    def fingerprint(self) -> str:
+        """SHA-256 of canonical_bytes(); stable across processes and runs"""
+        return hashlib.sha256(self.canonical_bytes()).hexdigest()
+
+    def _values(self) -> Tuple[Any, ...]:
+        return tuple(getattr(self, name) for name in _FIELD_NAMES)
+
+    @classmethod
+    def _from_normalised(cls, values: Tuple[Any, ...]) -> "RequirementContext":
+        """Build from already-normalised values, skipping __post_init__"""
+        return _make_from_row(values)
+
+
+def _string_tuple(values: Optional[Iterable[str]]) -> Tuple[str, ...]:
+    # A bare string is iterable too and would become a tuple of its characters
+    if isinstance(values, (str, bytes)):
+        raise TypeError(f"expected a list of strings, got {values!r}")
+    return tuple(sorted({str(v).strip() for v in values or () if str(v).strip()}))
+
+
+def _optional_str(value: Optional[str]) -> Optional[str]:
+    return None if value is None or value == "" else str(value)
+
+
+def _integer(value: Any) -> int:
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        raise TypeError(f"expected an integer, got {value!r}")
+    # int() would truncate 3.7 to 3; integral floats such as 5.0 are fine
+    if isinstance(value, float) and not value.is_integer():
+        raise RequirementValidationError(f"{value} is not a whole number")
+    return int(value)
+
+
+def _boolean(value: Any) -> bool:
+    # bool("false") is True
+    if not isinstance(value, bool):
+        raise TypeError(f"expected true or false, got {value!r}")
+    return value
+
+
+def _finite_float(value: Any) -> float:
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        raise TypeError(f"expected a number, got {value!r}")
+    # NaN would pass every range check and then break canonical_bytes()
+    number = float(value)
+    if not math.isfinite(number):
+        raise RequirementValidationError(f"{number} is not a finite number")
+    return number
+
+
+_NORMALISERS: Dict[str, Callable[[Any], Any]] = {}
+for _field in fields(RequirementContext):
+    _spec = REQUIREMENT_CONTEXT_SCHEMA["properties"][_field.name]
+    if _spec["type"] == "array":
+        _NORMALISERS[_field.name] = _string_tuple
+    elif _spec["type"] == "integer":
+        _NORMALISERS[_field.name] = _integer
+    elif _spec["type"] == "number":
+        _NORMALISERS[_field.name] = _finite_float
+    elif _spec["type"] == "boolean":
+        _NORMALISERS[_field.name] = _boolean
+    elif _spec["type"] == ["string", "null"]:
+        _NORMALISERS[_field.name] = _optional_str
+    else:
+        _NORMALISERS[_field.name] = str
+
+_FIELD_NAMES: Tuple[str, ...] = tuple(f.name for f in fields(RequirementContext))
+
+_CANONICAL_PREFIX = f"rc{REQUIREMENT_CONTEXT_SCHEMA_VERSION}:".encode()
+_CANONICAL_ENCODER = json.JSONEncoder(separators=(",", ":"), ensure_ascii=False, allow_nan=False)
+_canonical_values = attrgetter(*sorted(_FIELD_NAMES))
+
+
+# Slot descriptors bypass the frozen __setattr__ without the per-call checks of object.__setattr__
+_SLOT_SETTERS = tuple(getattr(RequirementContext, name).__set__ for name in _FIELD_NAMES)
+
+
+def _make_from_row(row: Tuple[Any, ...]) -> RequirementContext:
+    """Build a context from normalised values in _FIELD_NAMES order"""
+    context = object.__new__(RequirementContext)
+    for set_slot, value in zip(_SLOT_SETTERS, row):
+        set_slot(context, value)
+    return context
+
+
+# Validation
+# REQUIREMENT_CONTEXT_SCHEMA is checked by the small interpreter below rather
+# than a general JSON Schema validator; it supports exactly these keywords and
+# refuses to compile a property that uses any other.
+SUPPORTED_SCHEMA_KEYWORDS = frozenset(
+    {"type", "enum", "const", "minimum", "maximum", "exclusiveMinimum", "items", "minLength"}
+)
+
+_JSON_TYPES = {
+    "string": (str,),
+    "integer": (int,),
+    "number": (int, float),
+    "boolean": (bool,),
+    "array": (list, tuple),
+    "null": (type(None),),
+}
+
+
+def _compile_check(name: str, spec: Dict[str, Any]) -> Callable[[Any], Optional[str]]:
+    """Turn one property schema into a check returning an error message or None"""
+    unsupported = set(spec) - SUPPORTED_SCHEMA_KEYWORDS
+    if unsupported:
+        raise ValueError(f"{name}: schema keywords {sorted(unsupported)} are not supported")
+    types = spec.get("type")
+    allowed = tuple(t for type_name in ([types] if isinstance(types, str) else types or []) for t in _JSON_TYPES[type_name])
+    integral = types == "integer"
+    enum = frozenset(spec["enum"]) if "enum" in spec else None
+    if "const" in spec:
+        enum = frozenset([spec["const"]])
+    minimum, maximum = spec.get("minimum"), spec.get("maximum")
+    exclusive_minimum = spec.get("exclusiveMinimum")
+    item_check = _compile_check(f"{name}[]", spec["items"]) if "items" in spec else None
+    min_length = spec.get("minLength")
+
+    def check(value: Any) -> Optional[str]:
+        # bool is an int subclass, but never a valid number here
+        if allowed and (not isinstance(value, allowed) or (isinstance(value, bool) and bool not in allowed)):
+            if not (integral and isinstance(value, float) and value.is_integer()):
+                return f"{name}: expected {types}, got {type(value).__name__}"
+        if isinstance(value, float) and not math.isfinite(value):
+            return f"{name}: {value} is not a finite number"
+        if enum is not None and value not in enum:
+            return f"{name}: {value!r} is not one of {sorted(enum, key=str)}"
+        if minimum is not None and value < minimum:
+            return f"{name}: {value} is below the minimum {minimum}"
+        if exclusive_minimum is not None and value <= exclusive_minimum:
+            return f"{name}: {value} must be greater than {exclusive_minimum}"
+        if maximum is not None and value > maximum:
+            return f"{name}: {value} is above the maximum {maximum}"
+        if min_length is not None and len(value) < min_length:
+            return f"{name}: must not be empty"
+        if item_check is not None:
+            for item in value:
+                error = item_check(item)
+                if error:
+                    return error
+        return None
+
+    return check
+
+
+_FIELD_CHECKS = {
+    name: _compile_check(name, spec)
+    for name, spec in REQUIREMENT_CONTEXT_SCHEMA["properties"].items()
+    if name != "schema_version"
+}
+
+
+def validate_requirements(data: Dict[str, Any]):
+    """Check ``data`` against REQUIREMENT_CONTEXT_SCHEMA, raising on the first problem"""
+    if not isinstance(data, dict):
+        raise RequirementValidationError(f"expected an object, got {type(data).__name__}")
+    version = data.get("schema_version", REQUIREMENT_CONTEXT_SCHEMA_VERSION)
+    if version != REQUIREMENT_CONTEXT_SCHEMA_VERSION:
+        raise RequirementValidationError(
+            f"schema_version {version!r} is not supported (expected {REQUIREMENT_CONTEXT_SCHEMA_VERSION})"
+        )
+    missing = [name for name in _FIELD_NAMES if name not in data]
+    if missing:
+        raise RequirementValidationError(f"missing fields: {', '.join(missing)}")
+    unknown = set(data) - set(_FIELD_CHECKS) - {"schema_version"}
+    if unknown:
+        raise RequirementValidationError(f"unknown fields: {', '.join(sorted(unknown))}")
+    for name, check in _FIELD_CHECKS.items():
+        error = check(data[name])
+        if error:
+            raise RequirementValidationError(error)
+
+
+# Bulk columnar format
+BULK_FORMAT = "requirement-context-columns"
+
+
+def dumps_bulk(contexts: Iterable[RequirementContext], compress: bool = True) -> bytes:
+    """Serialize contexts column by column.
+
+    String columns are dictionary-encoded and list columns are stored as a
+    flat code array plus offsets, so repeated values cost one small integer.
+    """
+    contexts = list(contexts)
+    columns: Dict[str, Any] = {}
+    for name in _FIELD_NAMES:
+        values = [getattr(context, name) for context in contexts]
+        kind = REQUIREMENT_CONTEXT_SCHEMA["properties"][name]["type"]
+        if kind == "array":
+            vocabulary: Dict[str, int] = {}
+            codes: List[int] = []
+            offsets = [0]
+            for items in values:
+                codes.extend(vocabulary.setdefault(item, len(vocabulary)) for item in items)
+                offsets.append(len(codes))
+            columns[name] = {"dict": list(vocabulary), "codes": codes, "offsets": offsets}
+        elif kind in ("string", ["string", "null"]):
+            vocabulary = {}
+            codes = [vocabulary.setdefault(value, len(vocabulary)) for value in values]
+            columns[name] = {"dict": list(vocabulary), "codes": codes}
+        else:
+            columns[name] = values
+    document = {
+        "format": BULK_FORMAT,
+        "schema_version": REQUIREMENT_CONTEXT_SCHEMA_VERSION,
+        "count": len(contexts),
+        "columns": columns,
+    }
+    data = json.dumps(document, separators=(",", ":"), ensure_ascii=False, allow_nan=False).encode("utf-8")
+    return gzip.compress(data, compresslevel=6) if compress else data
+
+
+def _check_codes(name: str, codes: Any, size: int) -> List[int]:
+    """Codes must index the column's vocabulary; Python would accept -1"""
+    if not isinstance(codes, list) or not all(type(code) is int for code in codes):
+        raise RequirementValidationError(f"{name}: codes must be a list of integers")
+    if codes and (min(codes) < 0 or max(codes) >= size):
+        raise RequirementValidationError(f"{name}: code out of range for a vocabulary of {size}")
+    return codes
+
+
+def _check_offsets(name: str, offsets: Any, count: int, total: int) -> List[int]:
+    if not isinstance(offsets, list) or len(offsets) != count + 1:
+        raise RequirementValidationError(f"{name}: expected {count + 1} offsets")
+    if offsets[0] != 0 or offsets[-1] != total or any(b < a for a, b in zip(offsets, offsets[1:])):
+        raise RequirementValidationError(f"{name}: offsets must rise from 0 to {total}")
+    return offsets
+
+
+def loads_bulk(data: bytes) -> List[RequirementContext]:
+    """Load contexts written by dumps_bulk, validating each column once.
+
+    Malformed or corrupt input raises RequirementValidationError.
+    """
+    try:
+        if data[:2] == b"\x1f\x8b":
+            data = gzip.decompress(data)
+        document = json.loads(data)
+    except (OSError, EOFError, ValueError) as exc:
+        raise RequirementValidationError(f"not a {BULK_FORMAT} document: {exc}") from exc
+    if not isinstance(document, dict) or document.get("format") != BULK_FORMAT:
+        raise RequirementValidationError(f"not a {BULK_FORMAT} document")
+    if document.get("schema_version") != REQUIREMENT_CONTEXT_SCHEMA_VERSION:
+        raise RequirementValidationError(
+            f"schema_version {document.get('schema_version')!r} is not supported "
+            f"(expected {REQUIREMENT_CONTEXT_SCHEMA_VERSION})"
+        )
+    count, columns = document.get("count"), document.get("columns")
+    if type(count) is not int or count < 0 or not isinstance(columns, dict):
+        raise RequirementValidationError(f"not a {BULK_FORMAT} document: bad count or columns")
+    missing = [name for name in _FIELD_NAMES if name not in columns]
+    if missing:
+        raise RequirementValidationError(f"missing columns: {', '.join(missing)}")
+
+    decoded = []
+    for name in _FIELD_NAMES:
+        column = columns[name]
+        check = _FIELD_CHECKS[name]
+        kind = REQUIREMENT_CONTEXT_SCHEMA["properties"][name]["type"]
+        if kind == "array" or isinstance(column, dict):
+            if not isinstance(column, dict) or not isinstance(column.get("dict"), list):
+                raise RequirementValidationError(f"{name}: expected a dictionary-encoded column")
+        if kind == "array":
+            vocabulary = column["dict"]
+            for item in vocabulary:
+                error = check([item])
+                if error:
+                    raise RequirementValidationError(error)
+            codes = _check_codes(name, column.get("codes"), len(vocabulary))
+            offsets = _check_offsets(name, column.get("offsets"), count, len(codes))
+            # Intern identical lists so millions of rows share a handful of tuples
+            interned: Dict[Tuple[int, ...], Tuple[str, ...]] = {}
+            values = []
+            for start, end in zip(offsets, offsets[1:]):
+                key = tuple(codes[start:end])
+                if key not in interned:
+                    interned[key] = _string_tuple(vocabulary[code] for code in key)
+                values.append(interned[key])
+        elif isinstance(column, dict):
+            vocabulary = column["dict"]
+            for value in vocabulary:
+                error = check(value)
+                if error:
+                    raise RequirementValidationError(error)
+            values = [vocabulary[code] for code in _check_codes(name, column.get("codes"), len(vocabulary))]
+        else:
+            if not isinstance(column, list) or any(isinstance(value, (list, dict)) for value in column):
+                raise RequirementValidationError(f"{name}: expected a list of scalar values")
+            values = column
+            # Distinct values are few for most numeric columns; check each once
+            for value in set(values):
+                error = check(value)
+                if error:
+                    raise RequirementValidationError(error)
+            values = [_NORMALISERS[name](value) for value in values]
+        if len(values) != count:
+            raise RequirementValidationError(f"{name}: expected {count} values, got {len(values)}")
+        decoded.append(values)
+
+    # Nothing built here can form a cycle, so skip collector passes over the new objects
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        return [_make_from_row(row) for row in zip(*decoded)]
+    finally:
+        if gc_was_enabled:
+            gc.enable()
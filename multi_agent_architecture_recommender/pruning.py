@@ -0,0 +1,119 @@
+"""Relevance rules that skip or downgrade crew tasks for simple scenarios.
+
+Rules live in ``config/pruning.yaml`` and are evaluated against the
+RequirementContext before kickoff; ``MultiAgentArchitectureRecommender.crew()``
+applies the resulting decisions.
+"""
+import os
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Union
+
+import yaml
+
+from multi_agent_architecture_recommender.models import RequirementContext
+
+PRUNING_CONFIG_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "config", "pruning.yaml")
+
+PRUNING_ACTIONS = ("skip", "template", "lightweight")
+
+# Rendered into templates in place of an unset (None) input
+UNSET_INPUT_PHRASES = {"preferred_cloud_provider": "your cloud provider"}
+
+
+@dataclass(frozen=True)
+class PruningDecision:
+    task: str
+    action: str
+    reason: str
+    answer: Optional[str] = None
+    llm: Optional[str] = None
+    expected_output: Optional[str] = None
+
+    @property
+    def runs_task(self) -> bool:
+        """Whether the task still runs (on a lighter model) rather than being removed"""
+        return self.action == "lightweight"
+
+
+def load_pruning_rules(path: str = PRUNING_CONFIG_PATH) -> Dict[str, Dict[str, Any]]:
+    """Load and sanity-check the pruning rules file"""
+    with open(path) as f:
+        rules = yaml.safe_load(f) or {}
+    for task_name, rule in rules.items():
+        action = rule.get("action")
+        if action not in PRUNING_ACTIONS:
+            raise ValueError(f"{task_name}: unknown pruning action {action!r}, expected one of {PRUNING_ACTIONS}")
+        if not rule.get("when"):
+            raise ValueError(f"{task_name}: a pruning rule needs at least one condition under 'when'")
+        if action == "template" and not rule.get("template"):
+            raise ValueError(f"{task_name}: 'template' rules need a template")
+        if action == "lightweight" and not rule.get("llm"):
+            raise ValueError(f"{task_name}: 'lightweight' rules need an llm")
+    return rules
+
+
+def _matches(value: Any, condition: Any) -> bool:
+    if isinstance(condition, dict):
+        if "in" in condition and value not in condition["in"]:
+            return False
+        # An unset value is neither above nor below a bound
+        if ("max" in condition or "min" in condition) and value is None:
+            return False
+        if "max" in condition and value > condition["max"]:
+            return False
+        if "min" in condition and value < condition["min"]:
+            return False
+        return True
+    if isinstance(condition, list):
+        return set(value or ()) == set(condition)
+    return value == condition
+
+
+def _describe(field: str, condition: Any) -> str:
+    if isinstance(condition, dict):
+        parts = []
+        if "in" in condition:
+            parts.append(f"{field} in {condition['in']}")
+        if "max" in condition:
+            parts.append(f"{field} <= {condition['max']}")
+        if "min" in condition:
+            parts.append(f"{field} >= {condition['min']}")
+        return " and ".join(parts)
+    if condition == []:
+        return f"no {field}"
+    return f"{field} = {condition}"
+
+
+def _template_inputs(inputs: Dict[str, Any]) -> Dict[str, Any]:
+    """``inputs`` with each unset value replaced by a neutral phrase rather than None"""
+    return {
+        name: UNSET_INPUT_PHRASES.get(name, "not specified") if value is None else value
+        for name, value in inputs.items()
+    }
+
+
+def evaluate_pruning(
+    requirements: Union[RequirementContext, Dict[str, Any]],
+    rules: Optional[Dict[str, Dict[str, Any]]] = None,
+) -> Dict[str, PruningDecision]:
+    """Return a decision for every task whose rule matches the requirements"""
+    inputs = requirements.to_dict() if isinstance(requirements, RequirementContext) else requirements
+    if rules is None:
+        rules = load_pruning_rules()
+
+    decisions = {}
+    for task_name, rule in rules.items():
+        conditions = rule["when"]
+        if not all(_matches(inputs.get(field), condition) for field, condition in conditions.items()):
+            continue
+        template = rule.get("template")
+        expected_output = rule.get("expected_output")
+        decisions[task_name] = PruningDecision(
+            task=task_name,
+            action=rule["action"],
+            reason=", ".join(_describe(field, condition) for field, condition in conditions.items()),
+            answer=template.format(**_template_inputs(inputs)).strip() if template else None,
+            llm=rule.get("llm"),
+            expected_output=expected_output.strip() if expected_output else None,
+        )
+    return decisions
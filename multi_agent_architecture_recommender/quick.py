@@ -0,0 +1,349 @@
+"""Quick mode: a first-pass recommendation from one LLM call.
+
+``build_quick_messages`` renders the RequirementContext and a few knowledge
+base snippets into a single prompt (``config/quick.yaml``) and
+``parse_quick_answer`` reads the JSON reply. The app shows that answer while
+the full crew runs, then ``extract_recommendation`` pulls the same fields out
+of the crew's report and ``compare_recommendations`` highlights what the full
+analysis changed.
+"""
+import json
+import os
+import re
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+import yaml
+
+from multi_agent_architecture_recommender.knowledge_base import search, tokenize
+from multi_agent_architecture_recommender.models import ArchitectureType, RequirementContext
+
+QUICK_CONFIG_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "config", "quick.yaml")
+
+PATTERN_LABELS = {
+    ArchitectureType.MONOLITHIC.value: "Monolithic",
+    ArchitectureType.MICROSERVICES.value: "Microservices",
+    ArchitectureType.SERVERLESS.value: "Serverless",
+    ArchitectureType.EVENT_DRIVEN.value: "Event-Driven",
+    ArchitectureType.LAYERED.value: "Layered",
+    ArchitectureType.HEXAGONAL.value: "Hexagonal",
+    ArchitectureType.MODULAR_MONOLITH.value: "Modular Monolith",
+}
+
+# Score differences of at least this many points are highlighted
+SCORE_CHANGE_THRESHOLD = 2
+# Share of a risk's terms another risk (or the report) must contain to count as the same risk
+RISK_MATCH_THRESHOLD = 0.5
+
+# Modular monolith comes before monolithic so "modular monolith" is one mention
+_PATTERN_MENTION = re.compile(
+    r"(?P<modular_monolith>modular[\s_-]*monolith\w*)"
+    r"|(?P<microservices>micro[\s_-]*services?)"
+    r"|(?P<serverless>serverless|faas\b|functions?[\s-]as[\s-]a[\s-]service)"
+    r"|(?P<event_driven>event[\s_-]*driven)"
+    r"|(?P<layered>layered|n[\s-]*tier)"
+    r"|(?P<hexagonal>hexagonal|ports[\s-]+(?:and|&)[\s-]+adapters)"
+    r"|(?P<monolithic>monolith(?:ic)?)",
+    re.IGNORECASE,
+)
+_SCORE = re.compile(
+    r"(?<![\d.])(10|[1-9])(?:\.\d+)?\s*(?:/|out of)\s*10\b"
+    r"|\bscore\w*\W{0,4}(10|[1-9])(?:\.\d+)?\b(?![\d.%])",
+    re.IGNORECASE,
+)
+_TABLE_SCORE = re.compile(r"(10|[1-9])(?:\.\d+)?(?:\s*/\s*10)?")
+_HEADING = re.compile(r"^\s{0,3}#{1,6}\s+(.+?)\s*#*\s*$|^\s*\*\*(.+?)\*\*:?\s*$")
+_LIST_ITEM = re.compile(r"^(\s*)(?:[-*+]|\d+[.)])\s+(.*)$")
+_BOLD_LABEL = re.compile(r"^\*\*(.+?)\*\*:?\s*(.*)$")
+_MARKUP = re.compile(r"\*\*|__|`|\[([^\]]+)\]\([^)]*\)")
+
+
+@dataclass(frozen=True)
+class Recommendation:
+    """Recommended pattern, per-pattern scores (1-10) and key risks"""
+    pattern: Optional[str]
+    confidence: Optional[int] = None
+    scores: Dict[str, int] = field(default_factory=dict)
+    risks: Tuple[str, ...] = ()
+    rationale: str = ""
+
+    @property
+    def ranking(self) -> List[str]:
+        """Scored patterns, best first; ties keep ArchitectureType order"""
+        order = [t.value for t in ArchitectureType]
+        return sorted(self.scores, key=lambda p: (-self.scores[p], order.index(p)))
+
+
+@dataclass(frozen=True)
+class RecommendationDiff:
+    quick_pattern: Optional[str]
+    full_pattern: Optional[str]
+    # (pattern, quick score, full score) for every pattern either side scored
+    scores: Tuple[Tuple[str, Optional[int], Optional[int]], ...]
+    risks_confirmed: Tuple[str, ...]
+    risks_quick_only: Tuple[str, ...]
+    risks_full_only: Tuple[str, ...]
+
+    @property
+    def pattern_changed(self) -> bool:
+        return self.full_pattern is not None and self.full_pattern != self.quick_pattern
+
+    def notable_score_changes(self, threshold: int = SCORE_CHANGE_THRESHOLD) -> List[Tuple[str, int, int]]:
+        return [
+            (pattern, quick, full) for pattern, quick, full in self.scores
+            if quick is not None and full is not None and abs(full - quick) >= threshold
+        ]
+
+
+def load_quick_config(path: str = QUICK_CONFIG_PATH) -> Dict[str, Any]:
+    with open(path) as f:
+        return yaml.safe_load(f)
+
+
+def find_patterns(text: str) -> List[str]:
+    """ArchitectureType values mentioned in ``text``, in order of appearance"""
+    return [match.lastgroup for match in _PATTERN_MENTION.finditer(text)]
+
+
+def normalise_pattern(name: str) -> Optional[str]:
+    """Map an ArchitectureType value or a free-text pattern name to its value"""
+    value = name.strip().lower().replace("-", "_").replace(" ", "_")
+    if value in PATTERN_LABELS:
+        return value
+    mentions = find_patterns(name)
+    return mentions[0] if mentions else None
+
+
+# Prompt
+def _format_value(value: Any) -> str:
+    if isinstance(value, bool):
+        return "yes" if value else "no"
+    if isinstance(value, (list, tuple)):
+        return ", ".join(value) or "none"
+    if value is None:
+        return "no preference"
+    if isinstance(value, int):
+        return f"{value:,}"
+    return str(value).replace("_", " ")
+
+
+def render_requirements(requirements: RequirementContext) -> str:
+    """Every requirement field as one markdown bullet"""
+    return "\n".join(
+        f"- {name.replace('_', ' ').capitalize()}: {_format_value(value)}"
+        for name, value in requirements.to_dict().items()
+    )
+
+
+def knowledge_query(requirements: RequirementContext) -> str:
+    """Search terms for the requirement traits that decide the pattern"""
+    terms = [
+        f"team size {requirements.team_size} {requirements.number_of_teams} teams",
+        f"{requirements.team_experience_level} experience {requirements.devops_maturity} devops maturity",
+        f"{requirements.scalability_needs} scaling {requirements.geographic_distribution.replace('_', ' ')}",
+        f"{requirements.data_consistency_needs} consistency",
+    ]
+    if requirements.multi_tenant_needs:
+        terms.append("multi tenant")
+    if requirements.legacy_system_integration:
+        terms.append("legacy migration")
+    if requirements.time_to_market == "fast":
+        terms.append("fast time-to-market")
+    terms.extend(requirements.compliance_requirements)
+    return " ".join(terms)
+
+
+def build_quick_messages(requirements: RequirementContext, config: Optional[Dict[str, Any]] = None) -> List[Dict[str, str]]:
+    """System and user messages for the single quick-mode call"""
+    config = config or load_quick_config()
+    snippets = config.get("knowledge_snippets") or 0
+    hits = search(knowledge_query(requirements), top_k=snippets, category="pattern") if snippets else []
+    prompt = config["prompt"].format(
+        requirements=render_requirements(requirements),
+        knowledge="\n".join(f"- {hit.snippet()}" for hit in hits) or "- none",
+        patterns=", ".join(PATTERN_LABELS),
+    )
+    return [
+        {"role": "system", "content": " ".join(config["system"].split())},
+        {"role": "user", "content": prompt},
+    ]
+
+
+def _score(value: Any) -> Optional[int]:
+    try:
+        return min(10, max(1, round(float(value))))
+    # NaN and Infinity are valid to Python's json module
+    except (TypeError, ValueError, OverflowError):
+        return None
+
+
+def _json_object(text: str) -> Dict[str, Any]:
+    """The first JSON object in ``text``; braces in surrounding prose are skipped"""
+    decoder = json.JSONDecoder()
+    start = text.find("{")
+    while start >= 0:
+        try:
+            data, _ = decoder.raw_decode(text, start)
+        except ValueError:
+            pass
+        else:
+            if isinstance(data, dict):
+                return data
+        start = text.find("{", start + 1)
+    raise ValueError("quick answer contains no JSON object")
+
+
+def parse_quick_answer(text: str) -> Recommendation:
+    """Read the quick call's JSON reply, tolerating fences and prose around it"""
+    data = _json_object(text)
+
+    pattern_scores = data.get("pattern_scores")
+    risks = data.get("key_risks") or []
+    # A lone risk given as a string would otherwise be split into characters
+    if isinstance(risks, str):
+        risks = [risks]
+    elif not isinstance(risks, list):
+        risks = []
+    scores = {}
+    for name, value in (pattern_scores if isinstance(pattern_scores, dict) else {}).items():
+        pattern, score = normalise_pattern(str(name)), _score(value)
+        if pattern and score is not None:
+            scores[pattern] = score
+    pattern = normalise_pattern(str(data.get("recommended_pattern") or ""))
+    if pattern is None and scores:
+        pattern = max(scores, key=scores.get)
+    if pattern is None:
+        raise ValueError(f"quick answer names no known pattern: {data.get('recommended_pattern')!r}")
+    return Recommendation(
+        pattern=pattern,
+        confidence=_score(data.get("confidence")),
+        scores=scores,
+        risks=tuple(str(risk).strip() for risk in risks if str(risk).strip()),
+        rationale=str(data.get("rationale") or "").strip(),
+    )
+
+
+# Full crew result
+def extract_pattern_scores(text: str) -> Dict[str, int]:
+    """Pattern scores from lines or table rows that name exactly one pattern"""
+    scores: Dict[str, int] = {}
+    for line in text.splitlines():
+        mentioned = set(find_patterns(line))
+        if len(mentioned) != 1:
+            continue
+        pattern = mentioned.pop()
+        if pattern in scores:
+            continue
+        match = _SCORE.search(line)
+        if match:
+            scores[pattern] = int(match.group(1) or match.group(2))
+        elif line.strip().startswith("|"):
+            cells = [cell.strip(" *") for cell in line.strip().strip("|").split("|")]
+            for cell in cells[1:]:
+                if _TABLE_SCORE.fullmatch(cell):
+                    scores[pattern] = int(_TABLE_SCORE.fullmatch(cell).group(1))
+                    break
+    return scores
+
+
+def _plain(text: str) -> str:
+    return " ".join(_MARKUP.sub(lambda m: m.group(1) or "", text).split())
+
+
+def extract_risks(text: str) -> List[str]:
+    """List items under risk headings or under a bold "...Risk..." list label"""
+    risks: List[str] = []
+    in_section, label_indent = False, None
+    for line in text.splitlines():
+        heading = _HEADING.match(line)
+        if heading:
+            in_section = "risk" in (heading.group(1) or heading.group(2)).lower()
+            label_indent = None
+            continue
+        item = _LIST_ITEM.match(line)
+        if not item:
+            continue
+        indent, content = len(item.group(1)), item.group(2)
+        if label_indent is not None and indent <= label_indent:
+            label_indent = None
+        label = _BOLD_LABEL.match(content)
+        if label and "risk" in label.group(1).lower():
+            label_indent = indent
+            content = label.group(2)
+        elif not (in_section or label_indent is not None):
+            continue
+        content = _plain(content)
+        # Skip bare labels and "[placeholder]" echoes of the expected output
+        if len(content.split()) >= 3 and not content.startswith("["):
+            risks.append(content)
+    return risks
+
+
+def extract_recommendation(result: Any) -> Recommendation:
+    """The recommendation a full crew result makes, read from its markdown"""
+    outputs = [(getattr(task, "name", None) or "", getattr(task, "raw", None) or "")
+               for task in getattr(result, "tasks_output", None) or []]
+    if not outputs:
+        outputs = [("synthesis_task", getattr(result, "raw", None) or "")]
+    synthesis = next((raw for name, raw in outputs if name == "synthesis_task"), outputs[-1][1])
+
+    scores: Dict[str, int] = {}
+    for _, raw in outputs:
+        for pattern, score in extract_pattern_scores(raw).items():
+            scores.setdefault(pattern, score)
+
+    pattern, confidence = None, None
+    lines = synthesis.splitlines()
+    for i, line in enumerate(lines):
+        if "recommended architecture" in line.lower() or "primary recommendation" in line.lower():
+            window = " ".join(lines[i:i + 3])
+            mentions = find_patterns(window)
+            if mentions:
+                pattern = mentions[0]
+                score = _SCORE.search(window)
+                confidence = int(score.group(1) or score.group(2)) if score else None
+                break
+    if pattern is None and scores:
+        pattern = max(scores, key=scores.get)
+
+    risks = []
+    for _, raw in outputs:
+        risks.extend(risk for risk in extract_risks(raw) if risk not in risks)
+    return Recommendation(pattern=pattern, confidence=confidence, scores=scores, risks=tuple(risks))
+
+
+# Comparison
+def _terms(text: str) -> set:
+    return {term for term in tokenize(text) if len(term) > 3}
+
+
+def _covers(terms: set, other: set) -> bool:
+    return bool(terms) and len(terms & other) / len(terms) >= RISK_MATCH_THRESHOLD
+
+
+def compare_recommendations(quick: Recommendation, full: Recommendation, full_text: str = "") -> RecommendationDiff:
+    """What the full analysis confirmed or changed relative to the quick answer.
+
+    A quick-answer risk counts as confirmed when a full-analysis risk, or
+    failing that the full report text, covers most of its terms.
+    """
+    order = [t.value for t in ArchitectureType]
+    scored = sorted(set(quick.scores) | set(full.scores), key=order.index)
+    full_risk_terms = [(risk, _terms(risk)) for risk in full.risks]
+    report_terms = _terms(full_text)
+
+    confirmed, quick_only, matched_full = [], [], set()
+    for risk in quick.risks:
+        terms = _terms(risk)
+        matches = [other for other, other_terms in full_risk_terms if _covers(terms, other_terms) or _covers(other_terms, terms)]
+        matched_full.update(matches)
+        (confirmed if matches or _covers(terms, report_terms) else quick_only).append(risk)
+
+    return RecommendationDiff(
+        quick_pattern=quick.pattern,
+        full_pattern=full.pattern,
+        scores=tuple((pattern, quick.scores.get(pattern), full.scores.get(pattern)) for pattern in scored),
+        risks_confirmed=tuple(confirmed),
+        risks_quick_only=tuple(quick_only),
+        risks_full_only=tuple(risk for risk, _ in full_risk_terms if risk not in matched_full),
+    )
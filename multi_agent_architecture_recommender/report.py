@@ -0,0 +1,149 @@
+"""Turn an analysis result into report sections for lazy, paginated display.
+
+The report view shows a short summary per task and renders a task's full
+markdown only when it is opened, so reruns after an analysis don't resend the
+whole report. ``build_report`` does all markdown parsing once per result; the
+app caches its output by ``AnalysisResult.run_id``.
+"""
+import math
+import re
+from dataclasses import dataclass
+from typing import Any, List, Optional, Tuple
+
+from multi_agent_architecture_recommender.comparison import split_task_name
+
+SUMMARY_MAX_CHARS = 280
+
+_HEADING = re.compile(r"^\s{0,3}#{1,6}\s+(.+?)\s*#*\s*$")
+_BOLD_HEADING = re.compile(r"^\s*\*\*(.+?)\*\*:?\s*$")
+_LIST_ITEM = re.compile(r"^\s*(?:[-*+]|\d+[.)])\s+")
+_LINK = re.compile(r"\[([^\]]+)\]\([^)]*\)")
+_EMPHASIS = re.compile(r"(\*\*|__|\*|_|`)(.+?)\1")
+
+
+@dataclass(frozen=True)
+class ReportSection:
+    key: str
+    title: str
+    summary: str
+    body: str
+    headings: Tuple[str, ...]
+    templated: bool = False
+
+
+def format_task_name(task_name: str) -> str:
+    """Turn a tasks.yaml key (or a per-provider copy's name) into a readable heading"""
+    task_name, provider = split_task_name(task_name)
+    title = task_name.replace("_task", "").replace("_", " ").title()
+    return f"{title} ({provider})" if provider else title
+
+
+def _plain(text: str) -> str:
+    text = _LINK.sub(r"\1", text)
+    text = _EMPHASIS.sub(r"\2", text)
+    return " ".join(text.split())
+
+
+def _truncate(text: str, max_chars: int) -> str:
+    if len(text) <= max_chars:
+        return text
+    cut = text[:max_chars].rsplit(" ", 1)[0].rstrip(",;:")
+    return cut + "…"
+
+
+def _blocks(lines: List[str]) -> List[List[str]]:
+    """Prose paragraphs and list runs, skipping headings, tables, rules and code"""
+    blocks, current, in_code = [], [], False
+    for line in lines:
+        stripped = line.strip()
+        if stripped.startswith("```"):
+            in_code = not in_code
+            continue
+        skip = (
+            in_code
+            or not stripped
+            or _HEADING.match(line)
+            or _BOLD_HEADING.match(line)
+            or stripped.startswith(("|", ">", "---", "***", "<"))
+        )
+        if skip:
+            if current:
+                blocks.append(current)
+                current = []
+            continue
+        current.append(stripped)
+    if current:
+        blocks.append(current)
+    return blocks
+
+
+def summarize_markdown(text: str, max_chars: int = SUMMARY_MAX_CHARS) -> str:
+    """First paragraph of ``text`` as plain prose (or its first list items)"""
+    for block in _blocks(text.splitlines()):
+        if _LIST_ITEM.match(block[0]):
+            items = [_plain(_LIST_ITEM.sub("", line)) for line in block if _LIST_ITEM.match(line)]
+            summary = "; ".join(item.rstrip(".;") for item in items[:3] if item)
+        else:
+            summary = _plain(" ".join(block))
+        if summary:
+            return _truncate(summary, max_chars)
+    return ""
+
+
+def markdown_headings(text: str, max_level: int = 3) -> Tuple[str, ...]:
+    headings = []
+    for line in text.splitlines():
+        match = _HEADING.match(line)
+        if match and len(line.strip()) - len(line.strip().lstrip("#")) <= max_level:
+            headings.append(_plain(match.group(1)))
+    return tuple(headings)
+
+
+def _strip_end_marker(text: str, end_marker: Optional[str]) -> str:
+    text = text.strip()
+    if end_marker and text.endswith(end_marker):
+        text = text[: -len(end_marker)].rstrip()
+    return text
+
+
+def _section(key: str, title: str, text: str, end_marker: Optional[str], templated: bool = False) -> ReportSection:
+    body = _strip_end_marker(text, end_marker)
+    return ReportSection(
+        key=key,
+        title=title,
+        summary=summarize_markdown(body),
+        body=body,
+        headings=markdown_headings(body),
+        templated=templated,
+    )
+
+
+def build_report(result: Any, end_marker: Optional[str] = None) -> List[ReportSection]:
+    """One section per task output, then one per templated (pruned) task"""
+    sections = []
+    for i, task in enumerate(getattr(result, "tasks_output", None) or [], start=1):
+        name = getattr(task, "name", None) or ""
+        description = (getattr(task, "description", None) or "").strip()
+        if name:
+            title = format_task_name(name)
+        elif description:
+            title = _truncate(description.splitlines()[0], 80)
+        else:
+            title = f"Task {i}"
+        sections.append(_section(name or f"task_{i}", title, getattr(task, "raw", None) or "", end_marker))
+
+    for decision in (getattr(result, "pruning_decisions", None) or {}).values():
+        if decision.answer:
+            sections.append(_section(decision.task, format_task_name(decision.task), decision.answer, end_marker, templated=True))
+
+    if not sections:
+        raw = getattr(result, "raw", None) or str(result)
+        sections.append(_section("report", "Recommendation", raw, end_marker))
+    return sections
+
+
+def paginate(sections: List[ReportSection], page: int, page_size: int) -> Tuple[List[ReportSection], int]:
+    """The sections on ``page`` (1-based, clamped to the pages there are) and the page count"""
+    page_count = max(1, math.ceil(len(sections) / page_size))
+    page = min(max(page, 1), page_count)
+    return sections[(page - 1) * page_size: page * page_size], page_count
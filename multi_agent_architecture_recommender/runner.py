@@ -0,0 +1,250 @@
+"""Execute one analysis run and return a compact, picklable result.
+
+``execute_analysis`` runs the full crew; ``execute_quick_analysis`` makes
+quick mode's single LLM call. Both are used in-process (``ARCHITECTURE_EXECUTION=thread``) and inside the
+``worker_pool`` processes. The crew class is resolved from
+``ARCHITECTURE_CREW_FACTORY`` so tools like the load test can substitute a stub.
+"""
+import importlib
+import os
+import threading
+import time
+import uuid
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+from multi_agent_architecture_recommender.budgets import BudgetUsage, count_tokens, measure_budgets
+from multi_agent_architecture_recommender.comparison import comparison_inputs, validate_providers
+from multi_agent_architecture_recommender.models import RequirementContext
+from multi_agent_architecture_recommender.pruning import PruningDecision
+from multi_agent_architecture_recommender.quick import Recommendation, build_quick_messages, load_quick_config, parse_quick_answer
+from multi_agent_architecture_recommender.tracing import SPAN_KIND_CLIENT, RunTracer, write_trace
+
+CREW_FACTORY_ENV = "ARCHITECTURE_CREW_FACTORY"
+DEFAULT_CREW_FACTORY = "multi_agent_architecture_recommender.crew:MultiAgentArchitectureRecommender"
+
+
+@dataclass
+class TaskResult:
+    name: str
+    description: str
+    raw: str
+
+
+@dataclass
+class AnalysisResult:
+    raw: str
+    tasks_output: List[TaskResult]
+    pruning_decisions: Dict[str, PruningDecision] = field(default_factory=dict)
+    budget_usage: List[BudgetUsage] = field(default_factory=list)
+    token_usage: Dict[str, int] = field(default_factory=dict)
+    duration_s: float = 0.0
+    worker_pid: int = 0
+    # Identifies the run for per-result caches in the UI; also the trace id
+    run_id: str = field(default_factory=lambda: uuid.uuid4().hex)
+    trace_path: Optional[str] = None
+    # Cloud providers compared side by side; empty for a single-provider run
+    providers: List[str] = field(default_factory=list)
+
+
+@dataclass
+class QuickResult:
+    recommendation: Recommendation
+    raw: str
+    model: str
+    token_usage: Dict[str, int] = field(default_factory=dict)
+    duration_s: float = 0.0
+    worker_pid: int = 0
+    run_id: str = field(default_factory=lambda: uuid.uuid4().hex)
+    trace_path: Optional[str] = None
+
+
+@dataclass(frozen=True)
+class RunProgress:
+    """Progress of a run in flight: tasks finished so far out of the crew's total"""
+    completed_tasks: int
+    total_tasks: int
+    last_task: Optional[str] = None
+
+
+ProgressCallback = Callable[[RunProgress], None]
+
+
+def load_recommender_class(factory: Optional[str] = None):
+    """Import the crew class named by ``module:attribute`` (default from the environment)"""
+    # Resolved per call: the environment may name another crew later (tests, install_stub_crew)
+    return _import_factory(factory or os.getenv(CREW_FACTORY_ENV) or DEFAULT_CREW_FACTORY)
+
+
+@lru_cache(maxsize=None)
+def _import_factory(factory: str):
+    module_name, _, attribute = factory.partition(":")
+    return getattr(importlib.import_module(module_name), attribute)
+
+
+def _token_usage(output: Any) -> Dict[str, int]:
+    return _usage_counts(getattr(output, "token_usage", None))
+
+
+def _usage_counts(usage: Any) -> Dict[str, int]:
+    if usage is None:
+        return {}
+    values = usage.model_dump() if hasattr(usage, "model_dump") else dict(usage)
+    return {key: value for key, value in values.items() if isinstance(value, int)}
+
+
+def _report_task_progress(crew: Any, progress: ProgressCallback):
+    """Call ``progress`` once up front and after every task the crew finishes"""
+    tasks = getattr(crew, "tasks", None) or []
+    completed = []
+    lock = threading.Lock()
+
+    def task_done(output: Any):
+        # Concurrent (async) tasks finish on their own threads
+        with lock:
+            completed.append(getattr(output, "name", None) or "")
+            update = RunProgress(len(completed), len(tasks), completed[-1])
+        progress(update)
+
+    crew.task_callback = task_done
+    # Older CrewAI versions copy the crew callback onto tasks only at construction
+    for crew_task in tasks:
+        if hasattr(crew_task, "callback") and crew_task.callback is None:
+            crew_task.callback = task_done
+    progress(RunProgress(0, len(tasks)))
+
+
+def _write_trace(run_id: str, tracer: RunTracer, fingerprint: str) -> Optional[str]:
+    resource = {"run.id": run_id, "requirements.fingerprint": fingerprint, "process.pid": os.getpid()}
+    try:
+        return write_trace(run_id, tracer.finish(), resource)
+    except OSError:
+        # A read-only or full disk must not fail the analysis itself
+        return None
+
+
+def execute_analysis(
+    inputs: Dict[str, Any],
+    budget_profile: Optional[str] = None,
+    providers: Optional[Sequence[str]] = None,
+    progress: Optional[ProgressCallback] = None,
+    pruning: bool = True,
+) -> AnalysisResult:
+    """Prune, budget and run the crew for ``inputs`` (RequirementContext.to_dict()).
+
+    With ``providers`` the run is a side-by-side comparison of those cloud
+    providers (see ``comparison``). ``progress`` receives a RunProgress once
+    the crew is built and after each task. ``pruning=False`` runs every task
+    regardless of the relevance rules. Every run, failed ones included,
+    leaves a trace file (see ``tracing``).
+    """
+    run_id = uuid.uuid4().hex
+    fingerprint = RequirementContext.from_dict(inputs).fingerprint()
+    providers = validate_providers(providers) if providers else ()
+    # Shared tasks of a comparison, pruning templates included, see every compared provider
+    run_inputs = comparison_inputs(inputs, providers) if providers else inputs
+    tracer = RunTracer(run_id)
+    start = time.perf_counter()
+    try:
+        run_attributes = {"run.budget_profile": budget_profile or "default", "run.pruning": pruning}
+        if providers:
+            run_attributes["run.providers"] = ", ".join(providers)
+        with tracer.span("analysis.run", **run_attributes):
+            with tracer.span("crew.setup"):
+                with tracer.span("crew.load"):
+                    recommender = load_recommender_class()()
+                with tracer.span("crew.prune"):
+                    pruning_decisions = recommender.prune(run_inputs, None if pruning else {})
+                with tracer.span("crew.apply_budgets"):
+                    task_budgets = recommender.apply_budgets(budget_profile)
+                with tracer.span("crew.build"):
+                    crew = recommender.comparison_crew(providers) if providers else recommender.crew()
+            tracer.watch(crew)
+            if progress:
+                _report_task_progress(crew, progress)
+            with tracer.span("crew.kickoff") as kickoff:
+                output = crew.kickoff(inputs=run_inputs)
+                token_usage = _token_usage(output)
+                kickoff.attributes.update({f"gen_ai.usage.{key}": value for key, value in token_usage.items()})
+    finally:
+        trace_path = _write_trace(run_id, tracer, fingerprint)
+
+    tasks_output = [
+        TaskResult(
+            name=getattr(task_output, "name", None) or "",
+            description=getattr(task_output, "description", None) or "",
+            raw=getattr(task_output, "raw", None) or "",
+        )
+        for task_output in getattr(output, "tasks_output", None) or []
+    ]
+    return AnalysisResult(
+        raw=getattr(output, "raw", None) or str(output),
+        tasks_output=tasks_output,
+        pruning_decisions=pruning_decisions,
+        budget_usage=measure_budgets(output, task_budgets),
+        token_usage=token_usage,
+        duration_s=time.perf_counter() - start,
+        worker_pid=os.getpid(),
+        run_id=run_id,
+        trace_path=trace_path,
+        providers=list(providers),
+    )
+
+
+def execute_quick_analysis(
+    inputs: Dict[str, Any],
+    progress: Optional[ProgressCallback] = None,
+    config_overrides: Optional[Dict[str, Any]] = None,
+) -> QuickResult:
+    """One consolidated LLM call for a first-pass recommendation (see ``quick``).
+
+    The LLM comes from the crew class's ``quick_llm``, so a substituted crew
+    factory substitutes the quick call as well. ``config_overrides`` replace
+    keys of ``config/quick.yaml`` (model, max_tokens, knowledge_snippets...).
+    """
+    run_id = uuid.uuid4().hex
+    requirements = RequirementContext.from_dict(inputs)
+    tracer = RunTracer(run_id)
+    config = dict(load_quick_config(), **(config_overrides or {}))
+    start = time.perf_counter()
+    try:
+        with tracer.span("quick.run"):
+            with tracer.span("quick.prompt"):
+                messages = build_quick_messages(requirements, config)
+            with tracer.span("crew.load"):
+                llm = load_recommender_class()().quick_llm(config)
+            with tracer.span("llm.call", **{"gen_ai.request.model": config["model"]}) as call:
+                call.kind = SPAN_KIND_CLIENT
+                raw = llm.call(messages)
+                usage_summary = getattr(llm, "get_token_usage_summary", None)
+                token_usage = _usage_counts(usage_summary()) if usage_summary else {}
+                if not token_usage.get("total_tokens"):
+                    prompt_tokens = sum(count_tokens(message["content"]) for message in messages)
+                    completion_tokens = count_tokens(raw)
+                    token_usage = {
+                        "prompt_tokens": prompt_tokens,
+                        "completion_tokens": completion_tokens,
+                        "total_tokens": prompt_tokens + completion_tokens,
+                    }
+                call.attributes.update({
+                    "gen_ai.usage.input_tokens": token_usage.get("prompt_tokens", 0),
+                    "gen_ai.usage.output_tokens": token_usage.get("completion_tokens", 0),
+                })
+            with tracer.span("quick.parse"):
+                recommendation = parse_quick_answer(raw)
+            if progress:
+                progress(RunProgress(1, 1, "quick_answer"))
+    finally:
+        trace_path = _write_trace(run_id, tracer, requirements.fingerprint())
+
+    return QuickResult(
+        recommendation=recommendation,
+        raw=raw,
+        model=config["model"],
+        token_usage=token_usage,
+        duration_s=time.perf_counter() - start,
+        worker_pid=os.getpid(),
+        run_id=run_id,
+        trace_path=trace_path,
+    )
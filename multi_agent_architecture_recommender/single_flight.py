@@ -0,0 +1,151 @@
+"""Coalescing of identical analyses that are in flight at the same time.
+
+Submissions are keyed on the requirements' canonical fingerprint, the run
+options and ``config_version()``. While a run with the same key is still
+going, later submissions attach to it instead of starting another crew run:
+they see the same progress and get the same result. A key is forgotten as
+soon as its run finishes, so nothing here is a result cache.
+"""
+import hashlib
+import json
+import os
+import threading
+import time
+from concurrent.futures import Executor, Future
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from multi_agent_architecture_recommender.budgets import default_budget_profile
+from multi_agent_architecture_recommender.comparison import validate_providers
+from multi_agent_architecture_recommender.knowledge_base import KNOWLEDGE_DIR
+from multi_agent_architecture_recommender.models import RequirementContext
+from multi_agent_architecture_recommender.runner import CREW_FACTORY_ENV, DEFAULT_CREW_FACTORY, RunProgress
+
+CONFIG_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "config")
+
+
+def _config_files() -> List[str]:
+    return sorted(
+        os.path.join(directory, name)
+        for directory in (CONFIG_DIR, KNOWLEDGE_DIR)
+        for name in os.listdir(directory)
+        if name.endswith(".yaml")
+    )
+
+
+@lru_cache(maxsize=8)
+def _hash_files(stamps: Tuple[Tuple[str, int, int], ...], factory: str) -> str:
+    digest = hashlib.sha256(factory.encode())
+    for path, _, _ in stamps:
+        digest.update(os.path.relpath(path, os.path.dirname(CONFIG_DIR)).encode())
+        with open(path, "rb") as f:
+            digest.update(f.read())
+    return digest.hexdigest()
+
+
+def config_version() -> str:
+    """Hash of the agent, task, budget, pruning, quick and knowledge files plus
+    the crew factory; re-read only when a file's mtime or size changes"""
+    stamps = []
+    for path in _config_files():
+        stat = os.stat(path)
+        stamps.append((path, stat.st_mtime_ns, stat.st_size))
+    factory = os.getenv(CREW_FACTORY_ENV) or DEFAULT_CREW_FACTORY
+    return _hash_files(tuple(stamps), factory)
+
+
+def flight_key(kind: str, inputs: Dict[str, Any], **options: Any) -> str:
+    """Key for a run of ``kind`` ("full", "quick") on ``inputs`` (RequirementContext.to_dict()).
+
+    ``options`` are the run's other arguments (budget profile, providers);
+    they must be JSON-serialisable.
+    """
+    fingerprint = RequirementContext.from_dict(inputs).fingerprint()
+    payload = json.dumps([kind, fingerprint, config_version(), options], sort_keys=True, default=list)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def analysis_key(inputs: Dict[str, Any], budget_profile: Optional[str] = None,
+                 providers: Optional[Sequence[str]] = None) -> str:
+    """Key for ``runner.execute_analysis(inputs, budget_profile, providers)``.
+
+    Options that select the same run share a key: no profile means the
+    default profile, and provider order does not matter.
+    """
+    return flight_key(
+        "full", inputs,
+        budget_profile=budget_profile or default_budget_profile(),
+        providers=validate_providers(providers) if providers else None,
+    )
+
+
+class Flight:
+    """One run in flight, shared by every submission with its key"""
+
+    def __init__(self, key: str, future: Optional[Future] = None):
+        self.key = key
+        self.future = future
+        self.started = time.time()
+        self.progress: Optional[RunProgress] = None
+        # Submissions beyond the first that attached to this run
+        self.attached = 0
+        self._changed = threading.Condition()
+
+    def report(self, progress: RunProgress):
+        """Progress callback handed to the run; never raises into it"""
+        with self._changed:
+            self.progress = progress
+            self._changed.notify_all()
+
+    def _finished(self, _future: Future):
+        with self._changed:
+            self._changed.notify_all()
+
+    def done(self) -> bool:
+        return self.future.done()
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Block until new progress arrives, the run finishes or ``timeout``
+        passes; returns whether the run has finished"""
+        with self._changed:
+            if not self.future.done():
+                self._changed.wait(timeout)
+        return self.future.done()
+
+    def result(self, timeout: Optional[float] = None) -> Any:
+        return self.future.result(timeout)
+
+
+class SingleFlight:
+    """Submits runs to ``executor``, coalescing those whose key is already in flight"""
+
+    def __init__(self, executor: Executor):
+        self.executor = executor
+        self._flights: Dict[str, Flight] = {}
+        self._lock = threading.Lock()
+
+    def submit(self, key: str, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Tuple[Flight, bool]:
+        """Run ``fn(*args, progress=..., **kwargs)`` unless ``key`` is already in flight.
+
+        Returns the flight and whether this submission joined a running one.
+        """
+        with self._lock:
+            flight = self._flights.get(key)
+            if flight is not None and not flight.done():
+                flight.attached += 1
+                return flight, True
+            flight = Flight(key)
+            flight.future = self.executor.submit(fn, *args, progress=flight.report, **kwargs)
+            self._flights[key] = flight
+        flight.future.add_done_callback(flight._finished)
+        flight.future.add_done_callback(lambda _future: self._forget(flight))
+        return flight, False
+
+    def _forget(self, flight: Flight):
+        with self._lock:
+            if self._flights.get(flight.key) is flight:
+                del self._flights[flight.key]
+
+    def in_flight(self) -> int:
+        with self._lock:
+            return sum(not flight.done() for flight in self._flights.values())
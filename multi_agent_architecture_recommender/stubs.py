@@ -0,0 +1,211 @@
+"""Stand-ins for the crew, shared by the load test and the evaluation suite.
+
+``StubRecommender`` implements the interface ``runner`` expects from the crew
+class (prune, apply_budgets, crew, comparison_crew, quick_llm) without
+calling an LLM: tasks sleep for a configurable latency and return canned
+markdown shaped by the active output budgets, and the synthesis names a
+pattern chosen by rules of thumb. ``install_stub_crew`` points the runner, and
+any worker processes it starts, at the stub.
+"""
+import json
+import math
+import os
+import random
+import tempfile
+import time
+from typing import Dict, List, Optional
+
+from multi_agent_architecture_recommender.budgets import TaskBudget, count_tokens, resolve_budgets
+from multi_agent_architecture_recommender.comparison import (
+    COMPARISON_TASK, PROVIDER_TASKS, provider_task_name, split_task_name,
+)
+from multi_agent_architecture_recommender.pruning import evaluate_pruning
+from multi_agent_architecture_recommender.runner import CREW_FACTORY_ENV
+from multi_agent_architecture_recommender.tracing import TRACE_DIR_ENV
+
+STUB_CREW_FACTORY = "multi_agent_architecture_recommender.stubs:StubRecommender"
+
+
+class _StubTaskOutput:
+    def __init__(self, name: str, description: str, raw: str):
+        self.name = name
+        self.description = description
+        self.raw = raw
+
+
+class _StubCrewOutput:
+    # Rough prompt size of one real task (brief, context and tool results)
+    PROMPT_TOKENS_PER_TASK = 1500
+
+    def __init__(self, tasks_output: List[_StubTaskOutput]):
+        self.tasks_output = tasks_output
+        self.raw = tasks_output[-1].raw if tasks_output else ""
+        prompt_tokens = self.PROMPT_TOKENS_PER_TASK * len(tasks_output)
+        completion_tokens = sum(count_tokens(output.raw) for output in tasks_output)
+        self.token_usage = {
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "total_tokens": prompt_tokens + completion_tokens,
+        }
+
+
+class _StubCrew:
+    TASKS = [
+        "scalability_task",
+        "team_task",
+        "cost_task",
+        "compliance_and_security_task",
+        "technology_integration_task",
+        "synthesis_task",
+    ]
+
+    # Sentences per section of an unbounded answer, a few kB per task
+    UNBOUNDED_SENTENCES = 16
+
+    def __init__(self, latency_s: float, failure_rate: float, tasks: List[str],
+                 budgets: Optional[Dict[str, TaskBudget]] = None):
+        self.latency_s = latency_s
+        self.failure_rate = failure_rate
+        self.tasks = tasks
+        self.budgets = budgets or {}
+        self.task_callback = None
+
+    def kickoff(self, inputs: Optional[Dict] = None):
+        if self.failure_rate and random.random() < self.failure_rate:
+            time.sleep(self.latency_s)
+            raise RuntimeError("Stub crew failure")
+        outputs = []
+        for name in self.tasks:
+            # Spread the latency over the tasks so progress updates arrive as in a real run
+            time.sleep(self.latency_s / len(self.tasks))
+            outputs.append(_StubTaskOutput(name, f"Stub {name}", self._report(name, inputs or {})))
+            if self.task_callback:
+                self.task_callback(outputs[-1])
+        return _StubCrewOutput(outputs)
+
+    def _report(self, name: str, inputs: Dict) -> str:
+        """Markdown roughly the size of a real answer; under a budget, its
+        sections written to fit its max_tokens"""
+        # Per-provider copies share their task's budget
+        budget = self.budgets.get(name) or self.budgets.get(split_task_name(name)[0])
+        headings = budget.sections if budget and budget.sections else [f"Section {i}" for i in range(1, 7)]
+        max_tokens = budget.max_tokens if budget else None
+        sentence = f"Stub analysis of {name} for {inputs.get('expected_users')} users. "
+        sentences = self.UNBOUNDED_SENTENCES
+        if max_tokens:
+            # Fill most of the budget, shared between the sections, as an agent following the instructions would
+            per_section = int(max_tokens * 0.9) // len(headings) - 12
+            sentences = max(1, min(sentences, per_section // count_tokens(sentence)))
+        paragraph = sentence * sentences
+        report = "\n\n".join(f"## {heading}\n\n{paragraph}\n\n- point one\n- point two" for heading in headings)
+        if not budget:
+            report = f"{paragraph}\n\n{report}"
+        if name == "synthesis_task" and inputs:
+            scores = _stub_pattern_scores(inputs)
+            best = max(scores, key=scores.get)
+            rows = "\n".join(f"| {pattern} | {score}/10 |" for pattern, score in scores.items())
+            report = (f"## Recommended Architecture\n\n**Recommended architecture:** {best} ({scores[best]}/10)\n\n"
+                      f"| Pattern | Score |\n|---|---|\n{rows}\n\n{report}")
+        return _truncate(report, max_tokens) if max_tokens else report
+
+
+def _truncate(text: str, max_tokens: int) -> str:
+    """Drop trailing lines until ``text`` fits, as a max_tokens cap would cut it"""
+    lines = text.splitlines()
+    while lines and count_tokens("\n".join(lines)) > max_tokens:
+        lines.pop()
+    return "\n".join(lines)
+
+
+def _stub_pattern_scores(inputs: Dict) -> Dict[str, int]:
+    """Rule-of-thumb pattern scores so stubbed recommendations vary with the scenario"""
+    teams, team_size = inputs.get("number_of_teams", 1), inputs.get("team_size", 1)
+    large_scale = inputs.get("expected_users", 0) >= 500000
+    streaming = "Kafka" in (inputs.get("technology_stack") or ()) or "Kafka" in (inputs.get("existing_infrastructure") or ())
+    scores = {
+        "microservices": 3 + 3 * (teams >= 4) + 2 * large_scale + (inputs.get("devops_maturity") == "high"),
+        "modular_monolith": 8 - 3 * (teams >= 4),
+        "monolithic": 7 if team_size <= 8 else 3,
+        "event_driven": 4 + 3 * streaming + (inputs.get("data_consistency_needs") == "eventual"),
+        "serverless": 5 + (inputs.get("budget_constraint") == "low"),
+    }
+    return {pattern: max(1, min(10, score)) for pattern, score in scores.items()}
+
+
+class _StubLLM:
+    """Answers quick mode's call with a fixed recommendation"""
+
+    def __init__(self, latency_s: float):
+        self.latency_s = latency_s
+
+    def call(self, messages) -> str:
+        time.sleep(self.latency_s)
+        return json.dumps({
+            "recommended_pattern": "modular_monolith",
+            "confidence": 7,
+            "pattern_scores": {"modular_monolith": 8, "microservices": 6, "monolithic": 5},
+            "key_risks": ["Stub risk: module boundaries erode without enforced public module APIs."],
+            "rationale": "Stub quick answer.",
+        })
+
+
+class StubRecommender:
+    """Stand-in for MultiAgentArchitectureRecommender with configurable latency"""
+    latency_s = float(os.getenv("LOADTEST_CREW_LATENCY", "0.5"))
+    failure_rate = float(os.getenv("LOADTEST_CREW_FAILURE_RATE", "0"))
+
+    def __init__(self):
+        self.pruning_decisions: Dict = {}
+        self.task_budgets: Dict = {}
+
+    def prune(self, requirements, rules=None):
+        self.pruning_decisions = evaluate_pruning(requirements, rules)
+        return self.pruning_decisions
+
+    def apply_budgets(self, profile=None):
+        self.task_budgets = resolve_budgets(profile)
+        return self.task_budgets
+
+    def quick_llm(self, config) -> _StubLLM:
+        # One call instead of six tasks
+        return _StubLLM(self.latency_s / 6)
+
+    def _skipped(self):
+        return {name for name, decision in self.pruning_decisions.items() if not decision.runs_task}
+
+    def crew(self) -> _StubCrew:
+        skipped = self._skipped()
+        tasks = [name for name in _StubCrew.TASKS if name not in skipped]
+        return _StubCrew(self.latency_s, self.failure_rate, tasks, self.task_budgets)
+
+    def comparison_crew(self, providers) -> _StubCrew:
+        # Same latency as one run: the real per-provider tasks run concurrently
+        skipped = self._skipped()
+        shared = [name for name in _StubCrew.TASKS if name not in skipped and name not in PROVIDER_TASKS + ("synthesis_task",)]
+        fanned_out = [
+            provider_task_name(name, provider)
+            for name in PROVIDER_TASKS if name not in skipped
+            for provider in providers
+        ]
+        return _StubCrew(self.latency_s, self.failure_rate, shared + fanned_out + [COMPARISON_TASK], self.task_budgets)
+
+
+def install_stub_crew(latency_s: float, failure_rate: float = 0.0, execution: str = "thread"):
+    """Point the crew runner (and any worker processes it starts) at StubRecommender"""
+    StubRecommender.latency_s = latency_s
+    StubRecommender.failure_rate = failure_rate
+    os.environ["LOADTEST_CREW_LATENCY"] = str(latency_s)
+    os.environ["LOADTEST_CREW_FAILURE_RATE"] = str(failure_rate)
+    os.environ[CREW_FACTORY_ENV] = STUB_CREW_FACTORY
+    os.environ["ARCHITECTURE_EXECUTION"] = execution
+    # Keep stubbed run traces out of the app's trace history
+    os.environ.setdefault(TRACE_DIR_ENV, os.path.join(tempfile.gettempdir(), "architecture-loadtest-traces"))
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """Nearest-rank percentile: the smallest value with at least ``pct``% of values at or below it"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    # pct * n first: pct / 100 * n picks up float error (0.9 * 10 > 9)
+    return ordered[max(0, math.ceil(pct * len(ordered) / 100) - 1)]
@@ -0,0 +1,3 @@
+from multi_agent_architecture_recommender.tools.knowledge_base_tool import KnowledgeBaseTool
+
+__all__ = ["KnowledgeBaseTool"]
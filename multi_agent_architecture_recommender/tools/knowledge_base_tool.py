@@ -0,0 +1,39 @@
+from typing import Optional, Type
+
+from crewai.tools import BaseTool
+from pydantic import BaseModel, Field
+
+from multi_agent_architecture_recommender.knowledge_base import CATEGORIES, search
+
+# Snippets returned per call; each is a few lines, so this keeps prompts short
+TOP_K = 3
+
+
+class KnowledgeBaseInput(BaseModel):
+    query: str = Field(
+        ...,
+        description="What to look up, e.g. 'DynamoDB partition throughput limits' or 'PCI-DSS log retention'",
+    )
+    category: Optional[str] = Field(
+        None,
+        description=f"Optional filter, one of: {', '.join(CATEGORIES)}",
+    )
+
+
+class KnowledgeBaseTool(BaseTool):
+    name: str = "Architecture Knowledge Base"
+    description: str = (
+        "Looks up vetted reference facts: architecture patterns and their trade-offs, cloud service "
+        "limits and indicative prices (AWS, Azure, GCP), and compliance control mappings (GDPR, SOC2, "
+        "PCI-DSS, HIPAA, ISO27001, FedRAMP). Returns short snippets tagged [KB:<id>]. Use it before "
+        "stating such facts and cite the tag instead of deriving the fact at length."
+    )
+    args_schema: Type[BaseModel] = KnowledgeBaseInput
+
+    def _run(self, query: str, category: Optional[str] = None) -> str:
+        if category not in CATEGORIES:
+            category = None
+        hits = search(query, top_k=TOP_K, category=category)
+        if not hits:
+            return "No matching knowledge base entries; rephrase with service, pattern or regulation names."
+        return "\n".join(hit.snippet() for hit in hits)
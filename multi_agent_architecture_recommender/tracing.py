@@ -0,0 +1,408 @@
+"""Per-run trace timeline: setup, tasks, agent steps and LLM calls.
+
+``RunTracer`` collects timings while ``runner.execute_analysis`` runs. Setup
+and kickoff are explicit spans; tasks and LLM calls come from the CrewAI
+event bus. An agent iteration is one round of the agent's loop: an LLM call
+(with its retries) and the tool work up to the next call. ``finish``
+assembles them into a span tree, and ``write_trace`` stores it as OTLP/JSON
+(the format of the OpenTelemetry collector's file exporter), one file per
+run under ``ARCHITECTURE_TRACE_DIR``.
+"""
+import contextlib
+import json
+import os
+import secrets
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from multi_agent_architecture_recommender.budgets import count_tokens
+
+TRACE_DIR_ENV = "ARCHITECTURE_TRACE_DIR"
+DEFAULT_TRACE_DIR = "traces"
+# Oldest trace files beyond this count are deleted on write
+TRACE_RETENTION = int(os.getenv("ARCHITECTURE_TRACE_RETENTION", "200"))
+
+SERVICE_NAME = "multi-agent-architecture-recommender"
+SCOPE_NAME = "multi_agent_architecture_recommender.tracing"
+
+# OTLP span kinds and status codes
+SPAN_KIND_INTERNAL = 1
+SPAN_KIND_CLIENT = 3
+STATUS_ERROR = 2
+
+
+@dataclass
+class Span:
+    name: str
+    span_id: str
+    parent_id: Optional[str]
+    start_ns: int
+    end_ns: int = 0
+    attributes: Dict[str, Any] = field(default_factory=dict)
+    error: Optional[str] = None
+    kind: int = SPAN_KIND_INTERNAL
+
+    @property
+    def duration_s(self) -> float:
+        return (self.end_ns - self.start_ns) / 1e9
+
+
+def _span_id() -> str:
+    return secrets.token_hex(8)
+
+
+def _event_ns(event: Any) -> int:
+    timestamp = getattr(event, "timestamp", None)
+    if isinstance(timestamp, datetime):
+        return int(timestamp.timestamp() * 1e9)
+    return time.time_ns()
+
+
+def _event_task_id(event: Any) -> Optional[str]:
+    task_id = getattr(event, "task_id", None)
+    if task_id:
+        return str(task_id)
+    task = getattr(event, "task", None)
+    return str(task.id) if getattr(task, "id", None) else None
+
+
+# CrewAI event bus. Handlers are installed once per process and fan events
+# out to the tracers of the runs in flight; each tracer keeps only events for
+# its own crew's tasks.
+_TRACED_EVENTS = (
+    "TaskStartedEvent", "TaskCompletedEvent", "TaskFailedEvent",
+    "LLMCallStartedEvent", "LLMCallCompletedEvent", "LLMCallFailedEvent",
+)
+_active_tracers: List["RunTracer"] = []
+_active_lock = threading.Lock()
+_event_bus = None
+_handlers_installed = False
+
+
+def _load_event_bus():
+    """CrewAI's event bus and the event classes we trace, or (None, []) if unavailable"""
+    for module_name in ("crewai.events", "crewai.utilities.events"):
+        try:
+            module = __import__(module_name, fromlist=["crewai_event_bus"])
+        except ImportError:
+            continue
+        bus = getattr(module, "crewai_event_bus", None)
+        if bus is not None:
+            return bus, [getattr(module, name) for name in _TRACED_EVENTS if hasattr(module, name)]
+    return None, []
+
+
+def _dispatch(source: Any, event: Any):
+    with _active_lock:
+        tracers = list(_active_tracers)
+    for tracer in tracers:
+        tracer.record_event(event)
+
+
+def _install_handlers():
+    global _event_bus, _handlers_installed
+    with _active_lock:
+        if _handlers_installed:
+            return
+        _handlers_installed = True
+        _event_bus, event_types = _load_event_bus()
+        for event_type in event_types:
+            _event_bus.on(event_type)(_dispatch)
+
+
+class RunTracer:
+    """Collects the spans of one analysis run"""
+
+    def __init__(self, run_id: str):
+        self.run_id = run_id
+        self.spans: List[Span] = []
+        self._stack: List[Span] = []
+        self._lock = threading.Lock()
+        self._task_ids = set()
+        self._events: List[Tuple[int, str, Any]] = []
+
+    @contextlib.contextmanager
+    def span(self, name: str, **attributes):
+        """Time the enclosed block as a child of the innermost open span"""
+        parent = self._stack[-1] if self._stack else None
+        span = Span(name, _span_id(), parent.span_id if parent else None, time.time_ns(), attributes=attributes)
+        self._stack.append(span)
+        try:
+            yield span
+        except Exception as e:
+            span.error = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            span.end_ns = time.time_ns()
+            self._stack.pop()
+            self.spans.append(span)
+
+    def watch(self, crew: Any):
+        """Follow the task and LLM events of a built crew"""
+        self._task_ids = {str(task.id) for task in getattr(crew, "tasks", None) or [] if getattr(task, "id", None)}
+        if not self._task_ids:
+            # Not a CrewAI crew (e.g. the load test's stub); nothing to follow
+            return
+        _install_handlers()
+        with _active_lock:
+            _active_tracers.append(self)
+
+    def record_event(self, event: Any):
+        task_id = _event_task_id(event)
+        if task_id not in self._task_ids:
+            return
+        with self._lock:
+            self._events.append((_event_ns(event), task_id, event))
+
+    def finish(self) -> List[Span]:
+        """Stop following the crew and return every span of the run, roots first"""
+        # Newer CrewAI versions run handlers on a thread pool; wait for stragglers
+        # while still registered, or a failed run loses its failure events
+        if self._task_ids and _event_bus is not None and hasattr(_event_bus, "flush"):
+            _event_bus.flush(timeout=5.0)
+        with _active_lock:
+            if self in _active_tracers:
+                _active_tracers.remove(self)
+        with self._lock:
+            events = sorted(self._events, key=lambda item: item[0])
+
+        kickoff = next((s for s in self.spans if s.name == "crew.kickoff"), None)
+        root = next((s for s in self.spans if s.parent_id is None), None)
+        parent = kickoff or root
+        task_spans = self._task_spans(events, parent)
+        step_spans, llm_spans = self._agent_spans(events, task_spans, parent)
+
+        spans = sorted(self.spans, key=lambda s: s.start_ns)
+        for spans_of_kind in (task_spans.values(), step_spans, llm_spans):
+            spans.extend(sorted(spans_of_kind, key=lambda s: s.start_ns))
+        return spans
+
+    def _task_spans(self, events, parent: Optional[Span]) -> Dict[str, Span]:
+        spans: Dict[str, Span] = {}
+        for ns, task_id, event in events:
+            if event.type == "task_started":
+                task = getattr(event, "task", None)
+                name = getattr(task, "name", None) or getattr(event, "task_name", None) or "task"
+                agent = getattr(task, "agent", None)
+                spans[task_id] = Span(
+                    f"task {name}", _span_id(), parent.span_id if parent else None, ns,
+                    attributes={"task.name": name, "agent.role": getattr(agent, "role", None) or ""},
+                )
+            elif event.type in ("task_completed", "task_failed") and task_id in spans:
+                span = spans[task_id]
+                span.end_ns = ns
+                output = getattr(event, "output", None)
+                if output is not None:
+                    span.attributes["task.output_tokens"] = count_tokens(getattr(output, "raw", None) or "")
+                if event.type == "task_failed":
+                    span.error = getattr(event, "error", None) or "task failed"
+        for span in spans.values():
+            if not span.end_ns:
+                span.end_ns = parent.end_ns if parent else time.time_ns()
+                span.error = span.error or "task did not finish"
+        return spans
+
+    def _agent_spans(self, events, task_spans: Dict[str, Span], parent: Optional[Span]) -> Tuple[List[Span], List[Span]]:
+        """Agent iteration spans and the LLM call spans nested in them"""
+        step_spans, llm_spans = [], []
+        open_calls: Dict[str, Tuple[str, Span]] = {}
+        current_step: Dict[str, Span] = {}
+        iterations: Dict[str, int] = {}
+        failures: Dict[str, int] = {}
+
+        for ns, task_id, event in events:
+            if not event.type.startswith("llm_call_"):
+                continue
+            task = task_spans.get(task_id)
+            if event.type == "llm_call_started":
+                # A retry after a failed call stays in the same iteration
+                step = current_step.get(task_id)
+                if step is None or not failures.get(task_id):
+                    if step is not None:
+                        step.end_ns = ns
+                    iterations[task_id] = iterations.get(task_id, 0) + 1
+                    owner = task or parent
+                    step = Span(
+                        "agent.step", _span_id(), owner.span_id if owner else None, ns,
+                        attributes={"agent.iteration": iterations[task_id]},
+                    )
+                    if task:
+                        step.attributes["agent.role"] = task.attributes["agent.role"]
+                    current_step[task_id] = step
+                    step_spans.append(step)
+
+                attributes = {
+                    "gen_ai.request.model": getattr(event, "model", None) or "",
+                    "llm.retry_count": failures.get(task_id, 0),
+                }
+                if getattr(event, "max_tokens", None):
+                    attributes["gen_ai.request.max_tokens"] = int(event.max_tokens)
+                call_key = getattr(event, "call_id", None) or task_id
+                open_calls[call_key] = (task_id, Span(
+                    "llm.call", _span_id(), step.span_id, ns, attributes=attributes, kind=SPAN_KIND_CLIENT,
+                ))
+                continue
+
+            call_key = getattr(event, "call_id", None) or task_id
+            if call_key not in open_calls:
+                # Events emitted outside CrewAI's call context get a fresh call_id
+                # each; calls within one task are sequential, so pair by task
+                call_key = next((key for key, (owner, _) in open_calls.items() if owner == task_id), None)
+                if call_key is None:
+                    continue
+            _, span = open_calls.pop(call_key)
+            span.end_ns = ns
+            if event.type == "llm_call_failed":
+                span.error = getattr(event, "error", None) or "LLM call failed"
+                failures[task_id] = failures.get(task_id, 0) + 1
+            else:
+                failures[task_id] = 0
+                usage = getattr(event, "usage", None) or {}
+                for source, target in (("prompt_tokens", "gen_ai.usage.input_tokens"),
+                                       ("completion_tokens", "gen_ai.usage.output_tokens")):
+                    if isinstance(usage.get(source), int):
+                        span.attributes[target] = usage[source]
+                if getattr(event, "finish_reason", None):
+                    span.attributes["gen_ai.response.finish_reasons"] = event.finish_reason
+            llm_spans.append(span)
+
+        end_of_run = parent.end_ns if parent else time.time_ns()
+        for _, span in open_calls.values():
+            span.end_ns = end_of_run
+            span.error = "LLM call did not finish"
+            llm_spans.append(span)
+        # The last iteration of a task runs until the task ends
+        for task_id, step in current_step.items():
+            task = task_spans.get(task_id)
+            step.end_ns = task.end_ns if task else end_of_run
+        return step_spans, llm_spans
+
+
+# OTLP/JSON encoding
+def _otlp_value(value: Any) -> Dict[str, Any]:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+def _python_value(value: Dict[str, Any]) -> Any:
+    if "intValue" in value:
+        return int(value["intValue"])
+    for key in ("boolValue", "doubleValue", "stringValue"):
+        if key in value:
+            return value[key]
+    return None
+
+
+def to_otlp(run_id: str, spans: List[Span], resource: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    resource_attributes = {"service.name": SERVICE_NAME, **(resource or {})}
+    return {"resourceSpans": [{
+        "resource": {"attributes": [{"key": k, "value": _otlp_value(v)} for k, v in resource_attributes.items()]},
+        "scopeSpans": [{
+            "scope": {"name": SCOPE_NAME},
+            "spans": [
+                {
+                    "traceId": run_id,
+                    "spanId": span.span_id,
+                    "parentSpanId": span.parent_id or "",
+                    "name": span.name,
+                    "kind": span.kind,
+                    "startTimeUnixNano": str(span.start_ns),
+                    "endTimeUnixNano": str(span.end_ns),
+                    "attributes": [{"key": k, "value": _otlp_value(v)} for k, v in span.attributes.items() if v is not None],
+                    "status": {"code": STATUS_ERROR, "message": span.error} if span.error else {},
+                }
+                for span in spans
+            ],
+        }],
+    }]}
+
+
+def from_otlp(data: Dict[str, Any]) -> Tuple[Dict[str, Any], List[Span]]:
+    """Resource attributes and spans of an OTLP/JSON trace"""
+    resource, spans = {}, []
+    for resource_spans in data.get("resourceSpans", []):
+        for attribute in resource_spans.get("resource", {}).get("attributes", []):
+            resource[attribute["key"]] = _python_value(attribute["value"])
+        for scope_spans in resource_spans.get("scopeSpans", []):
+            for raw in scope_spans.get("spans", []):
+                status = raw.get("status") or {}
+                spans.append(Span(
+                    name=raw["name"],
+                    span_id=raw["spanId"],
+                    parent_id=raw.get("parentSpanId") or None,
+                    start_ns=int(raw["startTimeUnixNano"]),
+                    end_ns=int(raw["endTimeUnixNano"]),
+                    attributes={a["key"]: _python_value(a["value"]) for a in raw.get("attributes", [])},
+                    error=status.get("message") if status.get("code") == STATUS_ERROR else None,
+                    kind=raw.get("kind", SPAN_KIND_INTERNAL),
+                ))
+    return resource, spans
+
+
+# Trace files
+def trace_dir() -> str:
+    return os.path.abspath(os.getenv(TRACE_DIR_ENV) or DEFAULT_TRACE_DIR)
+
+
+def write_trace(run_id: str, spans: List[Span], resource: Optional[Dict[str, Any]] = None,
+                directory: Optional[str] = None) -> str:
+    directory = directory or trace_dir()
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, f"{run_id}.json")
+    with open(path, "w") as f:
+        json.dump(to_otlp(run_id, spans, resource), f)
+
+    for _, old_path in list_traces(directory)[TRACE_RETENTION:]:
+        with contextlib.suppress(OSError):
+            os.remove(old_path)
+    return path
+
+
+def list_traces(directory: Optional[str] = None) -> List[Tuple[float, str]]:
+    """(modified time, path) of stored traces, newest first"""
+    directory = directory or trace_dir()
+    if not os.path.isdir(directory):
+        return []
+    paths = [os.path.join(directory, name) for name in os.listdir(directory) if name.endswith(".json")]
+    return sorted(((os.path.getmtime(p), p) for p in paths), reverse=True)
+
+
+def load_trace(path: str) -> Tuple[Dict[str, Any], List[Span]]:
+    with open(path) as f:
+        return from_otlp(json.load(f))
+
+
+def waterfall_rows(spans: List[Span]) -> List[Dict[str, Any]]:
+    """Spans in tree order with their depth and offsets from the start of the run"""
+    if not spans:
+        return []
+    children: Dict[Optional[str], List[Span]] = {}
+    ids = {span.span_id for span in spans}
+    for span in spans:
+        parent = span.parent_id if span.parent_id in ids else None
+        children.setdefault(parent, []).append(span)
+    origin = min(span.start_ns for span in spans)
+
+    rows = []
+
+    def visit(span: Span, depth: int):
+        rows.append({
+            "span": span,
+            "depth": depth,
+            "start_s": (span.start_ns - origin) / 1e9,
+            "end_s": (span.end_ns - origin) / 1e9,
+        })
+        for child in sorted(children.get(span.span_id, []), key=lambda s: s.start_ns):
+            visit(child, depth + 1)
+
+    for root in sorted(children.get(None, []), key=lambda s: s.start_ns):
+        visit(root, 0)
+    return rows
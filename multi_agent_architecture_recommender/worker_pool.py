@@ -0,0 +1,325 @@
+"""Pre-warmed worker processes for crew runs.
+
+Each worker is a ``python -m multi_agent_architecture_recommender.worker_pool``
+subprocess that imports CrewAI and loads the crew configs once at startup,
+then serves runs over its stdin/stdout. Messages are length-prefixed,
+zlib-compressed pickles. A worker is recycled after ``max_runs`` runs or once
+its resident memory passes ``max_rss_mb``, so leaks in CrewAI or the LLM
+clients never accumulate in the Streamlit server, and the crew's verbose
+output goes to the worker's stderr instead of a process-wide stdout patch.
+A ``progress`` callable passed to ``submit`` is relayed: the worker sends each
+call back as a frame and the pool invokes the callable in this process.
+
+Workers are plain subprocesses rather than multiprocessing children:
+Streamlit installs the running script as ``__main__``, which spawn-based
+multiprocessing would re-import in every worker.
+"""
+import argparse
+import os
+import pickle
+import queue
+import resource
+import struct
+import subprocess
+import sys
+import threading
+import traceback
+import zlib
+from concurrent.futures import Executor, Future, ThreadPoolExecutor
+from typing import Any, Callable, Optional, Tuple
+
+PACKAGE_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+_FRAME_HEADER = struct.Struct("!I")
+# Stands in for a ``progress`` callable on the way to the worker
+_PROGRESS_RELAY = "worker_pool:progress-relay"
+
+
+class WorkerStartupError(RuntimeError):
+    """A worker process could not import CrewAI or load the crew"""
+
+
+class WorkerCrashedError(RuntimeError):
+    """A worker process died while serving a run"""
+
+
+def current_rss_mb() -> float:
+    """Resident set size of this process in MB"""
+    try:
+        with open("/proc/self/statm") as f:
+            pages = int(f.read().split()[1])
+        return pages * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+    except (OSError, ValueError):
+        # ru_maxrss is KB on Linux and bytes on macOS; only a peak, but better than nothing
+        maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return maxrss / (1024 * 1024) if sys.platform == "darwin" else maxrss / 1024
+
+
+def encode_frame(message: Any) -> bytes:
+    payload = zlib.compress(pickle.dumps(message, protocol=pickle.HIGHEST_PROTOCOL), 1)
+    return _FRAME_HEADER.pack(len(payload)) + payload
+
+
+def write_frame(stream, message: Any):
+    stream.write(encode_frame(message))
+    stream.flush()
+
+
+def read_frame(stream) -> Any:
+    header = stream.read(_FRAME_HEADER.size)
+    if len(header) < _FRAME_HEADER.size:
+        raise EOFError("worker channel closed")
+    (length,) = _FRAME_HEADER.unpack(header)
+    payload = stream.read(length)
+    if len(payload) < length:
+        raise EOFError("worker channel closed mid-message")
+    return pickle.loads(zlib.decompress(payload))
+
+
+def _portable_exception(error: BaseException) -> BaseException:
+    """The exception itself if it survives pickling, otherwise a RuntimeError copy"""
+    details = traceback.format_exc()
+    try:
+        error.add_note(details)
+        pickle.loads(pickle.dumps(error))
+        return error
+    except Exception:
+        return RuntimeError(f"{type(error).__name__}: {error}\n{details}")
+
+
+# Worker process side
+def serve(max_runs: int, max_rss_mb: float):
+    """Worker main loop: warm up, then execute runs until recycled or closed"""
+    try:
+        _serve(max_runs, max_rss_mb)
+    except BrokenPipeError:
+        # The pool went away (server shutdown) while we were starting or replying
+        pass
+
+
+def _serve(max_runs: int, max_rss_mb: float):
+    # Keep the protocol on the original stdout; route all prints (CrewAI's
+    # verbose output included) to stderr
+    channel_out = os.fdopen(os.dup(sys.stdout.fileno()), "wb")
+    os.dup2(sys.stderr.fileno(), sys.stdout.fileno())
+    channel_in = sys.stdin.buffer
+
+    try:
+        from multi_agent_architecture_recommender.runner import load_recommender_class
+        # Importing the crew pulls in CrewAI; instantiating it parses the YAML configs
+        load_recommender_class()()
+    except Exception as e:
+        write_frame(channel_out, ("failed", f"{type(e).__name__}: {e}"))
+        return
+    write_frame(channel_out, ("ready", os.getpid()))
+
+    # Progress can be reported from the crew's task threads
+    channel_lock = threading.Lock()
+
+    def relay_progress(update: Any):
+        with channel_lock:
+            write_frame(channel_out, ("progress", update))
+
+    runs = 0
+    while True:
+        try:
+            fn, args, kwargs = read_frame(channel_in)
+        except EOFError:
+            return
+        if kwargs.get("progress") == _PROGRESS_RELAY:
+            kwargs["progress"] = relay_progress
+        try:
+            reply = ("result", fn(*args, **kwargs))
+        except Exception as e:
+            reply = ("error", _portable_exception(e))
+        runs += 1
+        retiring = runs >= max_runs or current_rss_mb() > max_rss_mb
+        with channel_lock:
+            write_frame(channel_out, reply + (retiring,))
+        if retiring:
+            return
+
+
+# Server side
+class _Worker:
+    def __init__(self, max_runs: int, max_rss_mb: float, crew_factory: Optional[str]):
+        env = dict(os.environ)
+        env["PYTHONPATH"] = os.pathsep.join(filter(None, [PACKAGE_ROOT, env.get("PYTHONPATH")]))
+        if crew_factory:
+            from multi_agent_architecture_recommender.runner import CREW_FACTORY_ENV
+            env[CREW_FACTORY_ENV] = crew_factory
+        self.process = subprocess.Popen(
+            [sys.executable, "-m", "multi_agent_architecture_recommender.worker_pool",
+             "--max-runs", str(max_runs), "--max-rss-mb", str(max_rss_mb)],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            env=env,
+        )
+
+    @property
+    def pid(self) -> int:
+        return self.process.pid
+
+    def wait_ready(self):
+        try:
+            status, detail = read_frame(self.process.stdout)
+        except EOFError:
+            self.kill()
+            raise WorkerStartupError(f"worker {self.pid} exited during startup (code {self.process.poll()})")
+        if status != "ready":
+            self.kill()
+            raise WorkerStartupError(f"worker {self.pid} failed to start: {detail}")
+
+    def call(self, request: bytes, on_progress: Optional[Callable[[Any], None]] = None) -> Tuple[str, Any, bool]:
+        """Send an encoded ``(fn, args, kwargs)`` frame and wait for its reply"""
+        self.process.stdin.write(request)
+        self.process.stdin.flush()
+        while True:
+            message = read_frame(self.process.stdout)
+            if message[0] != "progress":
+                return message
+            if on_progress is not None:
+                try:
+                    on_progress(message[1])
+                except Exception:
+                    # A failing listener must not desynchronise the channel
+                    pass
+
+    def stop(self, timeout: float = 5.0):
+        try:
+            self.process.stdin.close()
+            self.process.wait(timeout)
+        except (OSError, subprocess.TimeoutExpired):
+            self.kill()
+
+    def kill(self):
+        if self.process.poll() is None:
+            self.process.kill()
+        self.process.wait()
+
+
+class CrewWorkerPool(Executor):
+    """Executor that runs picklable callables in pre-warmed, recycled worker processes.
+
+    Callables must be importable by reference (module-level functions such as
+    ``runner.execute_analysis``); arguments and results travel pickled.
+    """
+
+    def __init__(
+        self,
+        size: Optional[int] = None,
+        max_runs_per_worker: Optional[int] = None,
+        max_rss_mb: Optional[float] = None,
+        crew_factory: Optional[str] = None,
+    ):
+        self.size = size or int(os.getenv("CREW_POOL_SIZE", "2"))
+        self.max_runs_per_worker = max_runs_per_worker or int(os.getenv("CREW_WORKER_MAX_RUNS", "25"))
+        self.max_rss_mb = max_rss_mb or float(os.getenv("CREW_WORKER_MAX_RSS_MB", "1024"))
+        self.crew_factory = crew_factory
+        self.recycled = 0
+        self._idle: "queue.Queue[Optional[_Worker]]" = queue.Queue()
+        self._dispatch = ThreadPoolExecutor(max_workers=self.size, thread_name_prefix="crew-pool")
+        self._shutdown = False
+        # Warm workers in the background so the first page load isn't blocked on CrewAI imports
+        for _ in range(self.size):
+            self._replace_async()
+
+    def submit(self, fn: Callable, /, *args, **kwargs) -> Future:
+        if self._shutdown:
+            raise RuntimeError("cannot schedule new runs after shutdown")
+        on_progress = kwargs.pop("progress", None)
+        if on_progress is not None:
+            kwargs["progress"] = _PROGRESS_RELAY
+        return self._dispatch.submit(self._call, fn, args, kwargs, on_progress)
+
+    def shutdown(self, wait: bool = True, *, cancel_futures: bool = False):
+        self._shutdown = True
+        self._dispatch.shutdown(wait=wait, cancel_futures=cancel_futures)
+        while True:
+            try:
+                worker = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            if worker is not None:
+                worker.stop()
+
+    def _start_worker(self) -> _Worker:
+        worker = _Worker(self.max_runs_per_worker, self.max_rss_mb, self.crew_factory)
+        try:
+            worker.wait_ready()
+        except BaseException:
+            worker.kill()
+            raise
+        return worker
+
+    def _discard(self, worker: _Worker):
+        worker.kill()
+        self._replace_async()
+
+    def _replace_async(self):
+        def start():
+            if self._shutdown:
+                return
+            try:
+                worker = self._start_worker()
+            except Exception:
+                # An empty slot; the next run retries the start and reports the error
+                self._idle.put(None)
+                return
+            if self._shutdown:
+                worker.stop()
+            else:
+                self._idle.put(worker)
+
+        threading.Thread(target=start, name="crew-pool-start", daemon=True).start()
+
+    def _call(self, fn: Callable, args: Tuple, kwargs: dict, on_progress: Optional[Callable[[Any], None]] = None) -> Any:
+        # Every path below gives the slot back (a worker, or None to restart)
+        # or the pool would hang on its next run
+        worker = self._idle.get()
+        if worker is None:
+            try:
+                worker = self._start_worker()
+            except BaseException:
+                self._idle.put(None)
+                raise
+
+        try:
+            request = encode_frame((fn, args, kwargs))
+        except BaseException:
+            # Nothing reached the worker; it is still in sync
+            self._idle.put(worker)
+            raise
+
+        try:
+            status, payload, retiring = worker.call(request, on_progress)
+        except (EOFError, OSError) as e:
+            self._discard(worker)
+            raise WorkerCrashedError(f"worker {worker.pid} died during a run (code {worker.process.poll()})") from e
+        except BaseException:
+            # Interrupted mid-exchange, e.g. by a reply that won't unpickle here
+            self._discard(worker)
+            raise
+
+        if retiring:
+            worker.stop()
+            self.recycled += 1
+            self._replace_async()
+        else:
+            self._idle.put(worker)
+
+        if status == "error":
+            raise payload
+        return payload
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Crew worker process (started by CrewWorkerPool)")
+    parser.add_argument("--max-runs", type=int, default=25)
+    parser.add_argument("--max-rss-mb", type=float, default=1024)
+    args = parser.parse_args(argv)
+    serve(args.max_runs, args.max_rss_mb)
+
+
+if __name__ == "__main__":
+    main()
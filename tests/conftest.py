@@ -0,0 +1,35 @@
+import pytest
+
+# A small product team's requirements; tests override only the fields they vary
+REQUIREMENTS = {
+    "expected_users": 10000,
+    "expected_requests_per_second": 100,
+    "data_volume_gb": 10.0,
+    "latency_requirements_ms": 200,
+    "peak_load_multiplier": 2.0,
+    "team_size": 5,
+    "team_experience_level": "mixed",
+    "number_of_teams": 1,
+    "development_velocity_priority": "high",
+    "devops_maturity": "low",
+    "budget_constraint": "low",
+    "existing_infrastructure": ["AWS", "PostgreSQL"],
+    "preferred_cloud_provider": "AWS",
+    "compliance_requirements": [],
+    "legacy_system_integration": False,
+    "time_to_market": "fast",
+    "scalability_needs": "vertical",
+    "availability_requirements": 99.9,
+    "multi_tenant_needs": False,
+    "geographic_distribution": "single_region",
+    "technology_stack": ["Python", "React"],
+    "data_consistency_needs": "strong",
+    "security_level": "standard",
+    "integration_complexity": "simple",
+}
+
+
+@pytest.fixture
+def requirements():
+    """RequirementContext.to_dict()-shaped inputs, a fresh copy per test"""
+    return {name: list(value) if isinstance(value, list) else value for name, value in REQUIREMENTS.items()}
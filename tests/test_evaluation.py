@@ -0,0 +1,38 @@
+import os
+
+import pytest
+
+from multi_agent_architecture_recommender import evaluation, stubs
+from multi_agent_architecture_recommender.runner import CREW_FACTORY_ENV
+from multi_agent_architecture_recommender.tracing import TRACE_DIR_ENV
+
+
+class SuiteStarted(Exception):
+    pass
+
+
+@pytest.fixture
+def clean_environment(monkeypatch, tmp_path):
+    """No trace directory configured; whatever the stub crew installs is undone afterwards"""
+    names = (TRACE_DIR_ENV, CREW_FACTORY_ENV, "LOADTEST_CREW_LATENCY", "LOADTEST_CREW_FAILURE_RATE", "ARCHITECTURE_EXECUTION")
+    for name in names:
+        # setenv first so the variable is restored (or removed) at teardown
+        monkeypatch.setenv(name, "")
+        monkeypatch.delenv(name)
+    monkeypatch.setattr(stubs.StubRecommender, "latency_s", stubs.StubRecommender.latency_s)
+    monkeypatch.setattr(stubs.StubRecommender, "failure_rate", stubs.StubRecommender.failure_rate)
+    monkeypatch.setattr(evaluation.tempfile, "gettempdir", lambda: str(tmp_path))
+
+
+def test_stubbed_runs_trace_to_the_evaluation_directory(clean_environment, monkeypatch, tmp_path):
+    seen = {}
+
+    def run_suite(*args):
+        seen.update(os.environ)
+        raise SuiteStarted
+
+    monkeypatch.setattr(evaluation, "run_suite", run_suite)
+    with pytest.raises(SuiteStarted):
+        evaluation.main(["--stub", "--stub-latency", "0"])
+    assert seen[TRACE_DIR_ENV] == os.path.join(str(tmp_path), "architecture-evaluation-traces")
+    assert seen[CREW_FACTORY_ENV] == stubs.STUB_CREW_FACTORY
@@ -0,0 +1,110 @@
+import pytest
+
+from multi_agent_architecture_recommender import knowledge_base
+from multi_agent_architecture_recommender.knowledge_base import (
+    KnowledgeEntry,
+    KnowledgeIndex,
+    build_index,
+    get_index,
+    load_entries,
+    tokenize,
+)
+
+PATTERNS = """
+- id: pattern.event_driven
+  title: Event-driven architecture
+  tags: [events, kafka]
+  text: >
+    Services publish events to a broker and react to each other's events.
+- id: pattern.monolithic
+  title: Monolithic architecture
+  tags: [monolith]
+  text: One deployable unit sharing one database.
+"""
+
+CLOUD = """
+- id: cloud.aws.dynamodb
+  title: DynamoDB partitions
+  text: Hot partition keys throttle writes; spread keys to avoid a hot partition.
+"""
+
+
+@pytest.fixture
+def sources(tmp_path):
+    directory = tmp_path / "knowledge"
+    directory.mkdir()
+    (directory / "patterns.yaml").write_text(PATTERNS)
+    (directory / "cloud.yaml").write_text(CLOUD)
+    return directory
+
+
+@pytest.fixture
+def index(sources, tmp_path):
+    return KnowledgeIndex(build_index(str(sources), str(tmp_path / "index.bm25")))
+
+
+def test_tokenize_keeps_hyphenated_terms_and_folds_plurals():
+    assert tokenize("The PCI-DSS replicas") == ["pcidss", "pci", "dss", "replica"]
+
+
+def test_entries_round_trip_through_the_index(sources, index):
+    entries = load_entries(str(sources))
+    assert index.doc_count == len(entries) == 3
+    assert [index.entry(doc_id) for doc_id in range(index.doc_count)] == entries
+    assert index.source_hash == knowledge_base.sources_hash(str(sources))
+
+
+def test_search_ranks_matching_entries(index):
+    (hit,) = index.search("dynamodb hot partitions", top_k=1)
+    assert hit.entry.id == "cloud.aws.dynamodb" and hit.score > 0
+    assert hit.snippet().startswith("[KB:cloud.aws.dynamodb] DynamoDB partitions: Hot partition")
+    # Title and tags are boosted: "architecture" alone ranks both patterns
+    assert {h.entry.id for h in index.search("architecture")} == {"pattern.event_driven", "pattern.monolithic"}
+
+
+def test_search_filters_by_category(index):
+    assert [h.entry.category for h in index.search("partition events database", category="pattern")] == [
+        "pattern", "pattern"
+    ]
+
+
+def test_search_without_known_terms_finds_nothing(index):
+    assert index.search("zzz unknown") == []
+    assert index.search("") == []
+
+
+def test_get_index_rebuilds_stale_index(sources, tmp_path):
+    path = str(tmp_path / "stale.bm25")
+    build_index(str(sources), path)
+    (sources / "cloud.yaml").write_text(CLOUD.replace("DynamoDB partitions", "DynamoDB hot keys"))
+    get_index.cache_clear()
+    try:
+        (hit,) = get_index(path, str(sources)).search("dynamodb", top_k=1)
+    finally:
+        get_index.cache_clear()
+    assert hit.entry.title == "DynamoDB hot keys"
+
+
+def test_rejects_foreign_index_file(tmp_path):
+    path = tmp_path / "index.bm25"
+    path.write_bytes(b"\0" * 256)
+    with pytest.raises(ValueError, match="not a knowledge index"):
+        KnowledgeIndex(str(path))
+
+
+@pytest.mark.parametrize(
+    "source, error",
+    [
+        (PATTERNS + PATTERNS, "duplicate"),
+        ("- {id: recipe.soup, title: Soup, text: Hot.}", "must start with"),
+    ],
+)
+def test_rejects_invalid_sources(sources, source, error):
+    (sources / "patterns.yaml").write_text(source)
+    with pytest.raises(ValueError, match=error):
+        load_entries(str(sources))
+
+
+def test_shipped_index_is_current():
+    assert knowledge_base._index_is_current(knowledge_base.INDEX_PATH, knowledge_base.KNOWLEDGE_DIR)
+    assert isinstance(KnowledgeIndex().entry(0), KnowledgeEntry)
@@ -0,0 +1,147 @@
+import gzip
+import json
+import math
+
+import pytest
+
+from multi_agent_architecture_recommender.models import (
+    RequirementContext,
+    RequirementValidationError,
+    dumps_bulk,
+    loads_bulk,
+    validate_requirements,
+)
+
+
+def test_list_order_does_not_change_identity(requirements):
+    first = RequirementContext.from_dict(
+        dict(requirements, technology_stack=["Python", "React", "PostgreSQL"], compliance_requirements=["GDPR", "SOC2"])
+    )
+    reordered = RequirementContext.from_dict(
+        dict(requirements, technology_stack=["PostgreSQL", "Python", "React"], compliance_requirements=["SOC2", "GDPR"])
+    )
+    assert first == reordered
+    assert hash(first) == hash(reordered)
+    assert first.fingerprint() == reordered.fingerprint()
+    assert first.canonical_bytes() == reordered.canonical_bytes()
+
+
+def test_round_trips_through_dict(requirements):
+    context = RequirementContext.from_dict(requirements)
+    assert RequirementContext.from_dict(context.to_dict()) == context
+
+
+@pytest.mark.parametrize(
+    "overrides",
+    [
+        {"team_experience_level": "expert"},
+        {"preferred_cloud_provider": "DigitalOcean"},
+        {"team_size": True},
+        {"multi_tenant_needs": 1},
+        {"data_volume_gb": math.nan},
+        {"peak_load_multiplier": math.inf},
+        {"availability_requirements": 100.5},
+        {"data_volume_gb": 0},
+        {"technology_stack": ["Python", ""]},
+        {"schema_version": 2},
+        {"unexpected": "field"},
+    ],
+)
+def test_rejects_invalid_requirements(requirements, overrides):
+    with pytest.raises(RequirementValidationError):
+        RequirementContext.from_dict(dict(requirements, **overrides))
+
+
+def test_rejects_missing_fields(requirements):
+    del requirements["team_size"]
+    with pytest.raises(RequirementValidationError, match="team_size"):
+        validate_requirements(requirements)
+
+
+def test_integral_float_is_accepted_as_integer(requirements):
+    assert RequirementContext.from_dict(dict(requirements, team_size=5.0)).team_size == 5
+
+
+def test_constructor_rejects_non_finite_numbers(requirements):
+    with pytest.raises(RequirementValidationError):
+        RequirementContext(**dict(requirements, data_volume_gb=math.nan))
+
+
+@pytest.mark.parametrize(
+    "overrides, error",
+    [
+        ({"existing_infrastructure": "AWS"}, TypeError),
+        ({"technology_stack": "Python"}, TypeError),
+        ({"legacy_system_integration": "false"}, TypeError),
+        ({"multi_tenant_needs": 0}, TypeError),
+        ({"team_size": 3.7}, RequirementValidationError),
+        ({"expected_users": "10000"}, TypeError),
+        ({"data_volume_gb": "10"}, TypeError),
+    ],
+)
+def test_constructor_rejects_values_it_would_coerce(requirements, overrides, error):
+    field = next(iter(overrides))
+    with pytest.raises(error, match=field):
+        RequirementContext(**dict(requirements, **overrides))
+
+
+def test_constructor_accepts_integral_floats_for_integers(requirements):
+    context = RequirementContext(**dict(requirements, team_size=5.0))
+    assert context.team_size == 5 and isinstance(context.team_size, int)
+
+
+def test_bulk_round_trip(requirements):
+    contexts = [
+        RequirementContext.from_dict(requirements),
+        RequirementContext.from_dict(dict(requirements, preferred_cloud_provider=None, compliance_requirements=["GDPR"])),
+        RequirementContext.from_dict(dict(requirements, team_size=12, technology_stack=["Go"])),
+    ]
+    for compress in (True, False):
+        assert loads_bulk(dumps_bulk(contexts, compress=compress)) == contexts
+    assert loads_bulk(dumps_bulk([])) == []
+
+
+def _corrupt(requirements, mutate):
+    # Three technologies per row: the technology_stack mutations below count on it
+    data = dict(requirements, technology_stack=["Python", "React", "PostgreSQL"])
+    contexts = [RequirementContext.from_dict(data), RequirementContext.from_dict(dict(data, team_size=9))]
+    document = json.loads(dumps_bulk(contexts, compress=False))
+    mutate(document)
+    return json.dumps(document).encode()
+
+
+@pytest.mark.parametrize(
+    "mutate",
+    [
+        lambda d: d["columns"]["team_experience_level"].update(codes=[0, -1]),
+        lambda d: d["columns"]["team_experience_level"].update(codes=[0, 1]),
+        lambda d: d["columns"]["team_experience_level"].update(codes=[0, "0"]),
+        lambda d: d["columns"]["technology_stack"].update(codes=[0, 1, 2, 3, 0, 1]),
+        lambda d: d["columns"]["technology_stack"].update(offsets=[0, 4, 3]),
+        lambda d: d["columns"]["technology_stack"].update(offsets=[0, 3, 5]),
+        lambda d: d["columns"]["technology_stack"].update(offsets=[0, 3]),
+        lambda d: d["columns"]["team_experience_level"].update(dict=["expert"]),
+        lambda d: d["columns"].update(team_size=[5]),
+        lambda d: d["columns"].update(team_size=[5, [9]]),
+        lambda d: d["columns"].update(technology_stack=["Python"]),
+        lambda d: d["columns"].pop("security_level"),
+        lambda d: d.update(count="2"),
+        lambda d: d.update(format="csv"),
+    ],
+)
+def test_bulk_rejects_corrupt_documents(requirements, mutate):
+    with pytest.raises(RequirementValidationError):
+        loads_bulk(_corrupt(requirements, mutate))
+
+
+@pytest.mark.parametrize("data", [b"", b"not json", b"[1, 2]", gzip.compress(b"{")[:-4], b"\x1f\x8bgarbage"])
+def test_bulk_rejects_unreadable_input(data):
+    with pytest.raises(RequirementValidationError):
+        loads_bulk(data)
+
+
+def test_bulk_rejects_non_finite_numbers(requirements):
+    data = _corrupt(requirements, lambda d: d["columns"]["data_volume_gb"].__setitem__(0, math.nan))
+    assert b"NaN" in data
+    with pytest.raises(RequirementValidationError, match="finite"):
+        loads_bulk(data)
@@ -0,0 +1,41 @@
+import pytest
+
+from multi_agent_architecture_recommender.models import RequirementContext
+from multi_agent_architecture_recommender.pruning import evaluate_pruning
+
+RULES = {
+    "team_task": {"when": {"team_size": {"max": 3}, "number_of_teams": 1}, "action": "skip"},
+    "cost_task": {"when": {"expected_users": {"min": 1000}}, "action": "skip"},
+}
+
+
+def test_bundled_rules_fire_for_a_simple_scenario(requirements):
+    decisions = evaluate_pruning(RequirementContext.from_dict(requirements))
+    assert decisions["compliance_and_security_task"].action == "template"
+    assert decisions["compliance_and_security_task"].reason == "no compliance_requirements, security_level = standard"
+    assert decisions["technology_integration_task"].runs_task
+    assert "security baseline of AWS:" in decisions["compliance_and_security_task"].answer
+
+
+@pytest.mark.parametrize(
+    "overrides, fired",
+    [
+        ({"team_size": 3}, {"team_task", "cost_task"}),
+        ({"team_size": 4}, {"cost_task"}),
+        ({"team_size": None, "expected_users": None}, set()),
+    ],
+)
+def test_bounds_on_unset_values_do_not_match(requirements, overrides, fired):
+    assert set(evaluate_pruning(dict(requirements, **overrides), RULES)) == fired
+
+
+def test_template_reads_neutral_phrase_for_unset_provider(requirements):
+    decisions = evaluate_pruning(dict(requirements, preferred_cloud_provider=None))
+    answer = decisions["compliance_and_security_task"].answer
+    assert "security baseline of your cloud provider:" in answer
+    assert "None" not in answer
+
+
+def test_rule_not_firing_leaves_task(requirements):
+    decisions = evaluate_pruning(dict(requirements, compliance_requirements=["GDPR"], legacy_system_integration=True))
+    assert decisions == {}
@@ -0,0 +1,125 @@
+import json
+from types import SimpleNamespace
+
+import pytest
+
+from multi_agent_architecture_recommender.quick import (
+    Recommendation,
+    compare_recommendations,
+    extract_recommendation,
+    parse_quick_answer,
+)
+
+ANSWER = {
+    "recommended_pattern": "Modular Monolith",
+    "confidence": 7.4,
+    "pattern_scores": {"modular_monolith": 8, "Microservices": "6", "monolithic": 12, "unknown": 9, "serverless": None},
+    "key_risks": ["Module boundaries erode without enforced interfaces.", " "],
+    "rationale": " Small team, one domain. ",
+}
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        json.dumps(ANSWER),
+        "```json\n" + json.dumps(ANSWER, indent=2) + "\n```",
+        "Here is my answer {as requested}:\n" + json.dumps(ANSWER) + "\nNote: scores are {approximate}.",
+    ],
+)
+def test_parses_bare_fenced_and_wrapped_answers(text):
+    recommendation = parse_quick_answer(text)
+    assert recommendation.pattern == "modular_monolith"
+    assert recommendation.confidence == 7
+    assert recommendation.scores == {"modular_monolith": 8, "microservices": 6, "monolithic": 10}
+    assert recommendation.risks == ("Module boundaries erode without enforced interfaces.",)
+    assert recommendation.rationale == "Small team, one domain."
+
+
+def test_falls_back_to_best_score_without_a_named_pattern():
+    recommendation = parse_quick_answer(json.dumps({"recommended_pattern": "", "pattern_scores": {"serverless": 9, "monolithic": 4}}))
+    assert recommendation.pattern == "serverless"
+    assert recommendation.confidence is None
+
+
+def test_tolerates_fields_of_the_wrong_shape():
+    recommendation = parse_quick_answer(json.dumps({
+        "recommended_pattern": "event-driven",
+        "confidence": float("inf"),
+        "pattern_scores": [["event_driven", 8]],
+        "key_risks": "Consumers fall behind at peak load.",
+    }))
+    assert recommendation.pattern == "event_driven"
+    assert recommendation.confidence is None
+    assert recommendation.scores == {}
+    assert recommendation.risks == ("Consumers fall behind at peak load.",)
+
+
+@pytest.mark.parametrize(
+    "text, error",
+    [
+        ("", "no JSON object"),
+        ("I recommend a modular monolith.", "no JSON object"),
+        ('```json\n{"recommended_pattern": "microservices",\n```', "no JSON object"),
+        ("[1, 2]", "no JSON object"),
+        ('{"recommended_pattern": "mainframe", "pattern_scores": {}}', "no known pattern"),
+    ],
+)
+def test_rejects_malformed_answers(text, error):
+    with pytest.raises(ValueError, match=error):
+        parse_quick_answer(text)
+
+
+SYNTHESIS = """## Recommended Architecture
+
+**Recommended architecture:** Microservices (8/10)
+
+| Pattern | Score |
+|---|---|
+| Microservices | 8/10 |
+| Modular monolith | 6 |
+
+## Key Risks
+
+- Distributed transactions need sagas across service boundaries.
+- **Risk:** too short
+"""
+
+
+def test_extracts_recommendation_from_the_synthesis():
+    result = SimpleNamespace(tasks_output=[
+        SimpleNamespace(name="team_task", raw="Serverless scores 4/10 for this team."),
+        SimpleNamespace(name="synthesis_task", raw=SYNTHESIS),
+    ])
+    recommendation = extract_recommendation(result)
+    assert recommendation.pattern == "microservices"
+    assert recommendation.confidence == 8
+    assert recommendation.scores == {"serverless": 4, "microservices": 8, "modular_monolith": 6}
+    assert recommendation.risks == ("Distributed transactions need sagas across service boundaries.",)
+
+
+def test_extracts_from_raw_output_without_tasks():
+    recommendation = extract_recommendation(SimpleNamespace(tasks_output=[], raw="No scores here."))
+    assert recommendation == Recommendation(pattern=None)
+
+
+def test_compare_recommendations():
+    quick = Recommendation(
+        pattern="modular_monolith",
+        scores={"modular_monolith": 8, "microservices": 6},
+        risks=("Distributed transactions across services need sagas.", "Vendor lock-in on managed queues."),
+    )
+    full = extract_recommendation(SimpleNamespace(tasks_output=[SimpleNamespace(name="synthesis_task", raw=SYNTHESIS)]))
+    diff = compare_recommendations(quick, full, SYNTHESIS)
+    assert diff.pattern_changed
+    assert diff.scores == (("microservices", 6, 8), ("modular_monolith", 8, 6))
+    assert diff.notable_score_changes() == [("microservices", 6, 8), ("modular_monolith", 8, 6)]
+    assert diff.risks_confirmed == ("Distributed transactions across services need sagas.",)
+    assert diff.risks_quick_only == ("Vendor lock-in on managed queues.",)
+    assert diff.risks_full_only == ()
+
+
+def test_unchanged_when_the_full_analysis_names_no_pattern():
+    diff = compare_recommendations(Recommendation(pattern="monolithic"), Recommendation(pattern=None))
+    assert not diff.pattern_changed
+    assert diff.scores == () and diff.notable_score_changes() == []
@@ -0,0 +1,77 @@
+from types import SimpleNamespace
+
+import pytest
+
+from multi_agent_architecture_recommender.pruning import PruningDecision
+from multi_agent_architecture_recommender.report import build_report, paginate, summarize_markdown
+
+END_MARKER = "<!-- end -->"
+
+
+def task(name, raw, description=""):
+    return SimpleNamespace(name=name, raw=raw, description=description)
+
+
+def test_section_without_headings():
+    raw = "Plain **prose** with a [link](https://example.com).\n\nSecond paragraph.\n" + END_MARKER
+    (section,) = build_report(SimpleNamespace(tasks_output=[task("team_task", raw)]), end_marker=END_MARKER)
+    assert section.title == "Team"
+    assert section.headings == ()
+    assert section.summary == "Plain prose with a link."
+    assert not section.body.endswith(END_MARKER)
+
+
+def test_sections_for_tasks_then_templated_answers():
+    result = SimpleNamespace(
+        tasks_output=[task("", "## Scale\n\nLarge.", "Assess scalability\nin detail"), task(None, "")],
+        pruning_decisions={
+            "compliance_and_security_task": PruningDecision("compliance_and_security_task", "template", "no compliance", answer="Standard baseline."),
+            "team_task": PruningDecision("team_task", "skip", "single team"),
+        },
+    )
+    sections = build_report(result)
+    assert [(s.key, s.title, s.templated) for s in sections] == [
+        ("task_1", "Assess scalability", False),
+        ("task_2", "Task 2", False),
+        ("compliance_and_security_task", "Compliance And Security", True),
+    ]
+    assert sections[0].headings == ("Scale",) and sections[0].summary == "Large."
+    assert sections[1].summary == "" and sections[1].headings == ()
+
+
+def test_result_without_tasks_is_one_section():
+    (section,) = build_report(SimpleNamespace(tasks_output=[], raw="Use a modular monolith."))
+    assert (section.key, section.title, section.summary) == ("report", "Recommendation", "Use a modular monolith.")
+
+
+@pytest.mark.parametrize(
+    "text, summary",
+    [
+        ("", ""),
+        ("# Only\n## Headings", ""),
+        ("```\ncode first\n```\n\n| a | b |\n\nAfter the table.", "After the table."),
+        ("**Overview:**\n\n- one.\n- two;\n- three\n- four", "one; two; three"),
+    ],
+)
+def test_summarize_markdown(text, summary):
+    assert summarize_markdown(text) == summary
+
+
+def test_summary_truncated_to_max_chars():
+    assert summarize_markdown("word " * 100, max_chars=20) == "word word word word…"
+
+
+@pytest.mark.parametrize(
+    "page, expected",
+    [(1, ["s0", "s1", "s2"]), (3, ["s6"]), (0, ["s0", "s1", "s2"]), (-1, ["s0", "s1", "s2"]), (9, ["s6"])],
+)
+def test_paginate_clamps_to_existing_pages(page, expected):
+    sections = [f"s{i}" for i in range(7)]
+    page_sections, page_count = paginate(sections, page, 3)
+    assert page_count == 3
+    assert page_sections == expected
+
+
+@pytest.mark.parametrize("count, page_count", [(0, 1), (3, 1), (4, 2), (6, 2)])
+def test_page_count(count, page_count):
+    assert paginate(["s"] * count, 1, 3)[1] == page_count
@@ -0,0 +1,43 @@
+import pytest
+
+from multi_agent_architecture_recommender import stubs
+from multi_agent_architecture_recommender.runner import CREW_FACTORY_ENV, execute_analysis, load_recommender_class
+
+@pytest.fixture
+def internal_tool(requirements):
+    """Small Azure tool with nothing to check for compliance, so that task is pruned"""
+    return dict(requirements, preferred_cloud_provider="Azure")
+
+
+@pytest.fixture(autouse=True)
+def stub_crew(monkeypatch, tmp_path):
+    monkeypatch.setenv(CREW_FACTORY_ENV, stubs.STUB_CREW_FACTORY)
+    monkeypatch.setenv("ARCHITECTURE_TRACE_DIR", str(tmp_path))
+    monkeypatch.setattr(stubs.StubRecommender, "latency_s", 0)
+
+
+def test_pruning_template_names_preferred_provider(internal_tool):
+    result = execute_analysis(internal_tool)
+    answer = result.pruning_decisions["compliance_and_security_task"].answer
+    assert "security baseline of Azure:" in answer
+
+
+def test_comparison_pruning_template_names_compared_providers(internal_tool):
+    result = execute_analysis(internal_tool, providers=["GCP", "AWS"])
+    answer = result.pruning_decisions["compliance_and_security_task"].answer
+    assert "AWS or GCP" in answer
+    assert "Azure" not in answer
+
+
+def test_stub_crew_answers_within_output_budgets(internal_tool):
+    fast = execute_analysis(internal_tool, budget_profile="fast")
+    thorough = execute_analysis(internal_tool, budget_profile="thorough")
+    assert not any(usage.over_budget or usage.sections_missing for usage in fast.budget_usage)
+    assert fast.token_usage["completion_tokens"] < thorough.token_usage["completion_tokens"]
+
+
+def test_crew_factory_read_from_the_environment_on_each_call(monkeypatch):
+    assert load_recommender_class() is stubs.StubRecommender
+    monkeypatch.setenv(CREW_FACTORY_ENV, "multi_agent_architecture_recommender.stubs:_StubCrew")
+    assert load_recommender_class() is stubs._StubCrew
+    assert load_recommender_class(stubs.STUB_CREW_FACTORY) is stubs.StubRecommender
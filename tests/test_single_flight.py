@@ -0,0 +1,116 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from multi_agent_architecture_recommender.budgets import default_budget_profile
+from multi_agent_architecture_recommender.runner import RunProgress
+from multi_agent_architecture_recommender.single_flight import SingleFlight, analysis_key, flight_key
+
+TIMEOUT_S = 10
+
+class BlockingRun:
+    """Run function that reports progress and blocks until released"""
+
+    def __init__(self):
+        self.calls = 0
+        self.started = threading.Event()
+        self.release = threading.Event()
+
+    def __call__(self, value, progress=None):
+        self.calls += 1
+        progress(RunProgress(1, 3, "first_task"))
+        self.started.set()
+        assert self.release.wait(TIMEOUT_S)
+        progress(RunProgress(3, 3, "last_task"))
+        if isinstance(value, Exception):
+            raise value
+        return value
+
+
+@pytest.fixture
+def executor():
+    executor = ThreadPoolExecutor(max_workers=4)
+    yield executor
+    executor.shutdown(wait=True)
+
+
+def test_identical_submissions_share_one_run(executor):
+    flights, run = SingleFlight(executor), BlockingRun()
+    submissions = [flights.submit("key", run, "result") for _ in range(3)]
+    assert [joined for _, joined in submissions] == [False, True, True]
+    flight = submissions[0][0]
+    assert all(other is flight for other, _ in submissions)
+    assert flight.attached == 2
+    assert flights.in_flight() == 1
+
+    run.release.set()
+    assert [other.result(TIMEOUT_S) for other, _ in submissions] == ["result"] * 3
+    assert run.calls == 1
+
+
+def test_different_keys_run_separately(executor):
+    flights, run = SingleFlight(executor), BlockingRun()
+    first, _ = flights.submit("a", run, 1)
+    second, joined = flights.submit("b", run, 2)
+    assert not joined and second is not first
+    run.release.set()
+    assert (first.result(TIMEOUT_S), second.result(TIMEOUT_S)) == (1, 2)
+    assert run.calls == 2
+
+
+def test_key_forgotten_after_completion(executor):
+    flights, run = SingleFlight(executor), BlockingRun()
+    run.release.set()
+    first, _ = flights.submit("key", run, "first")
+    assert first.result(TIMEOUT_S) == "first"
+    second, joined = flights.submit("key", run, "second")
+    assert not joined and second is not first
+    assert second.result(TIMEOUT_S) == "second"
+    assert run.calls == 2
+    assert flights.in_flight() == 0
+
+
+def test_failed_run_fails_every_submission_and_is_forgotten(executor):
+    flights, run = SingleFlight(executor), BlockingRun()
+    first, _ = flights.submit("key", run, ValueError("crew failed"))
+    joined_flight, joined = flights.submit("key", run, "ignored")
+    assert joined
+    run.release.set()
+    for flight in (first, joined_flight):
+        with pytest.raises(ValueError, match="crew failed"):
+            flight.result(TIMEOUT_S)
+    retry, joined = flights.submit("key", run, "retried")
+    assert not joined and retry.result(TIMEOUT_S) == "retried"
+
+
+def test_progress_reaches_joined_submissions(executor):
+    flights, run = SingleFlight(executor), BlockingRun()
+    flight, _ = flights.submit("key", run, "result")
+    assert run.started.wait(TIMEOUT_S)
+
+    joined_flight, joined = flights.submit("key", run, "result")
+    assert joined
+    assert joined_flight.progress == RunProgress(1, 3, "first_task")
+    # Nothing new while the run is blocked: the wait times out unfinished
+    assert joined_flight.wait(timeout=0.05) is False
+
+    run.release.set()
+    while not joined_flight.wait(timeout=TIMEOUT_S):
+        pass
+    assert joined_flight.progress == RunProgress(3, 3, "last_task")
+    assert flight.progress == joined_flight.progress
+
+
+def test_analysis_key_treats_equivalent_options_alike(requirements):
+    key = analysis_key(requirements)
+    assert analysis_key(requirements, default_budget_profile()) == key
+    assert analysis_key(requirements, "fast") != key
+    assert analysis_key(requirements, providers=["GCP", "AWS"]) == analysis_key(requirements, providers=["AWS", "GCP"])
+    assert analysis_key(requirements, providers=["AWS", "GCP"]) != key
+
+
+def test_flight_key_ignores_list_order_in_requirements(requirements):
+    reordered = dict(requirements, technology_stack=["React", "Python"])
+    assert flight_key("full", reordered) == flight_key("full", requirements)
+    assert flight_key("quick", requirements) != flight_key("full", requirements)
@@ -0,0 +1,25 @@
+import pytest
+
+from multi_agent_architecture_recommender.stubs import percentile
+
+
+@pytest.mark.parametrize(
+    "values, pct, expected",
+    [
+        (range(1, 11), 50, 5),
+        (range(1, 11), 90, 9),
+        (range(1, 11), 100, 10),
+        (range(1, 101), 99, 99),
+        (range(1, 101), 50, 50),
+        ([1, 2], 50, 1),
+        ([1, 2, 3], 50, 2),
+        ([7], 99, 7),
+        ([3, 1, 2], 0, 1),
+    ],
+)
+def test_nearest_rank_percentile(values, pct, expected):
+    assert percentile(list(values), pct) == expected
+
+
+def test_percentile_of_nothing_is_zero():
+    assert percentile([], 50) == 0.0
@@ -0,0 +1,143 @@
+from datetime import datetime
+from types import SimpleNamespace
+
+import pytest
+
+from multi_agent_architecture_recommender import tracing
+from multi_agent_architecture_recommender.tracing import (
+    SPAN_KIND_CLIENT,
+    RunTracer,
+    load_trace,
+    waterfall_rows,
+    write_trace,
+)
+
+RUN_ID = "0123456789abcdef0123456789abcdef"
+
+
+class FakeBus:
+    """Event bus whose handlers still have events queued until flush()"""
+
+    def __init__(self):
+        self.pending = []
+
+    def flush(self, timeout=None):
+        while self.pending:
+            tracing._dispatch(None, self.pending.pop(0))
+
+
+@pytest.fixture
+def bus(monkeypatch):
+    bus = FakeBus()
+    monkeypatch.setattr(tracing, "_event_bus", bus)
+    monkeypatch.setattr(tracing, "_handlers_installed", True)
+    monkeypatch.setattr(tracing, "_active_tracers", [])
+    return bus
+
+
+def make_task(task_id, name, role):
+    return SimpleNamespace(id=task_id, name=name, agent=SimpleNamespace(role=role))
+
+
+def emit(event_type, task, **attributes):
+    tracing._dispatch(None, event(event_type, task, **attributes))
+
+
+def event(event_type, task, **attributes):
+    return SimpleNamespace(type=event_type, task_id=task.id, task=task, timestamp=datetime.now(), **attributes)
+
+
+def traced_run(bus):
+    """One task that succeeds after a retried call, and one that fails"""
+    scaling = make_task("t1", "scalability_task", "Scalability Architect")
+    costs = make_task("t2", "cost_task", "Cost Analyst")
+    tracer = RunTracer(RUN_ID)
+    with pytest.raises(RuntimeError):
+        with tracer.span("analysis.run", **{"run.budget_profile": "fast"}):
+            with tracer.span("crew.kickoff"):
+                tracer.watch(SimpleNamespace(tasks=[scaling, costs]))
+                emit("task_started", scaling)
+                emit("llm_call_started", scaling, call_id="c1", model="gpt-4o-mini", max_tokens=664)
+                emit("llm_call_failed", scaling, call_id="c1", error="rate limited")
+                emit("llm_call_started", scaling, call_id="c2", model="gpt-4o-mini")
+                emit("llm_call_completed", scaling, call_id="c2",
+                     usage={"prompt_tokens": 1200, "completion_tokens": 300}, finish_reason="stop")
+                emit("llm_call_started", scaling, call_id="c3", model="gpt-4o-mini")
+                emit("llm_call_completed", scaling, call_id="c3", usage={})
+                emit("task_completed", scaling, output=SimpleNamespace(raw="## Scale Category\n\nLarge"))
+                emit("task_started", costs)
+                emit("llm_call_started", costs, call_id="c4", model="gpt-4o-mini")
+                # Still queued on the bus when the run fails
+                bus.pending += [
+                    event("llm_call_failed", costs, call_id="c4", error="context length exceeded"),
+                    event("task_failed", costs, error="context length exceeded"),
+                ]
+                raise RuntimeError("crew failed")
+    return tracer, tracer.finish()
+
+
+def by_name(spans, name):
+    return [span for span in spans if span.name == name]
+
+
+def test_spans_assembled_into_a_tree(bus):
+    _, spans = traced_run(bus)
+    (root,) = by_name(spans, "analysis.run")
+    (kickoff,) = by_name(spans, "crew.kickoff")
+    (scaling,) = by_name(spans, "task scalability_task")
+    assert root.parent_id is None and root.error == "RuntimeError: crew failed"
+    assert kickoff.parent_id == root.span_id
+    assert scaling.parent_id == kickoff.span_id and scaling.error is None
+    assert scaling.attributes["agent.role"] == "Scalability Architect"
+    assert scaling.attributes["task.output_tokens"] > 0
+
+    steps = [s for s in by_name(spans, "agent.step") if s.parent_id == scaling.span_id]
+    assert [s.attributes["agent.iteration"] for s in steps] == [1, 2]
+    first_calls = [s for s in by_name(spans, "llm.call") if s.parent_id == steps[0].span_id]
+    # The retry after the failed call stays in the first iteration
+    assert [(c.error, c.attributes["llm.retry_count"]) for c in first_calls] == [("rate limited", 0), (None, 1)]
+    assert first_calls[0].attributes["gen_ai.request.max_tokens"] == 664
+    assert first_calls[1].attributes["gen_ai.usage.input_tokens"] == 1200
+    assert first_calls[1].attributes["gen_ai.usage.output_tokens"] == 300
+    assert all(c.kind == SPAN_KIND_CLIENT for c in first_calls)
+
+
+def test_failure_events_flushed_before_the_tracer_detaches(bus):
+    tracer, spans = traced_run(bus)
+    (costs,) = by_name(spans, "task cost_task")
+    assert costs.error == "context length exceeded"
+    (call,) = [c for c in by_name(spans, "llm.call") if c.error and c.error != "rate limited"]
+    assert call.error == "context length exceeded"
+    assert tracer not in tracing._active_tracers
+
+
+def test_events_of_other_crews_are_ignored(bus):
+    tracer = RunTracer(RUN_ID)
+    with tracer.span("crew.kickoff"):
+        tracer.watch(SimpleNamespace(tasks=[make_task("mine", "team_task", "Team Analyst")]))
+        emit("task_started", make_task("other", "team_task", "Team Analyst"))
+    assert by_name(tracer.finish(), "task team_task") == []
+
+
+def test_otlp_json_round_trip(bus, tmp_path):
+    _, spans = traced_run(bus)
+    path = write_trace(RUN_ID, spans, {"requirements.fingerprint": "abc123"}, directory=str(tmp_path))
+    resource, loaded = load_trace(path)
+    assert resource["requirements.fingerprint"] == "abc123"
+    assert resource["service.name"] == tracing.SERVICE_NAME
+
+    def shape(span):
+        return (span.name, span.span_id, span.parent_id, span.start_ns, span.end_ns,
+                span.attributes, span.error, span.kind)
+
+    assert [shape(s) for s in loaded] == [shape(s) for s in spans]
+
+
+def test_waterfall_rows_follow_the_tree(bus):
+    _, spans = traced_run(bus)
+    rows = waterfall_rows(spans)
+    assert len(rows) == len(spans)
+    assert (rows[0]["span"].name, rows[0]["depth"], rows[0]["start_s"]) == ("analysis.run", 0, 0)
+    depth = {row["span"].name: row["depth"] for row in rows}
+    assert depth["crew.kickoff"] == 1 and depth["task cost_task"] == 2
+    assert depth["agent.step"] == 3 and depth["llm.call"] == 4
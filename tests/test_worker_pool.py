@@ -0,0 +1,121 @@
+import io
+import os
+import pickle
+
+import pytest
+
+from multi_agent_architecture_recommender import worker_pool
+from multi_agent_architecture_recommender.runner import execute_analysis
+from multi_agent_architecture_recommender.stubs import STUB_CREW_FACTORY
+from multi_agent_architecture_recommender.worker_pool import (
+    CrewWorkerPool,
+    WorkerCrashedError,
+    read_frame,
+    write_frame,
+)
+
+TIMEOUT_S = 60
+
+@pytest.fixture
+def make_pool(monkeypatch, tmp_path):
+    # Workers inherit the environment: no stub latency, traces out of the tree
+    monkeypatch.setenv("LOADTEST_CREW_LATENCY", "0")
+    monkeypatch.setenv("ARCHITECTURE_TRACE_DIR", str(tmp_path))
+    pools = []
+
+    def make(**options):
+        pool = CrewWorkerPool(size=1, crew_factory=STUB_CREW_FACTORY, **options)
+        pools.append(pool)
+        return pool
+
+    yield make
+    for pool in pools:
+        pool.shutdown()
+
+
+def run(pool, fn, *args, **kwargs):
+    return pool.submit(fn, *args, **kwargs).result(TIMEOUT_S)
+
+
+def test_frames_round_trip():
+    stream = io.BytesIO()
+    write_frame(stream, ("result", {"tasks": [1, 2, 3]}, False))
+    write_frame(stream, ("progress", "x" * 10000))
+    stream.seek(0)
+    assert read_frame(stream) == ("result", {"tasks": [1, 2, 3]}, False)
+    assert read_frame(stream) == ("progress", "x" * 10000)
+    with pytest.raises(EOFError):
+        read_frame(stream)
+
+
+def test_truncated_frame_is_end_of_channel():
+    stream = io.BytesIO()
+    write_frame(stream, ("result", "done", False))
+    with pytest.raises(EOFError):
+        read_frame(io.BytesIO(stream.getvalue()[:-1]))
+
+
+def test_runs_in_worker_process(make_pool):
+    pool = make_pool()
+    assert run(pool, os.getpid) != os.getpid()
+
+
+def test_worker_recycled_after_max_runs(make_pool):
+    pool = make_pool(max_runs_per_worker=2)
+    pids = [run(pool, os.getpid) for _ in range(3)]
+    assert pids[0] == pids[1] != pids[2]
+    assert pool.recycled == 1
+
+
+def test_worker_recycled_past_rss_ceiling(make_pool):
+    pool = make_pool(max_rss_mb=1)
+    pids = [run(pool, os.getpid) for _ in range(2)]
+    assert pids[0] != pids[1]
+    assert pool.recycled == 2
+
+
+def test_errors_are_raised_and_worker_kept(make_pool):
+    pool = make_pool()
+    pid = run(pool, os.getpid)
+    with pytest.raises(FileNotFoundError):
+        run(pool, os.stat, "/nonexistent/path")
+    assert run(pool, os.getpid) == pid
+
+
+def test_crashed_worker_is_replaced(make_pool):
+    pool = make_pool()
+    pid = run(pool, os.getpid)
+    with pytest.raises(WorkerCrashedError):
+        run(pool, os._exit, 3)
+    assert run(pool, os.getpid) != pid
+
+
+def test_unpicklable_call_keeps_worker(make_pool):
+    pool = make_pool()
+    pid = run(pool, os.getpid)
+    with pytest.raises((pickle.PicklingError, AttributeError)):
+        run(pool, lambda: 1)
+    assert run(pool, os.getpid) == pid
+
+
+def test_progress_relayed_to_caller(make_pool, requirements):
+    pool = make_pool()
+    updates = []
+    result = run(pool, execute_analysis, requirements, progress=updates.append)
+    assert result.worker_pid != os.getpid()
+    assert updates[0].completed_tasks == 0
+    assert updates[-1].completed_tasks == updates[-1].total_tasks == len(result.tasks_output)
+
+
+def test_failed_worker_start_keeps_slot(make_pool, monkeypatch):
+    popen = worker_pool.subprocess.Popen
+
+    def broken_popen(*args, **kwargs):
+        raise OSError("fork failed")
+
+    monkeypatch.setattr(worker_pool.subprocess, "Popen", broken_popen)
+    pool = make_pool()
+    with pytest.raises(OSError):
+        run(pool, os.getpid)
+    monkeypatch.setattr(worker_pool.subprocess, "Popen", popen)
+    assert run(pool, os.getpid) != os.getpid()